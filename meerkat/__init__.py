@@ -5,11 +5,13 @@ from meerkat.logging.utils import initialize_logging
 
 initialize_logging()
 
+from meerkat.builder import DataPanelBuilder
 from meerkat.cells.abstract import AbstractCell
 from meerkat.cells.volume import MedicalVolumeCell
 from meerkat.columns.abstract import AbstractColumn
 from meerkat.columns.arrow_column import ArrowArrayColumn
 from meerkat.columns.audio_column import AudioColumn
+from meerkat.columns.categorical_column import CategoricalColumn
 from meerkat.columns.cell_column import CellColumn
 from meerkat.columns.file_column import FileCell, FileColumn
 from meerkat.columns.image_column import ImageColumn
@@ -17,17 +19,23 @@ from meerkat.columns.lambda_column import LambdaCell, LambdaColumn
 from meerkat.columns.list_column import ListColumn
 from meerkat.columns.numpy_column import NumpyArrayColumn
 from meerkat.columns.pandas_column import PandasSeriesColumn
+from meerkat.columns.ragged_column import RaggedArrayColumn
 from meerkat.columns.spacy_column import SpacyColumn
+from meerkat.columns.sparse_column import SparseColumn
 from meerkat.columns.tensor_column import TensorColumn
 from meerkat.columns.volume_column import MedicalVolumeColumn
 from meerkat.datapanel import DataPanel
 from meerkat.datasets import get
+from meerkat.expr import col
+from meerkat.lazy import LazyDataPanel
 from meerkat.ops.concat import concat
 from meerkat.ops.embed import embed
 from meerkat.ops.merge import merge
 from meerkat.ops.sample import sample
 from meerkat.ops.sort import sort
 from meerkat.provenance import provenance
+from meerkat.sharded import ShardedWriter, iter_sharded, read_sharded, write_sharded
+from meerkat.streaming import iter_csv, iter_jsonl
 
 from .config import config
 
@@ -38,6 +46,8 @@ SeriesColumn = PandasSeriesColumn
 
 __all__ = [
     "DataPanel",
+    "LazyDataPanel",
+    "DataPanelBuilder",
     "AbstractColumn",
     "LambdaColumn",
     "CellColumn",
@@ -45,7 +55,10 @@ __all__ = [
     "ListColumn",
     "NumpyArrayColumn",
     "PandasSeriesColumn",
+    "CategoricalColumn",
     "TensorColumn",
+    "SparseColumn",
+    "RaggedArrayColumn",
     "ArrowArrayColumn",
     "ImageColumn",
     "AudioColumn",
@@ -57,11 +70,18 @@ __all__ = [
     "FileCell",
     "MedicalVolumeCell",
     "get",
+    "col",
     "concat",
     "merge",
     "embed",
     "sort",
     "sample",
     "provenance",
+    "ShardedWriter",
+    "read_sharded",
+    "write_sharded",
+    "iter_sharded",
+    "iter_csv",
+    "iter_jsonl",
     "config",
 ]
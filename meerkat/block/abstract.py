@@ -1,16 +1,48 @@
 from __future__ import annotations
 
 import os
+import shutil
+import threading
+import weakref
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Hashable, Mapping, Sequence, Tuple, Union
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
+import numpy as np
 import yaml
 
+import meerkat.config
 from meerkat.errors import ConsolidationError
 
+from .row_index import RowIndex, SliceIndex
+
 # an index into a block that specifies where a column's data lives in the block
 BlockIndex = Union[int, slice, str]
 
+# the default of the digest arguments of `AbstractBlock._saved_paths` and
+# `AbstractBlock._record_saved`, None being the digest of read-only data
+_NOT_COMPUTED = object()
+
+# blocks hash their data in chunks of this many rows, so that writing to a few rows
+# only requires rehashing the chunks that contain them
+FINGERPRINT_CHUNK_ROWS = 2**16
+
+# the smallest amount of memory read at a time, used to estimate the memory traffic
+# of strided accesses
+CACHE_LINE_BYTES = 64
+
 
 if TYPE_CHECKING:
     from meerkat.block.ref import BlockRef
@@ -27,8 +59,77 @@ class BlockView:
 
 
 class AbstractBlock:
+    # incremented on every write to the block, see `_invalidate_fingerprints`
+    _version: int = 0
+    # the block this block was indexed from, see `_set_source`
+    _source: Optional[_BlockSource] = None
+    # whether the `BlockManager` may merge blocks of this type on its own, see
+    # `BlockManager._auto_consolidate`
+    _auto_consolidate: bool = False
+    # the blocks sharing their data with this block after a `copy`, see
+    # `_copy_on_write`
+    _shared: Optional[weakref.WeakSet] = None
+    # whether the block may switch the memory layout of its data between row-major
+    # and column-major, see `_record_access`
+    _auto_layout: bool = False
+    # the memory traffic (in bytes) wasted by accesses going against the layout of
+    # the data since it was last changed, see `_record_access`
+    _layout_waste: int = 0
+    # whether the data of one of the block's columns was handed out (e.g. with
+    # `.data`), after which the block keeps its layout, see `_can_set_layout`
+    _data_handed_out: bool = False
+    # the directories the block was written to or read from, with the version and
+    # the digest of the data of the block at the time, see `_saved_paths`
+    _saved: Optional[Dict[str, Tuple[int, Optional[str]]]] = None
+    # how to read the data of a block read with `lazy=True` until it is first
+    # accessed, see `read`
+    _lazy: Optional[_LazyData] = None
+
     def __init__(self, *args, **kwargs):
         super(AbstractBlock, self).__init__(*args, **kwargs)
+        # block index => hash of each chunk of rows, None for chunks to rehash
+        self._chunk_hashes: Dict[Hashable, List[Optional[str]]] = {}
+        self._init_views()
+
+    def _init_views(self):
+        # the columns backed by the block (keyed by id) and the blocks whose data is
+        # a view of the block's data, updated when the data is copied on write
+        self._columns = weakref.WeakValueDictionary()
+        self._views = weakref.WeakSet()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the source block is not pickled (e.g. when sending a batch to the main
+        # process from a worker), so the unpickled block has its own fingerprint
+        # and its own data
+        for key in ["_source", "_shared", "_columns", "_views"]:
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._init_views()
+
+    def __getattr__(self, name: str):
+        # only called for attributes that are not set, i.e. the data of a block read
+        # with `lazy=True`, which is read on first access
+        lazy = self.__dict__.get("_lazy")
+        if name != "data" or lazy is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        with _LAZY_LOCK:
+            if self._lazy is not None:
+                self.data = lazy.load()
+                self._lazy = None
+                if self._saved:
+                    # the data may now be written to in place, see `_data_digest`
+                    digest = self._data_digest()
+                    self._saved = {
+                        path: (version, digest)
+                        for path, (version, _) in self._saved.items()
+                    }
+        return self.data
 
     def __getitem__(self, index: BlockIndex) -> BlockView:
         return BlockView(block_index=index, block=self)
@@ -74,6 +175,377 @@ class AbstractBlock:
     def is_mmap(self):
         return False
 
+    @property
+    def nrows(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes held by the block's data."""
+        raise NotImplementedError
+
+    @property
+    def mmap_nbytes(self) -> int:
+        """The number of bytes of the block's data memory-mapped from a file."""
+        return 0
+
+    def fingerprint(self, index: BlockIndex) -> str:
+        """Return a fingerprint of the data at ``index`` in the block.
+
+        Blocks indexed from another block (see :meth:`_set_source`) derive their
+        fingerprint from the fingerprint of the source block and the row index, as
+        long as neither block has been written to since. Otherwise the data is
+        hashed in chunks of ``FINGERPRINT_CHUNK_ROWS`` rows. The chunk hashes are
+        stored on the block, so only the chunks written to since the last call are
+        rehashed.
+        """
+        from meerkat.tools.fingerprint import _Hasher, fingerprint
+
+        if self._sync_source():
+            source = self._source
+            return fingerprint(
+                "view",
+                source.block().fingerprint(
+                    index if source.index is None else source.index
+                ),
+                source.rows,
+            )
+
+        chunk_hashes = self._chunk_hashes.setdefault(
+            _hashable_index(index),
+            [None] * -(-self.nrows // FINGERPRINT_CHUNK_ROWS),
+        )
+        for chunk, digest in enumerate(chunk_hashes):
+            if digest is None:
+                hasher = _Hasher()
+                start = chunk * FINGERPRINT_CHUNK_ROWS
+                stop = min(self.nrows, start + FINGERPRINT_CHUNK_ROWS)
+                hasher.update(self._get_rows(index, start, stop))
+                chunk_hashes[chunk] = hasher.hexdigest()
+        return fingerprint("block", self.nrows, chunk_hashes)
+
+    def _get_rows(self, index: BlockIndex, start: int, stop: int) -> object:
+        """Return the rows ``start:stop`` of the data at ``index``, e.g. to be
+        hashed."""
+        raise NotImplementedError
+
+    def copy(self) -> AbstractBlock:
+        """Return a block holding the same data as this block.
+
+        The data is not copied until one of the blocks is written to, see
+        :meth:`_copy_on_write`.
+        """
+        block = type(self)(self._shallow_copy_data())
+        block._chunk_hashes = {
+            index: list(chunk_hashes)
+            for index, chunk_hashes in self._chunk_hashes.items()
+        }
+        block._share(self)
+        return block
+
+    def _shallow_copy_data(self) -> object:
+        """Return an object holding the same data as the block, without copying
+        it."""
+        return self.data
+
+    def _deep_copy_data(self) -> object:
+        """Return a copy of the block's data."""
+        raise NotImplementedError
+
+    def _share(self, other: AbstractBlock):
+        """Record that the block's data is (part of) the data of ``other``, which
+        must not change when either block is written to."""
+        root = other._cow_root()
+        if root._shared is None:
+            root._shared = weakref.WeakSet([root])
+        root._shared.add(self)
+        self._shared = root._shared
+
+    def _register_column(self, column: object):
+        self._columns[id(column)] = column
+
+    def _cow_root(self) -> AbstractBlock:
+        # blocks indexed with a slice are views of the data of their source block
+        block = self
+        while block._source is not None and block._source.view:
+            block = block._source.block()
+        return block
+
+    def _copy_on_write(self):
+        """Called before the block's data is written to.
+
+        If the data is shared with a copy (see :meth:`copy`), it is copied first:
+        the block gets its own data, as do the blocks it is a view of (e.g. the
+        block of ``dp`` for a block of ``dp[10:20]``) and their views, so that
+        writes are still shared between views but not between copies.
+        """
+        root = self._cow_root()
+        shared = root._shared
+        if shared is None:
+            return
+        shared.discard(root)
+        root._shared = None
+        if len(shared) == 0:
+            # the copies were garbage collected
+            return
+        root.data = root._deep_copy_data()
+        root._update_views()
+
+    def _is_shared(self) -> bool:
+        """Whether the block's data is shared with a copy, see :meth:`copy`."""
+        shared = self._cow_root()._shared
+        return shared is not None and len(shared) > 1
+
+    def _update_views(self):
+        """Point the columns and views of the block to the block's data, after it
+        was replaced by a copy (see :meth:`_copy_on_write` and
+        :meth:`_record_access`)."""
+        for column in list(self._columns.values()):
+            column._data = self._get_data(column._block_index)
+        for view in list(self._views):
+            source = view._source
+            rows = source.rows.to_indexer()
+            if source.index is None:
+                view.data = self._take_rows(self.data, rows)
+            else:
+                data = self._take_rows(self._get_data(source.index), rows)
+                view.data = type(view).from_column_data(data).block.data
+            view._update_views()
+
+    @property
+    def column_major(self) -> bool:
+        """Whether the data of each column, rather than of each row, is contiguous
+        in memory."""
+        return False
+
+    def _set_layout(self, column_major: bool):
+        """Copy the data to a row-major or column-major layout, its shape and
+        values are unchanged."""
+        raise NotImplementedError
+
+    def _record_column_scan(self, index: BlockIndex) -> bool:
+        """Record that the full column at ``index`` is about to be read.
+
+        Return:
+            bool: whether the layout of the block was changed, in which case the
+                data of its columns was replaced.
+        """
+        if not self._auto_layout or self.column_major:
+            return False
+        # a strided read brings in at least a cache line per row
+        ncols = self.data.shape[1]
+        width = len(range(ncols)[index]) if isinstance(index, slice) else 1
+        needed = self.nbytes * width // ncols
+        read = min(self.nbytes, self.nrows * CACHE_LINE_BYTES)
+        return self._record_access(read - needed)
+
+    def _record_row_gather(self, nrows: int) -> bool:
+        """Record that ``nrows`` rows were gathered from the block, see
+        :meth:`_record_column_scan`."""
+        if not self._auto_layout or not self.column_major:
+            return False
+        # each row is spread over one cache line per column
+        needed = self.nbytes * nrows // max(self.nrows, 1)
+        read = min(self.nbytes, nrows * self.data.shape[1] * CACHE_LINE_BYTES)
+        return self._record_access(read - needed)
+
+    def _record_access(self, waste: int) -> bool:
+        """Add ``waste`` bytes to the memory traffic wasted by accesses going
+        against the layout of the block, and switch the layout once the waste
+        exceeds the cost of copying the data to the other layout.
+
+        This is the rent-or-buy rule of `BlockManager._auto_consolidate`: the copy
+        is made once renting (strided reads) has cost as much as buying (copying),
+        so no access pattern costs more than twice what the best layout would.
+        Blocks whose data is memory-mapped, shared with other blocks (as a view or
+        a copy) or handed out (e.g. with the ``data`` of a column), or larger than
+        ``config.engine.max_layout_bytes``, keep their layout.
+        """
+        if waste <= 0:
+            return False
+        self._layout_waste += waste
+        if self._layout_waste < self.nbytes or not self._can_set_layout():
+            return False
+        self._set_layout(not self.column_major)
+        self._layout_waste = 0
+        self._update_views()
+        return True
+
+    def _can_set_layout(self) -> bool:
+        engine = meerkat.config.engine
+        if not engine.auto_layout or self.nbytes > engine.max_layout_bytes:
+            # the data is copied, which doubles the memory used by the block
+            return False
+        if self.data.shape[1] <= 1 or self.mmap_nbytes > 0:
+            return False
+        if self._source is not None and self._source.view:
+            return False
+        if self._data_handed_out:
+            # arrays taken from the columns would no longer share memory with them
+            return False
+        return self._shared is None or len(self._shared) <= 1
+
+    @staticmethod
+    def _take_rows(data: object, rows: object) -> object:
+        """Return a view of the rows ``rows`` (a slice) of ``data``, the data of the
+        block or of one of its columns."""
+        return data[rows]
+
+    def _set_source(
+        self, source: AbstractBlock, index: object, source_index: BlockIndex = None
+    ):
+        """Record that the block holds the rows ``index`` of ``source``, so that
+        its fingerprint can be derived from the fingerprint of ``source``.
+
+        Args:
+            source (AbstractBlock): the block indexed.
+            index (object): the row index into ``source``.
+            source_index (BlockIndex, optional): the index in ``source`` of the data
+                in this block, if this block holds a single column of ``source``.
+                Defaults to None, the block indices of both blocks are the same.
+        """
+        try:
+            rows = RowIndex.from_index(index, nrows=source.nrows)
+        except (TypeError, IndexError):
+            return
+        view = isinstance(rows, SliceIndex)
+        self._source = _BlockSource(
+            block=weakref.ref(source),
+            version=source._version,
+            rows=rows,
+            index=source_index,
+            view=view,
+            _view_of=source if view else None,
+        )
+        if view:
+            source._views.add(self)
+
+    def _sync_source(self) -> bool:
+        """Check whether the source block (or one of its own sources) was written
+        to, in which case the rows of this block may have changed as well.
+
+        Return:
+            bool: whether the fingerprint can be derived from the source block.
+        """
+        source = self._source
+        if source is None:
+            return False
+        block = source.block()
+        if block is None:
+            # the source block was garbage collected, so it cannot change anymore
+            self._source = None
+            return False
+        block._sync_source()
+        if block._version != source.version:
+            self._version += 1
+            self._chunk_hashes = {}
+            source.version = block._version
+            source.derived = False
+        return source.derived
+
+    def _invalidate_fingerprints(self, rows: np.ndarray = None):
+        """Mark the chunks containing ``rows`` (or all chunks, if None) to be
+        rehashed after a write.
+
+        The block may share memory with the block it was indexed from, which is
+        invalidated as well.
+        """
+        self._version += 1
+        if rows is None:
+            self._chunk_hashes = {}
+        else:
+            chunks = np.unique(np.asarray(rows) // FINGERPRINT_CHUNK_ROWS)
+            for chunk_hashes in self._chunk_hashes.values():
+                for chunk in chunks:
+                    chunk_hashes[chunk] = None
+
+        source = self._source
+        block = None if source is None else source.block()
+        if block is not None:
+            # hash the data of this block from now on, but keep tracking the
+            # writes to the source block
+            if source.derived:
+                self._chunk_hashes = {}
+                source.derived = False
+            block._invalidate_fingerprints(
+                None if rows is None else source.rows.compose(rows).to_array()
+            )
+            source.version = block._version
+
+    def _covered_by(self, indices: Sequence[BlockIndex]) -> bool:
+        """Whether the data at ``indices`` is all of the block's data, i.e. writing
+        the block writes no data outside of the columns at ``indices``."""
+        return False
+
+    def _record_saved(self, path: str, digest: Optional[str] = _NOT_COMPUTED):
+        """Record that the directory ``path`` holds the current data of the block,
+        whose digest (see :meth:`_data_digest`) is ``digest`` if already
+        computed."""
+        if self._saved is None:
+            self._saved = {}
+        if digest is _NOT_COMPUTED:
+            digest = self._data_digest()
+        self._saved[os.path.abspath(path)] = (self._version, digest)
+
+    def _saved_paths(self, digest: Optional[str] = _NOT_COMPUTED) -> List[str]:
+        """The directories holding the current data of the block, i.e. those it was
+        written to or read from without being written to since.
+
+        Writes to the data that do not go through the block (e.g. to the ``data``
+        of a column, or with a ufunc's ``out``) do not change its version, so the
+        digest of the data must also match, see :meth:`_data_digest`.
+        """
+        if not self._saved:
+            return []
+        # the data of a view changes with the data of its source block
+        self._sync_source()
+        paths = []
+        for path, (version, saved_digest) in self._saved.items():
+            if version != self._version or not os.path.isdir(path):
+                continue
+            if digest is _NOT_COMPUTED:
+                digest = self._data_digest()
+            if digest == saved_digest:
+                paths.append(path)
+        return paths
+
+    def _data_digest(self) -> Optional[str]:
+        """A hash of the block's data if it can be written to in place, None if it
+        cannot (e.g. immutable arrow data, arrays memory-mapped read-only, or the
+        data of a lazy block not read yet), in which case only the version of the
+        block tells whether it changed."""
+        if self.__dict__.get("_lazy") is not None or not self._is_writeable():
+            return None
+        from meerkat.tools.fingerprint import fingerprint
+
+        return fingerprint(self._digest_data())
+
+    def _is_writeable(self) -> bool:
+        """Whether the block's data can be written to in place."""
+        return True
+
+    def _digest_data(self) -> object:
+        """The data hashed by :meth:`_data_digest`."""
+        return self.data
+
+    def _save(self, path: str):
+        """Write the block to the directory ``path``.
+
+        If another directory already holds the current data of the block (see
+        :meth:`_saved_paths`), its files are hard-linked rather than written again.
+        """
+        digest = self._data_digest() if self._saved else _NOT_COMPUTED
+        for saved_path in self._saved_paths(digest):
+            try:
+                shutil.copytree(saved_path, path, copy_function=os.link)
+                break
+            except OSError:
+                # e.g. the directories are on different file systems
+                shutil.rmtree(path, ignore_errors=True)
+        else:
+            self.write(path)
+        self._record_saved(path, digest)
+
     def write(self, path: str, *args, **kwargs):
         os.makedirs(path, exist_ok=True)
         self._write_data(path, *args, **kwargs)
@@ -82,11 +554,128 @@ class AbstractBlock:
         yaml.dump(metadata, open(metadata_path, "w"))
 
     @classmethod
-    def read(cls, path: str, *args, **kwargs):
+    def read(
+        cls, path: str, *args, lazy: bool = False, nrows: int = None, **kwargs
+    ) -> AbstractBlock:
+        """Read the block written to ``path``, the other arguments (e.g. ``mmap``
+        or a ``selection``, see :meth:`_project`) are passed to ``_read_data``.
+
+        With ``lazy=True``, the data is only read when first accessed, and the
+        number of rows of the block must be passed as ``nrows``.
+        """
+        block_class = cls._read_class(path)
+        if lazy:
+            block = block_class.__new__(block_class)
+            AbstractBlock.__init__(block)
+            block._lazy = _LazyData(
+                load=partial(block_class._read_data, path, *args, **kwargs),
+                nrows=nrows,
+            )
+            return block
+        data = block_class._read_data(path, *args, **kwargs)
+        return block_class(data)
+
+    @staticmethod
+    def _read_class(path: str) -> Type[AbstractBlock]:
+        """The class of the block written to ``path``."""
         assert os.path.exists(path), f"`path` {path} does not exist."
         metadata_path = os.path.join(path, "meta.yaml")
         metadata = dict(yaml.load(open(metadata_path), Loader=yaml.FullLoader))
+        return metadata["klass"]
 
-        block_class = metadata["klass"]
-        data = block_class._read_data(path, *args, **kwargs)
-        return block_class(data)
+    @staticmethod
+    def _project(
+        indices: Sequence[BlockIndex],
+    ) -> Tuple[Optional[object], List[BlockIndex]]:
+        """Return the part of a written block to read for the columns at
+        ``indices`` only, as a ``selection`` accepted by ``_read_data``, and the
+        indices of the columns into the data read.
+
+        By default the whole block is read (``selection`` is None).
+        """
+        return None, list(indices)
+
+
+@dataclass
+class _BlockSource:
+    """The block another block was indexed from, see
+    :meth:`AbstractBlock._set_source`."""
+
+    # a weak reference, so that blocks holding copies of a few rows do not keep a
+    # (possibly large) source block alive
+    block: weakref.ref
+    # the version of the source block last seen
+    version: int
+    rows: RowIndex
+    index: Optional[BlockIndex] = None
+    # whether the fingerprint is derived from the fingerprint of the source block
+    derived: bool = True
+    # whether the data of the block is a view of the data of the source block, views
+    # keep the source block alive (as their data does), see
+    # `AbstractBlock._copy_on_write`
+    view: bool = False
+    _view_of: Optional[AbstractBlock] = None
+
+
+@dataclass
+class _LazyData:
+    """The data of a block read with ``lazy=True``, see
+    :meth:`AbstractBlock.read`."""
+
+    # reads the data of the block
+    load: Callable[[], object]
+    nrows: int
+
+
+# held while the data of a lazy block is read, so that it is only read once
+_LAZY_LOCK = threading.Lock()
+
+
+def _project_positions(
+    indices: Sequence[BlockIndex],
+) -> Tuple[Optional[np.ndarray], List[BlockIndex]]:
+    """Project the integer and slice ``indices`` of the columns of a block (along
+    its second axis), see :meth:`AbstractBlock._project`.
+
+    The selection is the sorted positions of the columns, or None (i.e. all) for
+    strided or open slices.
+    """
+    ranges = []
+    for index in indices:
+        if not isinstance(index, slice):
+            ranges.append(range(index, index + 1))
+        elif index.start is None or index.stop is None or index.step not in (None, 1):
+            return None, list(indices)
+        else:
+            ranges.append(range(index.start, index.stop))
+    positions = np.unique(np.concatenate([np.arange(r.start, r.stop) for r in ranges]))
+    new_indices = []
+    for index, r in zip(indices, ranges):
+        start = int(np.searchsorted(positions, r.start))
+        new_indices.append(
+            slice(start, start + len(r)) if isinstance(index, slice) else start
+        )
+    return positions, new_indices
+
+
+def _select_positions(data, positions: np.ndarray):
+    """Return the columns of ``data`` at ``positions`` (sorted), as a view if they
+    are contiguous."""
+    start, stop = int(positions[0]), int(positions[-1]) + 1
+    if stop - start == len(positions):
+        return data[:, start:stop]
+    return data[:, positions]
+
+
+def _covers_width(indices: Sequence[BlockIndex], width: int) -> bool:
+    """Whether the integer or slice ``indices`` cover all of ``range(width)``."""
+    covered = np.zeros(width, dtype=bool)
+    for index in indices:
+        covered[index] = True
+    return bool(covered.all())
+
+
+def _hashable_index(index: BlockIndex) -> Hashable:
+    if isinstance(index, slice):
+        return ("slice", index.start, index.stop, index.step)
+    return index
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Hashable, List, Sequence, Union
+from typing import Hashable, List, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -14,6 +14,7 @@ from meerkat.columns.numpy_column import NumpyArrayColumn
 from meerkat.columns.tensor_column import TensorColumn
 
 from .abstract import AbstractBlock, BlockIndex, BlockView
+from .row_index import RowIndex
 
 
 class ArrowBlock(AbstractBlock):
@@ -27,10 +28,17 @@ class ArrowBlock(AbstractBlock):
         super(ArrowBlock, self).__init__(*args, **kwargs)
         self.data = data
 
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
     @property
     def signature(self) -> Hashable:
         return self.Signature(klass=ArrowBlock, nrows=len(self.data))
 
+    def _covered_by(self, indices: Sequence[BlockIndex]) -> bool:
+        return set(indices) == set(self.data.column_names)
+
     def _get_data(self, index: BlockIndex) -> pa.Array:
         return self.data[index]
 
@@ -74,6 +82,8 @@ class ArrowBlock(AbstractBlock):
 
     @staticmethod
     def _convert_index(index):
+        if isinstance(index, RowIndex):
+            return index.to_indexer()
         if isinstance(index, list):
             return np.array(index)
         if torch.is_tensor(index):
@@ -111,18 +121,13 @@ class ArrowBlock(AbstractBlock):
             data = self.data[index]
         elif index.dtype == bool:
             data = self.data.filter(pa.array(index))
+        elif len(index) == 0:
+            data = self.data.slice(0, 0)
         else:
-            # we do not want to use ``data = self.data.take(index)``
-            # because it can't handle ChunkedArrays that don't fit in an Array
-            # https://issues.apache.org/jira/browse/ARROW-9773
-            # TODO (Sabri): Huggingface gets around this in a similar manner but
-            # applies the slices to the record batches, because this allows them to do
-            # the batch lookup in numpy, which is faster than pure python, which is
-            # presumably why Table.slice does
-            # noqa E501, https://github.com/huggingface/datasets/blob/491dad8507792f6f51077867e22412af7cd5c2f1/src/datasets/table.py#L110
-            data = pa.concat_tables(self.data.slice(i, 1) for i in index)
+            data = _take(self.data, index)
 
         block = self.__class__(data)
+        block._set_source(self, index)
 
         columns = {
             name: col._clone(data=block[col._block_index])
@@ -131,6 +136,16 @@ class ArrowBlock(AbstractBlock):
         # note that the new block may share memory with the old block
         return BlockRef(block=block, columns=columns)
 
+    def _get_rows(self, index: BlockIndex, start: int, stop: int) -> object:
+        return self.data[index].slice(start, stop - start)
+
+    def _deep_copy_data(self) -> pa.Table:
+        # arrow data is immutable, so it is never written to
+        return self.data
+
+    def _is_writeable(self) -> bool:
+        return False
+
     @staticmethod
     def _write_table(path: str, table: pa.Table):
         # noqa E501, source: huggingface implementation https://github.com/huggingface/datasets/blob/92304b42cf0cc6edafc97832c07de767b81306a6/src/datasets/table.py#L50
@@ -153,5 +168,60 @@ class ArrowBlock(AbstractBlock):
         self._write_table(os.path.join(path, "data.arrow"), self.data)
 
     @staticmethod
-    def _read_data(path: str, mmap: bool = False):
-        return ArrowBlock._read_table(os.path.join(path, "data.arrow"), mmap=mmap)
+    def _project(indices: Sequence[BlockIndex]) -> Tuple[List[str], List[str]]:
+        return list(dict.fromkeys(indices)), list(indices)
+
+    @staticmethod
+    def _read_data(path: str, mmap: bool = False, selection: List[str] = None):
+        path = os.path.join(path, "data.arrow")
+        if selection is None:
+            return ArrowBlock._read_table(path, mmap=mmap)
+        # the table is memory-mapped, so that only the buffers of the selected
+        # fields are read (arrow data is never written to, see `_deep_copy_data`)
+        return ArrowBlock._read_table(path, mmap=True).select(selection)
+
+
+def _take(table: pa.Table, index: np.ndarray) -> pa.Table:
+    """Gather the rows of ``table`` at ``index``, a 1D array of integers.
+
+    We do not want to use ``table.take(index)``, because it concatenates the chunks
+    of the table, which fails for chunks that don't fit in a single array
+    (https://issues.apache.org/jira/browse/ARROW-9773). Instead, the rows are
+    located in the record batches of the table with a binary search over the batch
+    boundaries and gathered with one ``take`` per batch. The output is assembled
+    in chunks of at most as many rows as the largest batch.
+    """
+    batches = table.to_batches()
+    lengths = np.array([len(batch) for batch in batches], dtype=np.int64)
+    index = np.asarray(index, dtype=np.int64)
+    if len(index) > 0 and (index.min() < 0 or index.max() >= table.num_rows):
+        raise IndexError(
+            f"Index out of bounds for ArrowBlock with {table.num_rows} rows."
+        )
+
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    batch_ids = np.searchsorted(bounds, index, side="right") - 1
+    offsets = index - bounds[batch_ids]
+
+    out = []
+    step = max(int(lengths.max(initial=0)), 1)
+    for start in range(0, len(index), step):
+        ids, rows = batch_ids[start : start + step], offsets[start : start + step]
+        # group the rows by batch, keeping their order within each batch
+        order = np.argsort(ids, kind="stable")
+        ids = ids[order]
+        splits = np.flatnonzero(np.diff(ids)) + 1
+        parts = [
+            batches[ids[group[0]]].take(pa.array(rows[order[group]]))
+            for group in np.split(np.arange(len(order)), splits)
+        ]
+        if np.all(order[1:] > order[:-1]):
+            # the rows were already grouped by batch, e.g. a sorted index
+            out.extend(parts)
+        else:
+            # restore the order of the index
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(len(order))
+            chunk = pa.Table.from_batches(parts, schema=table.schema)
+            out.extend(chunk.combine_chunks().take(pa.array(inverse)).to_batches())
+    return pa.Table.from_batches(out, schema=table.schema)
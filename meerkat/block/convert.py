@@ -0,0 +1,205 @@
+"""Conversions between numpy arrays, torch tensors and arrow arrays that share
+memory whenever possible.
+
+Fixed-width data without nulls is moved between the three without copying: arrow
+buffers are exposed to numpy with ``to_numpy(zero_copy_only=True)`` (as read-only
+arrays), numpy arrays are wrapped by torch with ``torch.from_numpy`` and by arrow
+with ``pa.array``, and CPU tensors are exposed to numpy with ``Tensor.numpy``.
+Multi-dimensional data is represented in arrow with (nested) fixed size lists.
+Sparse CSR matrices are converted to sparse CSR tensors the same way, array by
+array.
+
+Data is only copied when there is no way around it: arrow booleans (which are
+bit-packed), data with nulls, arrays of several chunks, dtypes not supported by
+the target, and read-only buffers handed to torch (torch has no read-only tensors,
+so writing to the tensor would modify arrow's immutable memory or fault on a
+read-only memory map).
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+import pyarrow as pa
+import scipy.sparse as sp
+import torch
+
+if TYPE_CHECKING:
+    from meerkat.columns.abstract import AbstractColumn
+
+
+def arrow_to_numpy(data: Union[pa.Array, pa.ChunkedArray]) -> np.ndarray:
+    """Return the values of ``data`` as a numpy array, a read-only view of the
+    arrow buffer if the data is fixed-width, null-free and in a single chunk."""
+    if isinstance(data, pa.ChunkedArray):
+        if data.num_chunks == 1:
+            return arrow_to_numpy(data.chunk(0))
+        if data.num_chunks > 1 and _is_zero_copy(data.type) and data.null_count == 0:
+            # a single copy into the output array
+            return np.concatenate([arrow_to_numpy(chunk) for chunk in data.chunks])
+        return data.to_numpy()
+
+    if data.null_count == 0 and pa.types.is_fixed_size_list(data.type):
+        if _is_zero_copy(data.type):
+            # `flatten` accounts for the offset of sliced arrays
+            values = arrow_to_numpy(data.flatten())
+            return values.reshape((len(data), data.type.list_size) + values.shape[1:])
+    elif data.null_count == 0 and _is_zero_copy(data.type):
+        return data.to_numpy(zero_copy_only=True)
+    return data.to_numpy(zero_copy_only=False)
+
+
+def numpy_to_arrow(array: np.ndarray) -> pa.Array:
+    """Return ``array`` as an arrow array, sharing its memory if it is fixed-width
+    and contiguous.
+
+    Arrays with more than one dimension are converted to (nested) fixed size lists.
+    """
+    if array.ndim <= 1:
+        return pa.array(array)
+    # a copy is needed to lay out the rows one after the other
+    array = np.ascontiguousarray(array)
+    values = numpy_to_arrow(array.reshape((-1,) + array.shape[2:]))
+    return pa.FixedSizeListArray.from_arrays(values, array.shape[1])
+
+
+def numpy_to_tensor(array: np.ndarray) -> torch.Tensor:
+    """Return ``array`` as a tensor, sharing its memory if the array is writable
+    and its dtype and strides are supported by torch."""
+    if not array.flags.writeable or any(stride < 0 for stride in array.strides):
+        # torch supports neither read-only tensors nor negative strides
+        array = np.array(array)
+    try:
+        return torch.from_numpy(array)
+    except TypeError:
+        # e.g. object arrays of numbers
+        return torch.tensor(array)
+
+
+def tensor_to_numpy(tensor: torch.Tensor) -> np.ndarray:
+    """Return ``tensor`` as a numpy array, sharing its memory if it is on the
+    CPU."""
+    return tensor.detach().cpu().numpy()
+
+
+def sparse_to_tensor(data: sp.spmatrix) -> torch.Tensor:
+    """Return ``data`` as a sparse CSR tensor, sharing the memory of its arrays
+    whenever :func:`numpy_to_tensor` does."""
+    data = data.tocsr()
+    if not data.has_sorted_indices:
+        # torch expects the column indices of each row in order
+        data = data.sorted_indices()
+    indptr, indices = data.indptr, data.indices
+    if indptr.dtype != indices.dtype:
+        # torch requires both index arrays to have the same dtype
+        indptr, indices = indptr.astype(np.int64), indices.astype(np.int64)
+    return torch.sparse_csr_tensor(
+        numpy_to_tensor(indptr),
+        numpy_to_tensor(indices),
+        numpy_to_tensor(data.data),
+        size=data.shape,
+        check_invariants=False,
+    )
+
+
+def tensor_to_sparse(tensor: torch.Tensor) -> sp.csr_matrix:
+    """Return the sparse or dense 2-D ``tensor`` as a CSR matrix."""
+    tensor = tensor.detach().cpu()
+    if tensor.layout != torch.sparse_csr:
+        tensor = tensor.to_sparse_csr()
+    return sp.csr_matrix(
+        (
+            tensor_to_numpy(tensor.values()),
+            tensor_to_numpy(tensor.col_indices()),
+            tensor_to_numpy(tensor.crow_indices()),
+        ),
+        shape=tuple(tensor.shape),
+    )
+
+
+def convert_column(column: AbstractColumn, klass: type) -> AbstractColumn:
+    """Convert ``column`` to a column of type ``klass``, which stores its data in a
+    different type of block (e.g. a ``NumpyArrayColumn`` to a ``TensorColumn``).
+
+    The converted column shares the buffer of ``column`` whenever the conversion
+    allows it, see the module docstring, so writes to one are visible in the other.
+    Columns converted from an ``ArrowArrayColumn`` without copying are read-only.
+
+    Args:
+        column (AbstractColumn): a ``NumpyArrayColumn``, ``TensorColumn``,
+            ``PandasSeriesColumn`` or ``ArrowArrayColumn``.
+        klass (type): one of the same column types.
+
+    Return:
+        AbstractColumn: a column of type ``klass``.
+    """
+    from meerkat.columns.arrow_column import ArrowArrayColumn
+    from meerkat.columns.numpy_column import NumpyArrayColumn
+    from meerkat.columns.pandas_column import PandasSeriesColumn
+    from meerkat.columns.tensor_column import TensorColumn
+
+    if isinstance(column, klass):
+        return column.view()
+
+    if isinstance(column, TensorColumn):
+        if klass is NumpyArrayColumn or klass is PandasSeriesColumn:
+            return klass(tensor_to_numpy(column.data))
+        if klass is ArrowArrayColumn:
+            return klass(numpy_to_arrow(tensor_to_numpy(column.data)))
+    elif isinstance(column, (NumpyArrayColumn, PandasSeriesColumn, ArrowArrayColumn)):
+        if isinstance(column, NumpyArrayColumn):
+            array = column.data
+        elif isinstance(column, PandasSeriesColumn):
+            array = column.data.values
+        else:
+            array = arrow_to_numpy(column.data)
+
+        if klass is NumpyArrayColumn or klass is PandasSeriesColumn:
+            return klass(array)
+        if klass is TensorColumn:
+            return klass(numpy_to_tensor(array))
+        if klass is ArrowArrayColumn:
+            return klass(numpy_to_arrow(array))
+
+    raise ValueError(
+        f"Cannot convert column of type {type(column).__name__} to {klass.__name__}."
+    )
+
+
+def column_to_arrow(column: AbstractColumn) -> Union[pa.Array, pa.ChunkedArray]:
+    """Return the data of ``column`` as arrow data, sharing memory whenever
+    possible (see the module docstring). Categorical columns are converted to
+    dictionary arrays.
+
+    Raises:
+        ValueError: if the data of the column has no arrow representation.
+    """
+    from meerkat.columns.arrow_column import ArrowArrayColumn
+    from meerkat.columns.list_column import ListColumn
+    from meerkat.columns.numpy_column import NumpyArrayColumn
+    from meerkat.columns.pandas_column import PandasSeriesColumn
+    from meerkat.columns.tensor_column import TensorColumn
+
+    try:
+        if isinstance(column, ArrowArrayColumn):
+            return column.data
+        if isinstance(column, NumpyArrayColumn):
+            return numpy_to_arrow(column.data)
+        if isinstance(column, TensorColumn):
+            return numpy_to_arrow(tensor_to_numpy(column.data))
+        if isinstance(column, PandasSeriesColumn):
+            return pa.Array.from_pandas(column.data)
+        if isinstance(column, ListColumn):
+            return pa.array(column.data)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise ValueError(
+            f"Cannot convert column of type {type(column).__name__} to arrow: {e}"
+        )
+    raise ValueError(f"Cannot convert column of type {type(column).__name__} to arrow.")
+
+
+def _is_zero_copy(type: pa.DataType) -> bool:
+    while pa.types.is_fixed_size_list(type):
+        type = type.value_type
+    # booleans are stored as bits, which numpy cannot view
+    return pa.types.is_primitive(type) and not pa.types.is_boolean(type)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Hashable, Union
+
+import pandas as pd
+
+from meerkat.block.ref import BlockRef
+
+from .abstract import BlockIndex
+from .pandas_block import PandasBlock
+
+
+class DictionaryBlock(PandasBlock):
+    """A block of dictionary-encoded columns, i.e. pandas ``Categorical``s.
+
+    Each column stores an integer code per row (of the smallest integer type that
+    fits the number of distinct values) and a dictionary of the distinct values.
+    Row gathers only gather the codes, the dictionaries are shared by the block
+    and the blocks gathered from it.
+    """
+
+    @property
+    def signature(self) -> Hashable:
+        return self.Signature(klass=DictionaryBlock, nrows=len(self.data))
+
+    def _get(
+        self, index, block_ref: BlockRef, materialize: bool = True
+    ) -> Union[BlockRef, dict]:
+        index = self._convert_index(index)
+        data = self.data.iloc[index]
+        if isinstance(index, int):
+            # if indexing a single row, we do not return a block manager, just a dict
+            return {
+                name: data[col._block_index] for name, col in block_ref.columns.items()
+            }
+
+        # unlike `reset_index(drop=True)`, `set_axis` does not copy the codes
+        data = data.set_axis(pd.RangeIndex(len(data)), axis=0, copy=False)
+        block = self.__class__(data)
+        block._set_source(self, index)
+
+        columns = {
+            name: col._clone(data=block[col._block_index])
+            for name, col in block_ref.columns.items()
+        }
+        # note that the new block shares the codes with the old block for slices
+        return BlockRef(block=block, columns=columns)
+
+    def _add_categories(self, index: BlockIndex, categories: pd.Index):
+        """Add ``categories`` to the dictionary of the column at ``index``.
+
+        The codes of the column are recomputed, so the column is updated in the
+        block the rows of this block are a view of (see :meth:`_cow_root`), and in
+        all its views.
+        """
+        block = self
+        while block._source is not None and block._source.view:
+            if block._source.index is not None:
+                # the block holds a single column of its source
+                index = block._source.index
+            block = block._source.block()
+        block.data[index] = block.data[index].cat.add_categories(categories)
+        block._update_views()
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import functools
 import os
 import shutil
+import threading
+import uuid
 from collections import defaultdict
 from collections.abc import MutableMapping
-from typing import Dict, Mapping, Sequence, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Collection, Dict, List, Mapping, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
@@ -15,7 +19,69 @@ from meerkat.block.abstract import AbstractBlock, BlockIndex
 from meerkat.columns.abstract import AbstractColumn
 from meerkat.tools.utils import MeerkatLoader
 
+from .memory import MemoryReport, memory_report
 from .ref import BlockRef
+from .row_index import RowIndex, SliceIndex
+
+# held while blocks are merged automatically, so that threads reading from the same
+# BlockManager (e.g. to prefetch batches) never see a partially merged manager
+_CONSOLIDATION_LOCK = threading.RLock()
+
+# the thread pool `BlockManager.apply` dispatches to and its number of threads, see
+# `_run_tasks`
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_THREADS = 0
+_EXECUTOR_LOCK = threading.Lock()
+_thread_state = threading.local()
+
+
+def _mark_pool_thread():
+    _thread_state.in_pool = True
+
+
+def _reset_executor():
+    # the threads of the pool do not exist in a forked child process
+    global _EXECUTOR
+    _EXECUTOR = None
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def _get_executor(num_threads: int) -> ThreadPoolExecutor:
+    global _EXECUTOR, _EXECUTOR_THREADS
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None or _EXECUTOR_THREADS != num_threads:
+            if _EXECUTOR is not None:
+                _EXECUTOR.shutdown(wait=False)
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=num_threads,
+                thread_name_prefix="meerkat-apply",
+                initializer=_mark_pool_thread,
+            )
+            _EXECUTOR_THREADS = num_threads
+        return _EXECUTOR
+
+
+def _run_tasks(tasks: List[Callable], nrows: int = None) -> list:
+    """Run ``tasks`` and return their outputs in order.
+
+    The tasks are dispatched to a pool of ``config.engine.num_threads`` threads
+    when they select at least ``config.engine.parallel_min_rows`` rows. Gathers
+    with numpy, torch, pandas and arrow release the GIL, so blocks are indexed in
+    parallel.
+    """
+    engine = meerkat.config.engine
+    if (
+        engine.num_threads <= 1
+        or len(tasks) <= 1
+        or (nrows is not None and nrows < engine.parallel_min_rows)
+        # tasks run by the pool (e.g. the `_get` of a `LambdaColumn` indexing
+        # another DataPanel) must not wait on the pool, it may be full
+        or getattr(_thread_state, "in_pool", False)
+    ):
+        return [task() for task in tasks]
+    return list(_get_executor(engine.num_threads).map(lambda task: task(), tasks))
 
 
 class BlockManager(MutableMapping):
@@ -25,6 +91,9 @@ class BlockManager(MutableMapping):
         self._columns: Dict[str, AbstractColumn] = {}  # ordered as of 3.7
         self._column_to_block_id: Dict[str, int] = {}
         self._block_refs: Dict[int, BlockRef] = {}
+        # block id => estimated cost of the row gathers on the block, in bytes
+        # copied, see `_auto_consolidate`
+        self._gather_costs: Dict[int, int] = defaultdict(int)
 
     def update(self, block_ref: BlockRef):
         """data (): a single blockable object, potentially contains multiple
@@ -55,40 +124,71 @@ class BlockManager(MutableMapping):
         Returns:
             [type]: [description]
         """
+        if method_name == "_get" and isinstance(kwargs.get("index"), RowIndex):
+            self._record_gather(kwargs["index"])
+
+        with _CONSOLIDATION_LOCK:
+            # the blocks may be merged by another thread while the method is applied
+            block_refs = [
+                BlockRef(columns=dict(block_ref.columns), block=block_ref.block)
+                for block_ref in self._block_refs.values()
+            ]
+            columns = dict(self._columns)
+
+        # apply method to columns not stored in block
+        in_block = {name for block_ref in block_refs for name in block_ref}
+        columns_outside = {
+            name: col for name, col in columns.items() if name not in in_block
+        }
+
+        tasks = [
+            functools.partial(block_ref.apply, method_name, *args, **kwargs)
+            for block_ref in block_refs
+        ] + [
+            functools.partial(getattr(col, method_name), *args, **kwargs)
+            for col in columns_outside.values()
+        ]
+        index = kwargs.get("index")
+        outputs = _run_tasks(
+            tasks, nrows=len(index) if isinstance(index, RowIndex) else None
+        )
+
         results = None
-        for block_ref in self._block_refs.values():
-            result = block_ref.apply(method_name=method_name, *args, **kwargs)
+        for result in outputs[: len(block_refs)]:
             if results is None:
                 results = BlockManager() if isinstance(result, BlockRef) else {}
             results.update(result)
 
-        # apply method to columns not stored in block
-        for name, col in self._columns.items():
-            if results is not None and name in results:
-                continue
-
-            result = getattr(col, method_name)(*args, **kwargs)
-
+        for name, result in zip(columns_outside, outputs[len(block_refs) :]):
             if results is None:
                 results = BlockManager() if isinstance(result, AbstractColumn) else {}
 
             results[name] = result
 
         if isinstance(results, BlockManager):
-            results.reorder(self.keys())
+            results.reorder(columns.keys())
         return results
 
-    def consolidate(self, consolidate_unitary_groups: bool = False):
+    def consolidate(
+        self, consolidate_unitary_groups: bool = False, skip: Collection[int] = ()
+    ):
         column_order = list(
             self._columns.keys()
         )  # need to maintain order after consolidate
 
         block_ref_groups = defaultdict(list)
-        for block_ref in self._block_refs.values():
-            block_ref_groups[block_ref.block.signature].append(block_ref)
+        for block_id, block_ref in self._block_refs.items():
+            if block_id not in skip:
+                block_ref_groups[block_ref.block.signature].append(block_ref)
 
         for block_refs in block_ref_groups.values():
-            if (not consolidate_unitary_groups) and len(block_refs) == 1:
+            if len(block_refs) == 1 and (
+                not consolidate_unitary_groups
+                # the block holds no data outside of its columns
+                or block_refs[0].block._covered_by(
+                    list(block_refs[0].block_indices.values())
+                )
+            ):
                 # if there is only one block ref in the group, do not consolidate
                 continue
 
@@ -99,6 +199,87 @@ class BlockManager(MutableMapping):
 
         self.reorder(column_order)
 
+    def _record_gather(self, index: RowIndex):
+        """Add the cost of a row selection with ``index`` to each block and merge
+        blocks if it has become cheaper, see :meth:`_auto_consolidate`."""
+        engine = meerkat.config.engine
+        if not engine.auto_consolidate or isinstance(index, SliceIndex):
+            # slices are views, their cost does not depend on the number of blocks
+            return
+        cost = engine.gather_overhead + len(index) * engine.gather_row_cost
+        with _CONSOLIDATION_LOCK:
+            for block_id in self._block_refs:
+                self._gather_costs[block_id] += cost
+            self._auto_consolidate()
+
+    def _auto_consolidate(self):
+        """Merge blocks with the same signature once the row gathers on the separate
+        blocks have cost more than merging them.
+
+        Each gather on a group of ``n`` blocks with the same signature does ``n``
+        gathers where one would do after merging them. The blocks are merged as
+        soon as the cost of the extra gathers so far exceeds the cost of copying
+        the blocks, so a workload never pays more than twice the cost of the best
+        choice in hindsight. The smallest blocks are merged first and at most
+        ``config.engine.max_consolidation_bytes`` are copied at a time, which
+        bounds the memory used on top of the blocks being merged.
+
+        Only blocks whose data is reachable through the columns of the manager
+        alone are merged (see :meth:`_is_private`), and those columns are pointed
+        to the merged block, so that columns held outside of the manager (e.g.
+        ``col = dp["a"]``) still share their data with it.
+        """
+        engine = meerkat.config.engine
+        block_ref_groups = defaultdict(list)
+        for block_ref in self._block_refs.values():
+            if block_ref.block._auto_consolidate and self._is_private(block_ref):
+                block_ref_groups[block_ref.block.signature].append(block_ref)
+
+        column_order = list(self._columns.keys())
+        consolidated = False
+        for block_refs in block_ref_groups.values():
+            selected, nbytes = [], 0
+            for block_ref in sorted(block_refs, key=lambda ref: ref.block.nbytes):
+                if nbytes + block_ref.block.nbytes > engine.max_consolidation_bytes:
+                    break
+                selected.append(block_ref)
+                nbytes += block_ref.block.nbytes
+            if len(selected) < 2:
+                continue
+
+            extra_cost = (len(selected) - 1) * min(
+                self._gather_costs[id(block_ref.block)] for block_ref in selected
+            )
+            if extra_cost < nbytes:
+                continue
+
+            for block_ref in selected:
+                self._gather_costs.pop(id(block_ref.block), None)
+            merged = selected[0].block.consolidate(selected)
+            columns = {}
+            for block_ref in selected:
+                for name, column in block_ref.items():
+                    column._set_data(merged.block[merged[name]._block_index])
+                    columns[name] = column
+            self.update(BlockRef(block=merged.block, columns=columns))
+            consolidated = True
+
+        if consolidated:
+            self.reorder(column_order)
+
+    @staticmethod
+    def _is_private(block_ref: BlockRef) -> bool:
+        """Whether the data of the block of ``block_ref`` can only be reached
+        through the columns of ``block_ref``, i.e. it is not a view of another
+        block, has no views, is not shared with a copy and backs no other column."""
+        block = block_ref.block
+        if block._source is not None and block._source.view:
+            return False
+        if len(block._views) > 0 or block._shared is not None:
+            return False
+        ids = {id(column) for column in block_ref.values()}
+        return all(key in ids for key in list(block._columns.keys()))
+
     def remove(self, name):
         if name not in self._columns:
             raise ValueError(f"Remove failed: no column '{name}' in BlockManager.")
@@ -112,6 +293,7 @@ class BlockManager(MutableMapping):
 
             if len(block_ref) == 0:
                 self._block_refs.pop(self._column_to_block_id[name])
+                self._gather_costs.pop(self._column_to_block_id[name], None)
 
             self._column_to_block_id.pop(name)
 
@@ -225,9 +407,9 @@ class BlockManager(MutableMapping):
                 and os.path.exists(columns_dir)
                 and os.path.exists(blocks_dir)
             ):
-                # if overwriting, ensure that old columns are removed
+                # if overwriting, ensure that old columns are removed, the old blocks
+                # are removed once the new ones are written
                 shutil.rmtree(columns_dir)
-                shutil.rmtree(blocks_dir)
             else:
                 # if path already points to a dir that wasn't previously holding a
                 # block manager, do not overwrite it. We'd like to protect against
@@ -237,17 +419,45 @@ class BlockManager(MutableMapping):
                 )
 
         os.makedirs(path, exist_ok=True)
-        os.makedirs(blocks_dir)
+        os.makedirs(blocks_dir, exist_ok=True)
         os.makedirs(columns_dir)
 
+        # blocks already stored in `blocks_dir` (i.e. written there or read from
+        # there, and not written to since) are kept as they are, blocks stored in
+        # another directory are hard-linked from there (see `AbstractBlock._save`)
+        saved, stored = {}, set()
+        for block_id, block_ref in self._block_refs.items():
+            block = block_ref.block
+            if not block._covered_by(list(block_ref.block_indices.values())):
+                continue
+            for block_path in block._saved_paths():
+                stored.add(block_id)
+                if os.path.dirname(block_path) == os.path.abspath(blocks_dir):
+                    saved[block_id] = os.path.basename(block_path)
+
         # consolidate before writing
         # we also want to consolidate unitary groups (i.e. groups with only one block
         # ref) so that we don't write any data not actually in the dataframe
-        self.consolidate(consolidate_unitary_groups=True)
+        self.consolidate(consolidate_unitary_groups=True, skip=stored)
+
+        # the remaining blocks are written in parallel
+        block_names, tasks = {}, []
+        for block_id, block_ref in self._block_refs.items():
+            if block_id in saved:
+                block_names[block_id] = saved[block_id]
+            else:
+                block_names[block_id] = uuid.uuid4().hex
+                tasks.append(
+                    functools.partial(
+                        block_ref.block._save,
+                        os.path.join(blocks_dir, block_names[block_id]),
+                    )
+                )
+        _run_tasks(tasks)
+
         for block_id, block_ref in self._block_refs.items():
             block: AbstractBlock = block_ref.block
-            block_dir = os.path.join(blocks_dir, str(block_id))
-            block.write(block_dir)
+            block_dir = os.path.join(blocks_dir, block_names[block_id])
 
             for name, column in block_ref.items():
                 column_dir = os.path.join(columns_dir, name)
@@ -274,22 +484,74 @@ class BlockManager(MutableMapping):
         # Save the metadata as a yaml file
         yaml.dump(meta, open(meta_path, "w"))
 
+        # remove the blocks no longer in the manager
+        for block_name in set(os.listdir(blocks_dir)) - set(block_names.values()):
+            shutil.rmtree(os.path.join(blocks_dir, block_name))
+
     @classmethod
     def read(
         cls,
         path: str,
         columns: Sequence[str] = None,
+        lazy: bool = False,
         *args,
         **kwargs,
     ) -> BlockManager:
-        """Load a DataPanel stored on disk."""
+        """Load a DataPanel stored on disk.
+
+        Args:
+            path (str): the directory the manager was written to.
+            columns (Sequence[str], optional): the columns to read, all columns if
+                None. Only the data of these columns is read from the blocks.
+            lazy (bool): whether to defer reading the data of each block until it
+                is first accessed. Defaults to False.
+        """
 
         # Load the metadata
         meta = dict(
             yaml.load(open(os.path.join(path, "meta.yaml")), Loader=MeerkatLoader)
         )
 
-        blocks = {}
+        # block dir => the (name, meta) of the columns to read from the block
+        block_columns = defaultdict(list)
+        # block dir => the number of columns stored in the block
+        block_sizes = defaultdict(int)
+        for name, col_meta in meta["columns"].items():
+            if "block" in col_meta:
+                block_dir = col_meta["block"]["block_dir"]
+                block_sizes[block_dir] += 1
+                if columns is None or name in columns:
+                    block_columns[block_dir].append((name, col_meta))
+
+        # column name => block view
+        block_views = {}
+        for block_dir, block_cols in block_columns.items():
+            block_dir_path = os.path.join(path, block_dir)
+            indices = [
+                _deserialize_block_index(col_meta["block"]["block_index"])
+                for _, col_meta in block_cols
+            ]
+            selection = None
+            if len(block_cols) < block_sizes[block_dir]:
+                # only read the data of the selected columns
+                block_class = AbstractBlock._read_class(block_dir_path)
+                selection, indices = block_class._project(indices)
+            read_kwargs = {"mmap": block_cols[0][1]["block"].get("mmap", False)}
+            if selection is not None:
+                read_kwargs["selection"] = selection
+            nrows = block_cols[0][1].get("len")
+            block = AbstractBlock.read(
+                block_dir_path,
+                lazy=lazy and nrows is not None,
+                nrows=nrows,
+                **read_kwargs,
+            )
+            if selection is None:
+                # the block is not written again by `write` unless it changes
+                block._record_saved(block_dir_path)
+            for (name, _), index in zip(block_cols, indices):
+                block_views[name] = block[index]
+
         mgr = cls()
         for name, col_meta in meta["columns"].items():
             column_dir = os.path.join(path, "columns", name)
@@ -297,22 +559,10 @@ class BlockManager(MutableMapping):
             if columns is not None and name not in columns:
                 continue
 
-            if "block" in col_meta:
-                # read block or fetch it from `blocks` if it's already been read
-                block_meta = col_meta["block"]
-                if block_meta["block_dir"] not in blocks:
-                    blocks[block_meta["block_dir"]] = AbstractBlock.read(
-                        os.path.join(path, block_meta["block_dir"]),
-                        mmap=block_meta.get("mmap", False),
-                    )
-                block = blocks[block_meta["block_dir"]]
-
+            if name in block_views:
                 # read column, passing in a block_view
                 col = col_meta["dtype"].read(
-                    column_dir,
-                    _data=block[_deserialize_block_index(block_meta["block_index"])],
-                    _meta=col_meta,
-                    **kwargs,
+                    column_dir, _data=block_views[name], _meta=col_meta, **kwargs
                 )
                 mgr.add_column(col, name)
             else:
@@ -320,7 +570,11 @@ class BlockManager(MutableMapping):
                     col_meta["dtype"].read(path=column_dir, _meta=col_meta, **kwargs),
                     name,
                 )
-        mgr.reorder(meta["_column_order"])
+        mgr.reorder(
+            meta["_column_order"]
+            if columns is None
+            else [name for name in meta["_column_order"] if name in mgr]
+        )
         return mgr
 
     def _repr_pandas_(self, max_rows: int = None):
@@ -352,11 +606,38 @@ class BlockManager(MutableMapping):
         return mgr
 
     def copy(self):
+        # each block is copied once, the copies share the data of the blocks until
+        # either is written to, see `AbstractBlock._copy_on_write`
         mgr = BlockManager()
+        for block_ref in self._block_refs.values():
+            block = block_ref.block.copy()
+            columns = {
+                name: col._clone(data=block[col._block_index])
+                for name, col in block_ref.items()
+            }
+            mgr.update(BlockRef(columns=columns, block=block))
         for name, col in self.items():
-            mgr.add_column(col.copy(), name)
+            if name not in mgr:
+                mgr.add_column(col.copy(), name)
+        mgr.reorder(self.keys())
         return mgr
 
+    def memory_report(self, deep: bool = False) -> MemoryReport:
+        """Return the number of bytes used by each column and each block.
+
+        Bytes memory-mapped from files are reported separately from bytes resident
+        in memory, and blocks shared with other DataPanels (views, copies or
+        DataPanels holding the same columns) are marked as such and counted once.
+
+        Args:
+            deep (bool): if True, also count the objects referenced by the data of
+                the columns (e.g. the items of a ``ListColumn``). Defaults to False.
+
+        Return:
+            MemoryReport: the per-column and per-block byte counts.
+        """
+        return memory_report(self, deep=deep)
+
 
 def _serialize_block_index(index: BlockIndex) -> Union[Dict, str, int]:
     if not isinstance(index, (int, str, slice)):
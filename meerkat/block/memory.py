@@ -0,0 +1,197 @@
+"""Accounting of the memory used by blocks and columns."""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from mmap import mmap
+from typing import TYPE_CHECKING, Dict, Iterator, Set
+
+import numpy as np
+import pandas as pd
+import torch
+
+if TYPE_CHECKING:
+    from meerkat.block.abstract import AbstractBlock
+    from meerkat.block.manager import BlockManager
+    from meerkat.columns.abstract import AbstractColumn
+
+
+@dataclass
+class MemoryReport:
+    """The memory used by the columns and blocks of a ``BlockManager``, see
+    :meth:`BlockManager.memory_report`.
+
+    Attributes:
+        columns (pd.DataFrame): one row per column, with the bytes used by the
+            column (``nbytes``), whether they are memory-mapped from a file
+            (``mmap``), the id of the block backing the column (``block``, None for
+            columns not stored in a block) and whether the block is shared with
+            other DataPanels, views or copies (``shared``).
+        blocks (pd.DataFrame): one row per block, with the block type, its columns,
+            the bytes it holds (``nbytes``), how many of those are memory-mapped
+            (``mmap_nbytes``), whether it is shared and the id of the memory buffer
+            it views (``buffer``). Blocks viewing the same buffer hold the same
+            memory, so reports of several DataPanels can be combined without
+            double counting with ``pd.concat(...).drop_duplicates("buffer")``.
+    """
+
+    columns: pd.DataFrame
+    blocks: pd.DataFrame
+
+    def _unique_blocks(self) -> pd.DataFrame:
+        # blocks viewing the same buffer are only counted once, with the largest view
+        return self.blocks.sort_values("nbytes").drop_duplicates("buffer", keep="last")
+
+    @property
+    def mmap_bytes(self) -> int:
+        """The bytes memory-mapped from files, which are not necessarily resident in
+        memory."""
+        return int(self._unique_blocks()["mmap_nbytes"].sum())
+
+    @property
+    def resident_bytes(self) -> int:
+        """The bytes held in memory."""
+        blocks = self._unique_blocks()
+        # columns whose data is not held in a block
+        in_blocks = {name for names in self.blocks["columns"] for name in names}
+        outside = self.columns[~self.columns.index.isin(in_blocks)]
+        return int(
+            (blocks["nbytes"] - blocks["mmap_nbytes"]).sum() + outside["nbytes"].sum()
+        )
+
+    @property
+    def shared_bytes(self) -> int:
+        """The bytes of the blocks shared with other DataPanels, views or copies,
+        which are not freed when the DataPanel is."""
+        blocks = self._unique_blocks()
+        return int(blocks[blocks["shared"]]["nbytes"].sum())
+
+    @property
+    def total_bytes(self) -> int:
+        return self.resident_bytes + self.mmap_bytes
+
+
+def memory_report(mgr: BlockManager, deep: bool = False) -> MemoryReport:
+    # columns nested in the DataPanel's `LambdaColumn`s are not other panels
+    managed = {
+        id(nested) for column in mgr.values() for nested in _nested_columns(column)
+    }
+    columns: Dict[str, dict] = {}
+    blocks: Dict[int, dict] = {}
+    for name, column in mgr.items():
+        column_blocks = [
+            nested._block for nested in _nested_columns(column) if nested.is_blockable()
+        ]
+        for block in column_blocks:
+            if id(block) not in blocks:
+                blocks[id(block)] = _block_row(block, managed)
+            if name not in blocks[id(block)]["columns"]:
+                blocks[id(block)]["columns"].append(name)
+
+        columns[name] = {
+            "type": type(column).__name__,
+            "nbytes": column.memory_usage(deep=deep),
+            "mmap": any(block.mmap_nbytes > 0 for block in column_blocks),
+            "block": id(column._block) if column.is_blockable() else None,
+            "shared": any(blocks[id(block)]["shared"] for block in column_blocks),
+        }
+
+    return MemoryReport(
+        columns=pd.DataFrame.from_dict(
+            columns,
+            orient="index",
+            columns=["type", "nbytes", "mmap", "block", "shared"],
+        ).astype({"block": "Int64"}),
+        blocks=pd.DataFrame.from_dict(
+            blocks,
+            orient="index",
+            columns=["type", "columns", "nbytes", "mmap_nbytes", "shared", "buffer"],
+        ),
+    )
+
+
+def _nested_columns(column: AbstractColumn) -> Iterator[AbstractColumn]:
+    """Yield ``column`` and the columns a ``LambdaColumn`` is computed from."""
+    from meerkat.columns.abstract import AbstractColumn
+    from meerkat.datapanel import DataPanel
+
+    yield column
+    if column.is_blockable():
+        return
+    data = column._data
+    if isinstance(data, DataPanel):
+        for col in data.values():
+            yield from _nested_columns(col)
+    elif isinstance(data, AbstractColumn):
+        yield from _nested_columns(data)
+
+
+def _block_row(block: AbstractBlock, managed: Set[int]) -> dict:
+    return {
+        "type": type(block).__name__,
+        "columns": [],
+        "nbytes": block.nbytes,
+        "mmap_nbytes": block.mmap_nbytes,
+        "shared": _is_shared(block, managed),
+        "buffer": _buffer_id(block),
+    }
+
+
+def _is_shared(block: AbstractBlock, managed: Set[int]) -> bool:
+    if any(key not in managed for key in list(block._columns.keys())):
+        # columns of other DataPanels (e.g. views) are backed by the block
+        return True
+    if (block._source is not None and block._source.view) or len(block._views) > 0:
+        return True
+    root = block._cow_root()
+    return root._shared is not None and len(root._shared) > 1
+
+
+def _buffer_id(block: AbstractBlock) -> int:
+    root = block._cow_root()
+    if root._shared is not None and len(root._shared) > 1:
+        # copies share the data until they are written to
+        return id(root._shared)
+    return id(root)
+
+
+def is_memory_mapped(array: np.ndarray) -> bool:
+    """Whether ``array`` is a view of a file mapped to memory."""
+    base = array
+    while base is not None:
+        if isinstance(base, mmap):
+            return True
+        base = getattr(base, "base", None)
+    return False
+
+
+def deep_sizeof(obj: object, seen: Set[int] = None) -> int:
+    """The bytes used by ``obj`` and the objects it holds (e.g. the items of a
+    list), each counted once."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        size = obj.nbytes
+        if obj.dtype == object:
+            size += sum(deep_sizeof(item, seen) for item in obj.ravel())
+        return size
+    if torch.is_tensor(obj):
+        return obj.element_size() * obj.nelement()
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        return int(np.sum(obj.memory_usage(index=False, deep=True)))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(key, seen) + deep_sizeof(value, seen)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
@@ -12,10 +12,22 @@ import torch
 from meerkat.block.ref import BlockRef
 from meerkat.errors import ConsolidationError
 
-from .abstract import AbstractBlock, BlockIndex, BlockView
+from .abstract import (
+    AbstractBlock,
+    BlockIndex,
+    BlockView,
+    _covers_width,
+    _project_positions,
+    _select_positions,
+)
+from .memory import is_memory_mapped
+from .row_index import RowIndex
 
 
 class NumpyBlock(AbstractBlock):
+    _auto_consolidate = True
+    _auto_layout = True
+
     @dataclass(eq=True, frozen=True)
     class Signature:
         dtype: np.dtype
@@ -32,6 +44,14 @@ class NumpyBlock(AbstractBlock):
             )
         self.data = data
 
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    @property
+    def mmap_nbytes(self) -> int:
+        return self.data.nbytes if is_memory_mapped(self.data) else 0
+
     @property
     def signature(self) -> Hashable:
         return self.Signature(
@@ -43,9 +63,22 @@ class NumpyBlock(AbstractBlock):
             dtype=self.data.dtype,
         )
 
+    def _covered_by(self, indices: Sequence[BlockIndex]) -> bool:
+        return _covers_width(indices, self.data.shape[1])
+
     def _get_data(self, index: BlockIndex, materialize: bool = True) -> np.ndarray:
         return self.data[:, index]
 
+    @property
+    def column_major(self) -> bool:
+        return self.data.shape[1] > 1 and self.data.swapaxes(0, 1).flags.c_contiguous
+
+    def _set_layout(self, column_major: bool):
+        if column_major:
+            self.data = np.ascontiguousarray(self.data.swapaxes(0, 1)).swapaxes(0, 1)
+        else:
+            self.data = np.ascontiguousarray(self.data)
+
     @classmethod
     def from_column_data(cls, data: np.ndarray) -> Tuple[NumpyBlock, BlockView]:
         """[summary]
@@ -117,6 +150,8 @@ class NumpyBlock(AbstractBlock):
 
     @staticmethod
     def _convert_index(index):
+        if isinstance(index, RowIndex):
+            return index.to_indexer()
         if torch.is_tensor(index):
             # need to convert to numpy for boolean indexing
             return index.numpy()
@@ -127,20 +162,39 @@ class NumpyBlock(AbstractBlock):
     ) -> Union[BlockRef, dict]:
         index = self._convert_index(index)
         # TODO: check if they're trying to index more than just the row dimension
-        data = self.data[index]
+        gather = isinstance(index, np.ndarray)
+        if gather and self.column_major:
+            # gather the rows from the data of each column, the block stays
+            # column-major
+            rows = np.flatnonzero(index) if index.dtype == bool else index
+            data = np.take(self.data.swapaxes(0, 1), rows, axis=1).swapaxes(0, 1)
+        else:
+            data = self.data[index]
         if isinstance(index, int):
             # if indexing a single row, we do not return a block manager, just a dict
             return {
                 name: data[col._block_index] for name, col in block_ref.columns.items()
             }
         block = self.__class__(data)
+        block._set_source(self, index)
         columns = {
             name: col._clone(data=block[col._block_index])
             for name, col in block_ref.columns.items()
         }
+        if gather:
+            self._record_row_gather(len(data))
         # note that the new block may share memory with the old block
         return BlockRef(block=block, columns=columns)
 
+    def _get_rows(self, index: BlockIndex, start: int, stop: int) -> object:
+        return self.data[start:stop, index]
+
+    def _deep_copy_data(self) -> np.ndarray:
+        return np.array(self.data)
+
+    def _is_writeable(self) -> bool:
+        return self.data.flags.writeable
+
     @property
     def is_mmap(self):
         # important to check if .base is a python mmap object, since a view of a mmap
@@ -157,10 +211,22 @@ class NumpyBlock(AbstractBlock):
         else:
             np.save(path, self.data)
 
+    _project = staticmethod(_project_positions)
+
     @staticmethod
-    def _read_data(path: str, mmap: bool = False):
+    def _read_data(path: str, mmap: bool = False, selection: np.ndarray = None):
         data_path = os.path.join(path, "data.npy")
 
+        if selection is not None:
+            try:
+                # only the pages holding the selected columns are read
+                data = np.load(data_path, mmap_mode="r")
+            except ValueError:
+                # arrays of python objects cannot be memory-mapped
+                data = np.load(data_path, allow_pickle=True)
+            data = _select_positions(data, selection)
+            return data if mmap or not is_memory_mapped(data) else np.array(data)
+
         if mmap:
             return np.load(data_path, mmap_mode="r")
         return np.load(data_path, allow_pickle=True)
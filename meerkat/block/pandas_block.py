@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Hashable, Sequence, Tuple, Union
+from typing import Hashable, List, Sequence, Tuple, Union
 
 import pandas as pd
 import torch
@@ -12,9 +12,12 @@ from meerkat.columns.numpy_column import NumpyArrayColumn
 from meerkat.columns.tensor_column import TensorColumn
 
 from .abstract import AbstractBlock, BlockIndex, BlockView
+from .row_index import RowIndex
 
 
 class PandasBlock(AbstractBlock):
+    _auto_consolidate = True
+
     @dataclass(eq=True, frozen=True)
     class Signature:
         nrows: int
@@ -24,6 +27,10 @@ class PandasBlock(AbstractBlock):
         super(PandasBlock, self).__init__(*args, **kwargs)
         self.data = data
 
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.memory_usage(index=False).sum())
+
     @property
     def signature(self) -> Hashable:
         return self.Signature(
@@ -32,6 +39,9 @@ class PandasBlock(AbstractBlock):
             nrows=len(self.data),
         )
 
+    def _covered_by(self, indices: Sequence[BlockIndex]) -> bool:
+        return set(indices) == set(self.data.columns)
+
     def _get_data(self, index: BlockIndex) -> pd.Series:
         return self.data[index]
 
@@ -49,7 +59,9 @@ class PandasBlock(AbstractBlock):
         Returns:
             Tuple[PandasBlock, Mapping[str, BlockIndex]]: [description]
         """
-        data = pd.DataFrame({"col": data})
+        # unlike `pd.DataFrame({"col": data})`, `to_frame` does not copy the data, so
+        # writes to the column are reflected in the block
+        data = data.to_frame(name="col")
         block = cls(data)
         return BlockView(block_index="col", block=block)
 
@@ -80,6 +92,8 @@ class PandasBlock(AbstractBlock):
 
     @staticmethod
     def _convert_index(index):
+        if isinstance(index, RowIndex):
+            return index.to_indexer()
         if torch.is_tensor(index):
             # need to convert to numpy for boolean indexing
             return index.numpy()
@@ -113,6 +127,7 @@ class PandasBlock(AbstractBlock):
         # comparisons etc.
         data = data.reset_index(drop=True)
         block = self.__class__(data)
+        block._set_source(self, index)
 
         columns = {
             name: col._clone(data=block[col._block_index])
@@ -121,9 +136,28 @@ class PandasBlock(AbstractBlock):
         # note that the new block may share memory with the old block
         return BlockRef(block=block, columns=columns)
 
+    @staticmethod
+    def _take_rows(data: object, rows: object) -> object:
+        data = data.iloc[rows]
+        # the rows of pandas columns are always labeled from 0
+        return data.set_axis(pd.RangeIndex(len(data)), axis=0, copy=False)
+
+    def _get_rows(self, index: BlockIndex, start: int, stop: int) -> object:
+        return self.data[index].iloc[start:stop]
+
+    def _shallow_copy_data(self) -> pd.DataFrame:
+        return self.data.copy(deep=False)
+
+    def _deep_copy_data(self) -> pd.DataFrame:
+        return self.data.copy(deep=True)
+
     def _write_data(self, path: str):
         self.data.reset_index(drop=True).to_feather(os.path.join(path, "data.feather"))
 
     @staticmethod
-    def _read_data(path: str, mmap: bool = False):
-        return pd.read_feather(os.path.join(path, "data.feather"))
+    def _project(indices: Sequence[BlockIndex]) -> Tuple[List[str], List[str]]:
+        return list(dict.fromkeys(indices)), list(indices)
+
+    @staticmethod
+    def _read_data(path: str, mmap: bool = False, selection: List[str] = None):
+        return pd.read_feather(os.path.join(path, "data.feather"), columns=selection)
@@ -0,0 +1,245 @@
+"""Row indices shared by DataPanels, columns and blocks.
+
+A :class:`RowIndex` selects rows from a sequence of known length (``nrows``). It
+keeps the cheapest representation of the selection:
+
+- :class:`SliceIndex` for slices and ranges (no per-row storage at all),
+- :class:`ArrayIndex` for sparse selections (an int64 array of positions),
+- :class:`BitmapIndex` for dense boolean selections (one byte per row).
+
+Indices are converted once, with :meth:`RowIndex.from_index`, and composed with
+:meth:`RowIndex.compose`, which is O(selected) rather than O(nrows) for slices and
+arrays.
+"""
+from __future__ import annotations
+
+from typing import Iterator, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import torch
+
+# boolean masks selecting at least this fraction of the rows are kept as bitmaps,
+# below it an int64 array of positions is smaller (8 bytes per selected row vs. 1
+# byte per row)
+BITMAP_DENSITY = 1 / 8
+
+
+class RowIndex:
+    """A selection of rows out of ``nrows`` rows."""
+
+    def __init__(self, nrows: int):
+        self.nrows = nrows
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_array().tolist())
+
+    def to_array(self) -> np.ndarray:
+        """Return the selected positions as an int64 array."""
+        raise NotImplementedError
+
+    def to_indexer(self) -> Union[slice, np.ndarray]:
+        """Return an object that can be used to index numpy arrays, tensors,
+        pandas ``iloc`` and arrow tables: a slice, an int64 array or a boolean
+        mask."""
+        raise NotImplementedError
+
+    def compose(self, index: object) -> RowIndex:
+        """Select rows from this selection.
+
+        Args:
+            index (object): an index into the rows selected by ``self`` (i.e.
+                relative to ``len(self)``, not ``self.nrows``).
+
+        Return:
+            RowIndex: the equivalent index into the original ``self.nrows`` rows.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def from_index(cls, index: object, nrows: int) -> RowIndex:
+        """Convert any row index accepted by meerkat into a ``RowIndex``.
+
+        Args:
+            index (object): a slice, range, list, tuple, numpy array, torch tensor,
+                pandas Series, arrow array, column or ``RowIndex``. Integer arrays
+                may contain negative positions, boolean arrays must have length
+                ``nrows``.
+            nrows (int): the number of rows the index selects from.
+        """
+        if isinstance(index, RowIndex):
+            if index.nrows != nrows:
+                raise IndexError(
+                    f"RowIndex into {index.nrows} rows cannot index {nrows} rows."
+                )
+            return index
+
+        if isinstance(index, slice):
+            return SliceIndex(range(nrows)[index], nrows=nrows)
+
+        if isinstance(index, range):
+            if len(index) == 0:
+                return SliceIndex(range(0), nrows=nrows)
+            lo, hi = min(index[0], index[-1]), max(index[0], index[-1])
+            if lo < -nrows or hi >= nrows:
+                raise IndexError(f"{index} is out of bounds for {nrows} rows.")
+            if lo < 0:
+                # negative positions wrap around, so this is not a slice
+                return ArrayIndex(np.array(index), nrows=nrows)
+            return SliceIndex(index, nrows=nrows)
+
+        array = _to_array(index)
+        if array.ndim != 1:
+            raise TypeError(
+                "`np.ndarray` index must have 1 axis, not {}".format(array.ndim)
+            )
+        if array.dtype == bool:
+            if len(array) != nrows:
+                raise IndexError(
+                    f"Boolean index of length {len(array)} does not match "
+                    f"length {nrows}."
+                )
+            if nrows and array.sum() >= BITMAP_DENSITY * nrows:
+                return BitmapIndex(array)
+            return ArrayIndex(np.flatnonzero(array), nrows=nrows)
+
+        if len(array) == 0:
+            return ArrayIndex(np.zeros(0, dtype=np.int64), nrows=nrows)
+        if not np.issubdtype(array.dtype, np.integer):
+            raise IndexError(
+                "Arrays used as indices must be of integer or boolean type, "
+                f"not {array.dtype}."
+            )
+        return ArrayIndex(array, nrows=nrows)
+
+
+class SliceIndex(RowIndex):
+    """Rows selected by a slice or range, stored as a ``range`` with
+    non-negative bounds."""
+
+    def __init__(self, rows: range, nrows: int):
+        super().__init__(nrows=nrows)
+        self.range = rows
+
+    def __repr__(self) -> str:
+        r = self.range
+        return f"SliceIndex({r.start}:{r.stop}:{r.step}, nrows={self.nrows})"
+
+    def __len__(self) -> int:
+        return len(self.range)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.range)
+
+    @property
+    def is_full(self) -> bool:
+        """Whether the slice selects all rows in order."""
+        return len(self.range) == self.nrows and (
+            self.nrows <= 1 or self.range.step == 1
+        )
+
+    def to_array(self) -> np.ndarray:
+        r = self.range
+        return np.arange(r.start, r.stop, r.step, dtype=np.int64)
+
+    def to_indexer(self) -> slice:
+        r = self.range
+        # a negative stop would wrap around, for descending slices that run to the
+        # first row the stop must be None
+        return slice(r.start, r.stop if r.stop >= 0 else None, r.step)
+
+    def compose(self, index: object) -> RowIndex:
+        index = RowIndex.from_index(index, nrows=len(self))
+        if isinstance(index, SliceIndex):
+            return SliceIndex(self.range[index.to_indexer()], nrows=self.nrows)
+
+        if self.is_full:
+            # selecting from all rows is a no-op, keep the representation
+            return index
+
+        r = self.range
+        return ArrayIndex(r.start + r.step * index.to_array(), nrows=self.nrows)
+
+
+class ArrayIndex(RowIndex):
+    """Rows selected by an array of (non-negative) int64 positions."""
+
+    def __init__(self, array: np.ndarray, nrows: int):
+        super().__init__(nrows=nrows)
+        array = np.asarray(array).astype(np.int64, copy=False)
+        if len(array):
+            lo, hi = array.min(), array.max()
+            if lo < -nrows or hi >= nrows:
+                raise IndexError(
+                    f"Index {lo if lo < -nrows else hi} is out of bounds for "
+                    f"{nrows} rows."
+                )
+            if lo < 0:
+                array = np.where(array < 0, array + nrows, array)
+        self.array = array
+
+    def __repr__(self) -> str:
+        return f"ArrayIndex(n={len(self.array)}, nrows={self.nrows})"
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def to_array(self) -> np.ndarray:
+        return self.array
+
+    def to_indexer(self) -> np.ndarray:
+        return self.array
+
+    def compose(self, index: object) -> RowIndex:
+        index = RowIndex.from_index(index, nrows=len(self))
+        return ArrayIndex(self.array[index.to_indexer()], nrows=self.nrows)
+
+
+class BitmapIndex(RowIndex):
+    """Rows selected by a boolean mask of length ``nrows``."""
+
+    def __init__(self, mask: np.ndarray):
+        super().__init__(nrows=len(mask))
+        self.mask = mask
+        self._positions = None
+
+    def __repr__(self) -> str:
+        return f"BitmapIndex(n={len(self)}, nrows={self.nrows})"
+
+    def __len__(self) -> int:
+        return len(self.to_array())
+
+    def to_array(self) -> np.ndarray:
+        if self._positions is None:
+            self._positions = np.flatnonzero(self.mask)
+        return self._positions
+
+    def to_indexer(self) -> np.ndarray:
+        return self.mask
+
+    def compose(self, index: object) -> RowIndex:
+        index = RowIndex.from_index(index, nrows=len(self))
+        if isinstance(index, BitmapIndex):
+            # stay a bitmap: O(nrows), but no positions are materialized
+            mask = np.zeros_like(self.mask)
+            mask[self.mask] = index.mask
+            return BitmapIndex(mask)
+        return ArrayIndex(self.to_array()[index.to_indexer()], nrows=self.nrows)
+
+
+def _to_array(index: object) -> np.ndarray:
+    from meerkat.columns.abstract import AbstractColumn
+
+    if isinstance(index, AbstractColumn):
+        index = index._data
+    if isinstance(index, pd.Series):
+        index = index.values
+    elif isinstance(index, (pa.Array, pa.ChunkedArray)):
+        index = index.to_numpy(zero_copy_only=False)
+    elif torch.is_tensor(index):
+        index = index.cpu().numpy()
+    return np.asarray(index)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Hashable, Sequence, Union
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+
+from meerkat.block.ref import BlockRef
+from meerkat.errors import ConsolidationError
+
+from .abstract import (
+    AbstractBlock,
+    BlockIndex,
+    BlockView,
+    _covers_width,
+    _project_positions,
+    _select_positions,
+)
+from .memory import is_memory_mapped
+from .row_index import RowIndex
+
+
+class SparseBlock(AbstractBlock):
+    """A block of sparse matrices in compressed sparse row (CSR) format.
+
+    The data is a ``scipy.sparse.csr_matrix`` of shape ``(nrows, nfeatures)``, each
+    column of the block holds a range of the features. Slices of rows share the
+    ``data`` and ``indices`` arrays of the block, gathers copy only the stored
+    values of the rows gathered.
+
+    Unlike rows, a range of the features of a CSR matrix cannot be viewed without
+    copying, so the columns of a consolidated block hold a copy of their features.
+    Sparse blocks are therefore only consolidated on request (e.g. before a
+    ``write``), never automatically.
+    """
+
+    @dataclass(eq=True, frozen=True)
+    class Signature:
+        dtype: np.dtype
+        nrows: int
+        klass: type
+
+    def __init__(self, data, *args, **kwargs):
+        super(SparseBlock, self).__init__(*args, **kwargs)
+        if not sp.issparse(data):
+            raise ValueError("Cannot create a `SparseBlock` from non-sparse data.")
+        self.data = data.tocsr()
+
+    @property
+    def nrows(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays())
+
+    @property
+    def mmap_nbytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays() if is_memory_mapped(array))
+
+    @property
+    def is_mmap(self):
+        return self.mmap_nbytes > 0
+
+    def _arrays(self):
+        return self.data.data, self.data.indices, self.data.indptr
+
+    @property
+    def signature(self) -> Hashable:
+        return self.Signature(
+            klass=SparseBlock, nrows=self.nrows, dtype=self.data.dtype
+        )
+
+    def _covered_by(self, indices: Sequence[BlockIndex]) -> bool:
+        return _covers_width(indices, self.data.shape[1])
+
+    def _get_data(self, index: BlockIndex, materialize: bool = True) -> sp.csr_matrix:
+        if range(self.data.shape[1])[index] == range(self.data.shape[1]):
+            return self.data
+        return self.data[:, index]
+
+    @classmethod
+    def from_column_data(cls, data: sp.spmatrix) -> BlockView:
+        block = cls(data)
+        return BlockView(block=block, block_index=slice(0, block.data.shape[1]))
+
+    @classmethod
+    def _consolidate(
+        cls,
+        block_refs: Sequence[BlockRef],
+    ) -> BlockRef:
+        offset = 0
+        new_indices = {}
+        columns = {}
+        to_concat = []
+        for block_ref in block_refs:
+            for name, col in block_ref.items():
+                if name in columns:
+                    raise ConsolidationError(
+                        "Cannot consolidate two block refs containing the same column."
+                    )
+                columns[name] = col
+                block_view = col._block._get_data(col._block_index)
+                new_indices[name] = slice(offset, offset + block_view.shape[1])
+                to_concat.append(block_view)
+                offset += block_view.shape[1]
+
+        if len(to_concat) == 1:
+            # e.g. before a write, the data (possibly memory-mapped) is kept as is
+            data = to_concat[0]
+        else:
+            data = sp.hstack(to_concat, format="csr")
+        block = cls(data)
+        new_columns = {
+            name: columns[name]._clone(data=block[block_index])
+            for name, block_index in new_indices.items()
+        }
+        return BlockRef(block=block, columns=new_columns)
+
+    @staticmethod
+    def _convert_index(index):
+        if isinstance(index, RowIndex):
+            return index.to_indexer()
+        if torch.is_tensor(index):
+            return index.numpy()
+        return index
+
+    @staticmethod
+    def _take_rows(data: sp.csr_matrix, rows: object) -> sp.csr_matrix:
+        if isinstance(rows, slice) and rows.step in (None, 1):
+            return _slice_rows(data, rows)
+        if isinstance(rows, np.ndarray) and rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return data[rows]
+
+    def _get(
+        self, index, block_ref: BlockRef, materialize: bool = True
+    ) -> Union[BlockRef, dict]:
+        index = self._convert_index(index)
+        if isinstance(index, (int, np.integer)):
+            # if indexing a single row, we do not return a block manager, just a dict
+            row = self.data[index]
+            return {
+                name: row[:, col._block_index]
+                for name, col in block_ref.columns.items()
+            }
+        block = self.__class__(self._take_rows(self.data, index))
+        block._set_source(self, index)
+        columns = {
+            name: col._clone(data=block[col._block_index])
+            for name, col in block_ref.columns.items()
+        }
+        # note that the new block shares memory with the old block for slices
+        return BlockRef(block=block, columns=columns)
+
+    def _get_rows(self, index: BlockIndex, start: int, stop: int) -> object:
+        rows = self._get_data(index)[start:stop]
+        return rows.data, rows.indices, rows.indptr
+
+    def _deep_copy_data(self) -> sp.csr_matrix:
+        return self.data.copy()
+
+    def _is_writeable(self) -> bool:
+        return self.data.data.flags.writeable
+
+    def _digest_data(self) -> object:
+        return self._arrays()
+
+    def _write_data(self, path: str):
+        self._write_csr(path, self.data)
+
+    _project = staticmethod(_project_positions)
+
+    @staticmethod
+    def _read_data(
+        path: str, mmap: bool = False, selection: np.ndarray = None
+    ) -> sp.csr_matrix:
+        if selection is None:
+            return SparseBlock._read_csr(path, mmap=mmap)
+        # the selected features are copied out of the memory-mapped matrix
+        return _select_positions(SparseBlock._read_csr(path, mmap=True), selection)
+
+    @staticmethod
+    def _write_csr(path: str, data: sp.csr_matrix):
+        """Write the arrays of ``data`` to separate ``.npy`` files in ``path``, so
+        that they can be memory-mapped when read."""
+        np.save(os.path.join(path, "data.npy"), data.data)
+        np.save(os.path.join(path, "indices.npy"), data.indices)
+        np.save(os.path.join(path, "indptr.npy"), data.indptr)
+        np.save(os.path.join(path, "shape.npy"), np.array(data.shape))
+
+    @staticmethod
+    def _read_csr(path: str, mmap: bool = False) -> sp.csr_matrix:
+        mmap_mode = "r" if mmap else None
+        arrays = [
+            np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in ["data", "indices", "indptr"]
+        ]
+        shape = tuple(np.load(os.path.join(path, "shape.npy")))
+        return sp.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+def _slice_rows(data: sp.csr_matrix, rows: slice) -> sp.csr_matrix:
+    """Return the rows ``rows`` (a slice with step 1) of ``data``, sharing the
+    ``data`` and ``indices`` arrays of ``data``."""
+    start, stop, _ = rows.indices(data.shape[0])
+    stop = max(start, stop)
+    indptr = data.indptr[start : stop + 1]
+    first, last = indptr[0], indptr[-1]
+    out = sp.csr_matrix((stop - start, data.shape[1]), dtype=data.dtype)
+    # the arrays are assigned rather than passed to the constructor, which copies
+    # slices of less than half of an array
+    out.indptr = indptr - first
+    out.indices = data.indices[first:last]
+    out.data = data.data[first:last]
+    return out
@@ -12,10 +12,21 @@ from meerkat.block.ref import BlockRef
 from meerkat.columns.numpy_column import NumpyArrayColumn
 from meerkat.errors import ConsolidationError
 
-from .abstract import AbstractBlock, BlockIndex, BlockView
+from .abstract import (
+    AbstractBlock,
+    BlockIndex,
+    BlockView,
+    _covers_width,
+    _project_positions,
+    _select_positions,
+)
+from .row_index import RowIndex
 
 
 class TensorBlock(AbstractBlock):
+    _auto_consolidate = True
+    _auto_layout = True
+
     @dataclass(eq=True, frozen=True)
     class Signature:
         device: torch.device
@@ -32,6 +43,10 @@ class TensorBlock(AbstractBlock):
             )
         self.data = data
 
+    @property
+    def nbytes(self) -> int:
+        return self.data.element_size() * self.data.nelement()
+
     @property
     def signature(self) -> Hashable:
         return self.Signature(
@@ -42,9 +57,22 @@ class TensorBlock(AbstractBlock):
             dtype=self.data.dtype,
         )
 
+    def _covered_by(self, indices: Sequence[BlockIndex]) -> bool:
+        return _covers_width(indices, self.data.shape[1])
+
     def _get_data(self, index: BlockIndex) -> torch.Tensor:
         return self.data[:, index]
 
+    @property
+    def column_major(self) -> bool:
+        return self.data.shape[1] > 1 and self.data.transpose(0, 1).is_contiguous()
+
+    def _set_layout(self, column_major: bool):
+        if column_major:
+            self.data = self.data.transpose(0, 1).contiguous().transpose(0, 1)
+        else:
+            self.data = self.data.contiguous()
+
     @classmethod
     def from_column_data(cls, data: torch.Tensor) -> Tuple[TensorBlock, BlockView]:
         """[summary]
@@ -116,6 +144,13 @@ class TensorBlock(AbstractBlock):
 
     @staticmethod
     def _convert_index(index):
+        if isinstance(index, RowIndex):
+            indexer = index.to_indexer()
+            if isinstance(indexer, slice) and indexer.step > 0:
+                return indexer
+            # torch does not support negative steps
+            return torch.as_tensor(index.to_array())
+
         if isinstance(index, NumpyArrayColumn) and index.data.dtype == np.bool_:
             # needed to silence torch deprecation warning
             # DeprecationWarning: In future, it will be an error for 'np.bool_' scalars
@@ -146,26 +181,51 @@ class TensorBlock(AbstractBlock):
     def _get(
         self, index, block_ref: BlockRef, materialize: bool = True
     ) -> Union[BlockRef, dict]:
-
         index = self._convert_index(index)
         # TODO: check if they're trying to index more than just the row dimension
-        data = self.data[index]
+        gather = torch.is_tensor(index)
+        if gather and self.column_major:
+            # gather the rows from the data of each column, the block stays
+            # column-major
+            data = self.data.transpose(0, 1)[:, index].transpose(0, 1)
+        else:
+            data = self.data[index]
         if isinstance(index, int):
             # if indexing a single row, we do not return a block manager, just a dict
             return {
                 name: data[col._block_index] for name, col in block_ref.columns.items()
             }
         block = self.__class__(data)
+        block._set_source(self, index)
         columns = {
             name: col._clone(data=block[col._block_index])
             for name, col in block_ref.columns.items()
         }
+        if gather:
+            self._record_row_gather(len(data))
         # note that the new block may share memory with the old block
         return BlockRef(block=block, columns=columns)
 
+    def _get_rows(self, index: BlockIndex, start: int, stop: int) -> object:
+        return self.data[start:stop, index]
+
+    def _deep_copy_data(self) -> torch.Tensor:
+        return self.data.clone()
+
     def _write_data(self, path: str):
         torch.save(self.data, os.path.join(path, "data.pt"))
 
+    _project = staticmethod(_project_positions)
+
     @staticmethod
-    def _read_data(path: str, mmap: bool = False):
-        return torch.load(os.path.join(path, "data.pt"))
+    def _read_data(path: str, mmap: bool = False, selection: np.ndarray = None):
+        data_path = os.path.join(path, "data.pt")
+        if selection is None:
+            return torch.load(data_path)
+        try:
+            # only the pages holding the selected columns are read
+            data = torch.load(data_path, mmap=True)
+        except RuntimeError:
+            # files written in the legacy format cannot be memory-mapped
+            data = torch.load(data_path)
+        return _select_positions(data, selection).clone()
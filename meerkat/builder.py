@@ -0,0 +1,314 @@
+"""Bulk construction of DataPanels from rows and batches."""
+from __future__ import annotations
+
+import numbers
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import torch
+from pandas._libs import lib
+
+from meerkat.columns.abstract import AbstractColumn
+from meerkat.columns.numpy_column import NumpyArrayColumn
+from meerkat.columns.pandas_column import PandasSeriesColumn
+from meerkat.columns.tensor_column import TensorColumn
+
+if TYPE_CHECKING:
+    from meerkat.datapanel import DataPanel
+
+# dtypes for the results of `pandas._libs.lib.infer_dtype` on object arrays of
+# Python scalars, NaN marks a missing value
+_INFERRED_DTYPES = {
+    "boolean": np.bool_,
+    "integer": np.int64,
+    "floating": np.float64,
+    "mixed-integer-float": np.float64,
+}
+
+# the kinds of buffers a column can be built in
+NUMPY = "numpy"
+TENSOR = "tensor"
+OBJECT = "object"
+
+
+class _ColumnBuilder:
+    """Accumulates the values of a single column.
+
+    Numeric values (scalars or fixed-shape arrays) are written into a preallocated
+    numpy array and tensors into a preallocated tensor, which grow geometrically
+    when the capacity is exceeded. Everything else (e.g. strings, cells, nested
+    lists) is kept in a list and converted with :meth:`AbstractColumn.from_data`, so
+    the resulting column types match those of ``DataPanel(...)``. If a later value
+    does not fit the buffer (e.g. a string after a run of ints), the column falls
+    back to a list.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self.capacity = capacity
+        self.length = 0
+        self.kind: Optional[str] = None
+        self.buffer = None
+
+    def extend(self, values: object):
+        values = _unwrap(values)
+        n = len(values)
+        if n == 0:
+            return
+
+        if self.kind is None:
+            self.kind = _infer_kind(values)
+
+        if self.kind == NUMPY:
+            array = _as_numeric_array(values)
+            if array is not None and self._fits(array):
+                return self._write(array)
+        elif self.kind == TENSOR:
+            tensor = _as_tensor(values)
+            if tensor is not None and self._fits(tensor):
+                return self._write(tensor)
+
+        if self.kind != OBJECT or self.buffer is None:
+            self._to_object()
+        if isinstance(values, (np.ndarray, torch.Tensor)):
+            values = list(values)
+        self.buffer.extend(values)
+        self.length += n
+
+    def _fits(self, values: object) -> bool:
+        if self.buffer is None:
+            return True
+        if tuple(values.shape[1:]) != tuple(self.buffer.shape[1:]):
+            return False
+        if self.kind == NUMPY:
+            if not np.can_cast(values.dtype, self.buffer.dtype, casting="safe"):
+                # promote the buffer, e.g. int => float when a float is seen
+                dtype = np.promote_types(values.dtype, self.buffer.dtype)
+                self.buffer = self.buffer.astype(dtype)
+            return True
+        return values.dtype == self.buffer.dtype and values.device == (
+            self.buffer.device
+        )
+
+    def _write(self, values: object):
+        n = len(values)
+        end = self.length + n
+        if self.buffer is None:
+            shape = (max(self.capacity, n),) + tuple(values.shape[1:])
+            if self.kind == NUMPY:
+                self.buffer = np.empty(shape, dtype=values.dtype)
+            else:
+                self.buffer = torch.empty(
+                    shape, dtype=values.dtype, device=values.device
+                )
+        elif end > len(self.buffer):
+            self._grow(max(end, 2 * len(self.buffer)))
+        self.buffer[self.length : end] = values
+        self.length = end
+
+    def _grow(self, capacity: int):
+        shape = (capacity,) + tuple(self.buffer.shape[1:])
+        if self.kind == NUMPY:
+            buffer = np.empty(shape, dtype=self.buffer.dtype)
+        else:
+            buffer = torch.empty(
+                shape, dtype=self.buffer.dtype, device=self.buffer.device
+            )
+        buffer[: self.length] = self.buffer[: self.length]
+        self.buffer = buffer
+
+    def _to_object(self):
+        if self.buffer is None:
+            self.buffer = []
+        else:
+            self.buffer = list(self.buffer[: self.length])
+        self.kind = OBJECT
+
+    def build(self) -> AbstractColumn:
+        if self.kind == NUMPY:
+            data = self.buffer[: self.length]
+            # drop the unused capacity
+            return NumpyArrayColumn(
+                data if len(self.buffer) == self.length else data.copy()
+            )
+        if self.kind == TENSOR:
+            data = self.buffer[: self.length]
+            return TensorColumn(
+                data if len(self.buffer) == self.length else data.clone()
+            )
+        return AbstractColumn.from_data(self.buffer if self.buffer else [])
+
+
+class DataPanelBuilder:
+    """Build a DataPanel from rows (mappings from column name to value) or from
+    batches (mappings from column name to a sequence of values) without going
+    through intermediate Python lists of the full data.
+
+    The kind of each column is inferred from the first values added to it and the
+    data is written into preallocated, typed buffers, chunk by chunk. The column
+    types are the same as those chosen by ``DataPanel(...)``: numeric values build
+    a ``NumpyArrayColumn``, tensors a ``TensorColumn``, strings a
+    ``PandasSeriesColumn`` and anything else a ``ListColumn`` (or ``CellColumn``).
+
+    Example:
+        >>> builder = DataPanelBuilder()
+        >>> for response in responses:
+        ...     builder.add_rows(response["predictions"])
+        >>> dp = builder.build()
+
+    Args:
+        capacity (int, optional): the expected number of rows, used to size the
+            buffers up front. Defaults to 0, buffers then grow as rows are added.
+        chunk_size (int, optional): the number of rows converted at a time by
+            ``add_rows``. Defaults to 65536.
+    """
+
+    def __init__(self, capacity: int = 0, chunk_size: int = 2**16):
+        self.capacity = capacity
+        self.chunk_size = chunk_size
+        self.length = 0
+        self._columns: Dict[str, _ColumnBuilder] = {}
+
+    def __len__(self):
+        return self.length
+
+    def _column(self, name: str) -> _ColumnBuilder:
+        if name not in self._columns:
+            column = _ColumnBuilder(capacity=max(self.capacity, self.length))
+            # rows added before the column first appeared are missing
+            column.extend(np.full(self.length, np.nan))
+            self._columns[name] = column
+        return self._columns[name]
+
+    def add_rows(self, rows: Sequence[Mapping]) -> DataPanelBuilder:
+        """Add a sequence of rows, each a mapping from column name to value.
+
+        Missing values are filled with ``NaN``.
+        """
+        if self.length == 0 and not self.capacity:
+            self.capacity = len(rows)
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start : start + self.chunk_size]
+            names = list(self._columns) + _new_keys(chunk, known=self._columns)
+            # an object array of shape (len(chunk), len(names)), missing values are
+            # NaN, the columns are converted to typed arrays in `extend`
+            data = lib.dicts_to_array(chunk, columns=names)
+            for idx, name in enumerate(names):
+                self._column(name).extend(data[:, idx])
+            self.length += len(chunk)
+        return self
+
+    def add_batch(self, batch: Mapping[str, object]) -> DataPanelBuilder:
+        """Add a batch, a mapping from column name to a sequence of values (a
+        list, numpy array, tensor, pandas Series or column).
+
+        Arrays and tensors are copied into the buffers directly.
+        """
+        lengths = {len(values) for values in batch.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns in a batch must have the same length.")
+        n = lengths.pop() if lengths else 0
+        for name in self._columns:
+            if name not in batch:
+                raise ValueError(f"Batch is missing column `{name}`.")
+        for name, values in batch.items():
+            self._column(name).extend(values)
+        self.length += n
+        return self
+
+    def build_columns(self) -> Dict[str, AbstractColumn]:
+        """Return the built columns, keyed by name."""
+        return {name: column.build() for name, column in self._columns.items()}
+
+    def build(self) -> DataPanel:
+        """Return a DataPanel holding the rows and batches added so far."""
+        from meerkat.datapanel import DataPanel
+
+        return DataPanel.from_batch(self.build_columns())
+
+
+def _new_keys(rows: Sequence[Mapping], known: Mapping) -> list:
+    """Return the keys of ``rows`` not in ``known``, in order of first
+    appearance."""
+    # the union runs in C, only chunks that introduce new keys are scanned in
+    # Python to recover the order in which the keys appear
+    new = set().union(*rows).difference(known)
+    keys = {}
+    for row in rows:
+        if len(keys) == len(new):
+            break
+        keys.update((key, None) for key in row if key in new)
+    return list(keys)
+
+
+def _unwrap(values: object) -> object:
+    if isinstance(values, (NumpyArrayColumn, TensorColumn)):
+        return values.data
+    if isinstance(values, PandasSeriesColumn):
+        values = values.data
+    if isinstance(values, pd.Series):
+        return values.to_numpy()
+    if isinstance(values, AbstractColumn):
+        return list(values)
+    return values
+
+
+def _infer_kind(values: object) -> str:
+    if torch.is_tensor(values):
+        return TENSOR
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return NUMPY if _is_numeric(values.dtype) else OBJECT
+    first = values[0]
+    if torch.is_tensor(first):
+        return TENSOR
+    if isinstance(first, (numbers.Number, np.generic, np.ndarray)) and not isinstance(
+        first, str
+    ):
+        return NUMPY
+    return OBJECT
+
+
+def _is_numeric(dtype: np.dtype) -> bool:
+    return dtype.kind in "biufc"
+
+
+def _as_numeric_array(values: object) -> Optional[np.ndarray]:
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        values = _convert_objects(values)
+    if not isinstance(values, np.ndarray):
+        if torch.is_tensor(values):
+            return None
+        try:
+            values = np.asarray(values)
+        except ValueError:
+            # ragged nested sequences
+            return None
+    if values.ndim == 0 or not _is_numeric(values.dtype):
+        return None
+    return values
+
+
+def _convert_objects(values: np.ndarray) -> object:
+    """Convert an object array of Python scalars to a typed array, inferring the
+    dtype in a single pass over the array in C."""
+    dtype = _INFERRED_DTYPES.get(lib.infer_dtype(values, skipna=False))
+    # numpy scalars keep their own dtype (e.g. float32), so they go through
+    # `np.asarray` like any other sequence
+    if dtype is not None and type(values[0]) in (bool, int, float):
+        try:
+            return values.astype(dtype)
+        except OverflowError:
+            pass
+    return list(values)
+
+
+def _as_tensor(values: object) -> Optional[torch.Tensor]:
+    if torch.is_tensor(values):
+        return values
+    if not all(torch.is_tensor(value) for value in values):
+        return None
+    try:
+        return torch.stack(list(values))
+    except RuntimeError:
+        # tensors of different shapes
+        return None
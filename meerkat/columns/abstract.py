@@ -4,15 +4,19 @@ import abc
 import logging
 import pathlib
 import reprlib
+import sys
 from copy import copy
 from typing import Any, Callable, List, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 import torch
 
 import meerkat.config
-from meerkat.mixins.blockable import BlockableMixin
+from meerkat.block.abstract import BlockView
+from meerkat.block.row_index import RowIndex
+from meerkat.mixins.blockable import BlockableMixin, LazyBlockData
 from meerkat.mixins.cloneable import CloneableMixin
 from meerkat.mixins.collate import CollateMixin
 from meerkat.mixins.inspect_fn import FunctionInspectorMixin
@@ -40,7 +44,7 @@ class AbstractColumn(
 ):
     """An abstract class for Meerkat columns."""
 
-    _data: Sequence = None
+    _data: Sequence = LazyBlockData()
 
     # Path to a log directory
     logdir: pathlib.Path = pathlib.Path.home() / "meerkat/"
@@ -80,28 +84,60 @@ class AbstractColumn(
         logger.info(f"Created `{self.__class__.__name__}` with {len(self)} rows.")
 
     def __repr__(self):
-        return f"{self.__class__.__name__}({reprlib.repr(self.data)})"
+        return f"{self.__class__.__name__}({reprlib.repr(self._data)})"
 
     def __str__(self):
-        return f"{self.__class__.__name__}({reprlib.repr(self.data)})"
+        return f"{self.__class__.__name__}({reprlib.repr(self._data)})"
 
     def streamlit(self):
         return self._repr_pandas_()
 
     def _set_data(self, data):
         if self.is_blockable():
+            if isinstance(data, BlockView) and data.block._lazy is not None:
+                self._set_lazy_block_view(data)
+                return
             data = self._unpack_block_view(data)
         self._data = data
 
     @property
     def data(self):
-        """Get the underlying data."""
+        """Get the underlying data.
+
+        If the column's block shares its data with a copy (see
+        :meth:`AbstractBlock._copy_on_write`), the data is read-only where its type
+        allows it (e.g. numpy arrays). Write to the column instead (e.g.
+        ``column[index] = value``), which copies the data first. Methods that only
+        read the data use ``_data``.
+        """
+        if self.is_blockable() and "_block" in self.__dict__:
+            # the data must keep sharing memory with the block
+            self._block._data_handed_out = True
+            if self._block._is_shared():
+                return self._read_only_data()
+            if not self._block._is_writeable():
+                return self._data
+        # the data may be written to in place, so its fingerprint is computed again
+        self._invalidate_fingerprint()
         return self._data
 
     @data.setter
     def data(self, value):
         self._set_data(value)
 
+    def _read_only_data(self):
+        """Return a read-only view of the data, or the data if its type has no
+        read-only views."""
+        return self._data
+
+    def _data_for_write(self):
+        """Return the data, about to be written to in place, after copying it if it
+        is shared with a copy (see :meth:`AbstractBlock._copy_on_write`)."""
+        if self.is_blockable() and "_block" in self.__dict__:
+            self._block._copy_on_write()
+        self._invalidate_fingerprint()
+        return self._data
+
     @property
     def metadata(self):
         return {}
@@ -172,6 +208,8 @@ class AbstractColumn(
             self._set_cell(int(index), value)
 
     def _set(self, index, value):
+        if self.is_blockable():
+            self._block._copy_on_write()
         index = self._translate_index(index)
         if isinstance(index, int):
             self._set_cell(index, value)
@@ -179,10 +217,39 @@ class AbstractColumn(
             self._set_batch(index, value)
         else:
             raise ValueError
+        self._invalidate_fingerprint(np.atleast_1d(index))
 
     def __setitem__(self, index, value):
         self._set(index, value)
 
+    def fingerprint(self) -> str:
+        """Return a fingerprint of the column's type and data, e.g. to check
+        whether two columns hold the same data without comparing them.
+
+        Columns with equal fingerprints hold equal data. The converse does not
+        always hold: the rows of a column (e.g. ``col[10:20]``) derive their
+        fingerprint from the fingerprint of the column and the row index, without
+        hashing the data again.
+
+        Fingerprints are computed once and stored (on the block, for columns backed
+        by a block). They are computed again after writes with ``__setitem__``,
+        in-place ufuncs and methods, and after the underlying ``data`` is handed out
+        where it can be written to.
+        """
+        from meerkat.tools.fingerprint import fingerprint
+
+        if self.is_blockable():
+            return fingerprint(type(self), self._block.fingerprint(self._block_index))
+        if getattr(self, "_fingerprint", None) is None:
+            self._fingerprint = fingerprint(type(self), self._data)
+        return self._fingerprint
+
+    def _invalidate_fingerprint(self, rows: np.ndarray = None):
+        if self.is_blockable():
+            self._block._invalidate_fingerprints(rows)
+        else:
+            self._fingerprint = None
+
     def _is_batch_index(self, index):
         # np.ndarray indexed with a tuple of length 1 does not return an np.ndarray
         # so we match this behavior
@@ -195,39 +262,25 @@ class AbstractColumn(
         if not self._is_batch_index(index):
             return index
 
-        if isinstance(index, pd.Series):
-            index = index.values
-
-        if torch.is_tensor(index):
-            index = index.numpy()
-
-        if isinstance(index, tuple) or isinstance(index, list):
-            index = np.array(index)
-
         # `index` should return a batch
-        if isinstance(index, slice):
-            # int or slice index => standard list slicing
-            # TODO (sabri): get rid of the np.arange here, very slow for large columns
-            indices = np.arange(self.full_length())[index]
-        elif isinstance(index, np.ndarray):
-            if len(index.shape) != 1:
-                raise TypeError(
-                    "`np.ndarray` index must have 1 axis, not {}".format(
-                        len(index.shape)
-                    )
-                )
-            if index.dtype == bool:
-                indices = np.where(index)[0]
-            else:
-                return index
-        elif isinstance(index, AbstractColumn):
-            # TODO (sabri): get rid of the np.arange here, very slow for large columns
-            indices = np.arange(self.full_length())[index]
-        else:
+        if not isinstance(
+            index,
+            (
+                RowIndex,
+                slice,
+                range,
+                tuple,
+                list,
+                np.ndarray,
+                pd.Series,
+                AbstractColumn,
+            ),
+        ) and not torch.is_tensor(index):
             raise TypeError(
                 "Object of type {} is not a valid index".format(type(index))
             )
-        return indices
+        # slices are expanded to only the selected positions, never to all rows
+        return RowIndex.from_index(index, nrows=self.full_length()).to_array()
 
     @staticmethod
     def _convert_to_batch_fn(
@@ -241,6 +294,11 @@ class AbstractColumn(
         )
 
     def __len__(self):
+        if "_data" not in self.__dict__ and "_block" in self.__dict__:
+            lazy = self._block._lazy
+            if lazy is not None:
+                # the data of the block has not been read yet
+                return lazy.nrows
         return self.full_length()
 
     def full_length(self):
@@ -476,12 +534,12 @@ class AbstractColumn(
                 **kwargs,
             )
         else:
+            # contiguous batches are slices, which most columns take as views
             batch_indices = []
-            indices = np.arange(len(self))
             for i in range(0, len(self), batch_size):
                 if drop_last_batch and i + batch_size > len(self):
                     continue
-                batch_indices.append(indices[i : i + batch_size])
+                batch_indices.append(slice(i, i + batch_size))
             return torch.utils.data.DataLoader(
                 self if materialize else self.lz,
                 sampler=batch_indices,
@@ -516,10 +574,24 @@ class AbstractColumn(
             return data  # .view()
 
         if isinstance(data, pd.Series):
+            from .categorical_column import CategoricalColumn
             from .pandas_column import PandasSeriesColumn
 
+            if isinstance(data.dtype, pd.CategoricalDtype):
+                return CategoricalColumn(data)
+            if data.dtype == object:
+                column = CategoricalColumn._try_encode(data)
+                if column is not None:
+                    return column
             return PandasSeriesColumn(data)
 
+        if sp.issparse(data) or (
+            torch.is_tensor(data) and data.layout != torch.strided
+        ):
+            from .sparse_column import SparseColumn
+
+            return SparseColumn(data)
+
         if torch.is_tensor(data):
             from .tensor_column import TensorColumn
 
@@ -536,16 +608,19 @@ class AbstractColumn(
 
                 return CellColumn(data)
 
+            if len(data) != 0 and isinstance(data[0], np.ndarray):
+                from .ragged_column import RaggedArrayColumn
+
+                if RaggedArrayColumn._is_ragged(data):
+                    return RaggedArrayColumn(data)
+
             if len(data) != 0 and isinstance(
                 data[0], (int, float, bool, np.ndarray, np.generic, NumpyArrayColumn)
             ):
-
                 return NumpyArrayColumn(data)
 
             if len(data) != 0 and isinstance(data[0], str):
-                from .pandas_column import PandasSeriesColumn
-
-                return PandasSeriesColumn(data)
+                return AbstractColumn.from_data(pd.Series(data))
 
             if len(data) != 0 and torch.is_tensor(data[0]):
                 from .tensor_column import TensorColumn
@@ -578,3 +653,21 @@ class AbstractColumn(
     @property
     def is_mmap(self):
         return False
+
+    def memory_usage(self, deep: bool = False) -> int:
+        """Return the number of bytes used by the column's data.
+
+        Args:
+            deep (bool): if True, also count the objects referenced by the data (e.g.
+                the items of a list or of an object array). Defaults to False.
+
+        Return:
+            int: the number of bytes. Data viewed by several columns (e.g. a block
+                shared by views of a DataPanel) is counted in full by each of them,
+                see :meth:`DataPanel.memory_report` for an account of sharing.
+        """
+        from meerkat.block.memory import deep_sizeof
+
+        if deep:
+            return deep_sizeof(self._data)
+        return sys.getsizeof(self._data)
@@ -4,11 +4,11 @@ import os
 from typing import Sequence, Set
 
 import pyarrow as pa
-import torch
 from pyarrow.compute import equal
 
 from meerkat.block.abstract import BlockView
 from meerkat.block.arrow_block import ArrowBlock
+from meerkat.block.convert import arrow_to_numpy, numpy_to_tensor
 from meerkat.columns.abstract import AbstractColumn
 from meerkat.errors import ImmutableError
 
@@ -16,7 +16,6 @@ from meerkat.errors import ImmutableError
 class ArrowArrayColumn(
     AbstractColumn,
 ):
-
     block_class: type = ArrowBlock
 
     def __init__(
@@ -46,7 +45,7 @@ class ArrowArrayColumn(
             data = self._data.take(index)
 
         if self._is_batch_index(index):
-            return self._clone(data=data)
+            return self._clone_rows(data, index)
         else:
             return data
 
@@ -65,6 +64,9 @@ class ArrowArrayColumn(
     def _state_keys(cls) -> Set:
         return super()._state_keys()
 
+    def memory_usage(self, deep: bool = False) -> int:
+        return self.data.nbytes
+
     def _write_data(self, path):
         table = pa.Table.from_arrays([self.data], names=["0"])
         ArrowBlock._write_table(os.path.join(path, "data.arrow"), table)
@@ -76,14 +78,43 @@ class ArrowArrayColumn(
 
     @classmethod
     def concat(cls, columns: Sequence[ArrowArrayColumn]):
-        data = pa.concat_arrays([c.data for c in columns])
+        arrays = [c.data for c in columns]
+        types = {array.type for array in arrays}
+        if len(types) > 1 and any(pa.types.is_null(type) for type in types):
+            # e.g. a field of a JSON lines file that is all null in the first chunks,
+            # see `meerkat.streaming.iter_jsonl`
+            type = next(type for type in types if not pa.types.is_null(type))
+            arrays = [
+                array.cast(type) if pa.types.is_null(array.type) else array
+                for array in arrays
+            ]
+        if any(isinstance(array, pa.ChunkedArray) for array in arrays):
+            # e.g. columns read from disk, the chunks are not copied
+            data = pa.chunked_array(
+                [
+                    chunk
+                    for array in arrays
+                    for chunk in (
+                        array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+                    )
+                ],
+                type=arrays[0].type,
+            )
+        else:
+            data = pa.concat_arrays(arrays)
         return columns[0]._clone(data=data)
 
     def to_numpy(self):
-        return self.data.to_numpy(zero_copy_only=False)
+        return arrow_to_numpy(self.data)
 
     def to_tensor(self):
-        return torch.tensor(self.data.to_numpy())
+        array = self.to_numpy()
+        if array.dtype == object:
+            raise ValueError(
+                f"Cannot convert `ArrowArrayColumn` with type={self.data.type} to "
+                "tensor."
+            )
+        return numpy_to_tensor(array)
 
     def to_pandas(self):
         return self.data.to_pandas()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from meerkat.block.abstract import BlockView
+from meerkat.block.dictionary_block import DictionaryBlock
+from meerkat.columns.abstract import AbstractColumn
+from meerkat.columns.pandas_column import PandasSeriesColumn
+from meerkat.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class CategoricalColumn(PandasSeriesColumn):
+    """A column of repeated values (e.g. labels, splits or class names) stored as
+    integer codes into a dictionary of the distinct values.
+
+    The data is a pandas ``Series`` of ``category`` dtype, so the column supports
+    the same operations as a ``PandasSeriesColumn``. Row gathers only move the
+    codes, and equality filters (e.g. ``mk.col("split") == "train"``), ``isin``
+    and ``groupby`` are computed on the codes. Writing a value that is not in the
+    dictionary adds it to the dictionary.
+
+    String columns with few distinct values can be stored in a
+    ``CategoricalColumn`` automatically, see
+    ``meerkat.config.engine.auto_categorical``.
+    """
+
+    block_class: type = DictionaryBlock
+
+    def _set_data(self, data: object):
+        if isinstance(data, BlockView):
+            if not isinstance(data.block, DictionaryBlock):
+                raise ValueError(
+                    "Cannot create `CategoricalColumn` from a `BlockView` not "
+                    "referencing a `DictionaryBlock`."
+                )
+        else:
+            if not isinstance(data, pd.Series):
+                data = pd.Series(data)
+            if not isinstance(data.dtype, pd.CategoricalDtype):
+                data = data.astype("category")
+            if not isinstance(data.index, pd.RangeIndex) or data.index.start != 0:
+                # unlike `reset_index(drop=True)`, `set_axis` does not copy the codes
+                data = data.set_axis(pd.RangeIndex(len(data)), copy=False)
+        # skip the `reset_index` of `PandasSeriesColumn`
+        super(PandasSeriesColumn, self)._set_data(data)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """The integer code of each row, -1 for missing values."""
+        return self.data.cat.codes.values
+
+    @property
+    def categories(self) -> pd.Index:
+        """The dictionary of distinct values."""
+        return self.data.cat.categories
+
+    def _add_categories(self, values: object):
+        values = pd.Series(np.asarray(values, dtype=object).ravel()).dropna()
+        missing = pd.Index(values.unique()).difference(self.categories)
+        if len(missing) > 0:
+            self._block._add_categories(self._block_index, missing)
+
+    def _set_cell(self, index, value):
+        self._add_categories([value])
+        super()._set_cell(index, value)
+
+    def _set_batch(self, indices, values):
+        self._add_categories(values)
+        super()._set_batch(indices, values)
+
+    def is_equal(self, other: AbstractColumn) -> bool:
+        if other.__class__ != self.__class__ or len(other) != len(self):
+            return False
+        # the dictionaries of equal columns may differ
+        return (self.data.astype(object) == other.data.astype(object)).all()
+
+    @classmethod
+    def _try_encode(cls, data: pd.Series) -> Optional[CategoricalColumn]:
+        """Return ``data``, a Series of Python objects (e.g. strings), as a
+        ``CategoricalColumn`` if it has few enough distinct values, see
+        ``meerkat.config.engine.auto_categorical``. Otherwise return None."""
+        engine = config.engine
+        if not engine.auto_categorical or len(data) < engine.categorical_min_rows:
+            return None
+        try:
+            # check a sample first, so that columns of mostly distinct values (e.g.
+            # sentences or ids) are not hashed in full
+            sample = data.iloc[: engine.categorical_min_rows]
+            if sample.nunique() > len(sample) // 2:
+                return None
+            data = data.astype("category")
+        except TypeError:
+            # unhashable values, e.g. lists
+            return None
+        if len(data.cat.categories) > engine.categorical_max_ratio * len(data):
+            return None
+        return cls(data)
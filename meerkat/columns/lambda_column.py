@@ -78,6 +78,15 @@ class LambdaColumn(AbstractColumn):
     def _set(self, index, value):
         raise ValueError("Cannot setitem on a `LambdaColumn`.")
 
+    def fingerprint(self) -> str:
+        from meerkat.tools.fingerprint import fingerprint
+
+        fn = self.fn
+        if getattr(fn, "__self__", None) is self:
+            # e.g. `ImageColumn` loads its cells with one of its methods
+            fn = fn.__func__
+        return fingerprint(type(self), fn, self._data)
+
     def fn(self, data: object):
         """Subclasses like `ImageColumn` should be able to implement their own
         version."""
@@ -137,6 +146,13 @@ class LambdaColumn(AbstractColumn):
 
         return columns[0]._clone(mk.concat([c._data for c in columns]))
 
+    def memory_usage(self, deep: bool = False) -> int:
+        # the cells are computed on access, only the data they are computed from is
+        # held in memory
+        if isinstance(self._data, DataPanel):
+            return int(self._data.memory_usage(deep=deep).sum())
+        return self._data.memory_usage(deep=deep)
+
     def _write_data(self, path):
         # TODO (Sabri): avoid redundant writes in dataframes
         return self.data.write(os.path.join(path, "data"))
@@ -15,12 +15,26 @@ import torch
 from yaml.representer import Representer
 
 from meerkat.block.abstract import BlockView
+from meerkat.block.convert import numpy_to_tensor
 from meerkat.block.numpy_block import NumpyBlock
 from meerkat.columns.abstract import AbstractColumn
 from meerkat.writers.concat_writer import ConcatWriter
 
 Representer.add_representer(abc.ABCMeta, Representer.represent_name)
 
+# the methods of numpy arrays that write to the array
+_INPLACE_METHODS = {
+    "byteswap",
+    "fill",
+    "itemset",
+    "partition",
+    "put",
+    "resize",
+    "setfield",
+    "setflags",
+    "sort",
+}
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,7 +54,6 @@ class NumpyArrayColumn(
     AbstractColumn,
     np.lib.mixins.NDArrayOperatorsMixin,
 ):
-
     block_class: type = NumpyBlock
 
     def __init__(
@@ -76,13 +89,20 @@ class NumpyArrayColumn(
             ):
                 return NotImplemented
 
-        # Defer to the implementation of the ufunc on unwrapped values.
-        inputs = tuple(x.data if isinstance(x, NumpyArrayColumn) else x for x in inputs)
+        for x in inputs:
+            if isinstance(x, NumpyArrayColumn):
+                x._record_column_scan()
 
+        # Defer to the implementation of the ufunc on unwrapped values, the outputs
+        # are written to (see `AbstractColumn._data_for_write`)
         if out:
             kwargs["out"] = tuple(
-                x.data if isinstance(x, NumpyArrayColumn) else x for x in out
+                x._data_for_write() if isinstance(x, NumpyArrayColumn) else x
+                for x in out
             )
+        inputs = tuple(
+            x._data if isinstance(x, NumpyArrayColumn) else x for x in inputs
+        )
         result = getattr(ufunc, method)(*inputs, **kwargs)
 
         if type(result) is tuple:
@@ -97,8 +117,14 @@ class NumpyArrayColumn(
 
     def __getattr__(self, name):
         try:
-            out = getattr(object.__getattribute__(self, "data"), name)
+            out = getattr(object.__getattribute__(self, "_data"), name)
             if isinstance(out, Callable):
+                # methods (e.g. reductions) read the full column, in-place methods
+                # write to it, see `AbstractColumn._data_for_write`
+                if name in _INPLACE_METHODS:
+                    out = getattr(self._data_for_write(), name)
+                elif self._record_column_scan():
+                    out = getattr(object.__getattribute__(self, "_data"), name)
                 return getattr_decorator(out)
             else:
                 return out
@@ -114,12 +140,17 @@ class NumpyArrayColumn(
     def _set_batch(self, indices, values):
         self._data[indices] = values
 
+    def _read_only_data(self) -> np.ndarray:
+        data = self._data.view()
+        data.flags.writeable = False
+        return data
+
     def _get(self, index, materialize: bool = True):
         index = NumpyBlock._convert_index(index)
         data = self._data[index]
         if self._is_batch_index(index):
             # only create a numpy array column
-            return self._clone(data=data)
+            return self._clone_rows(data, index)
         else:
             return data
 
@@ -133,7 +164,12 @@ class NumpyArrayColumn(
     def is_mmap(self):
         # important to check if .base is a python mmap object, since a view of a mmap
         # is also a memmap object, but should not be symlinked or copied
-        return isinstance(self.data, np.memmap) and isinstance(self.data.base, mmap)
+        return isinstance(self._data, np.memmap) and isinstance(self._data.base, mmap)
+
+    def memory_usage(self, deep: bool = False) -> int:
+        if deep and self._data.dtype == object:
+            return super().memory_usage(deep=True)
+        return self._data.nbytes
 
     def _write_data(self, path: str, link: bool = True) -> None:
         path = os.path.join(path, "data.npy")
@@ -141,11 +177,11 @@ class NumpyArrayColumn(
         # is also a memmap object, but should not be symlinked
         if self.is_mmap:
             if link:
-                os.symlink(self.data.filename, path)
+                os.symlink(self._data.filename, path)
             else:
-                shutil.copy(self.data.filename, path)
+                shutil.copy(self._data.filename, path)
         else:
-            np.save(path, self.data)
+            np.save(path, self._data)
 
     @staticmethod
     def _read_data(path: str, mmap=False, *args, **kwargs) -> np.ndarray:
@@ -163,7 +199,7 @@ class NumpyArrayColumn(
     def is_equal(self, other: AbstractColumn) -> bool:
         if other.__class__ != self.__class__:
             return False
-        return np.array_equal(self.data, other.data, equal_nan=True)
+        return np.array_equal(self._data, other._data, equal_nan=True)
 
     @classmethod
     def get_writer(cls, mmap: bool = False, template: AbstractColumn = None):
@@ -227,16 +263,17 @@ class NumpyArrayColumn(
 
         # returns indices of descending order of array
         if not ascending:
-            return np.argsort(-1 * self.data, axis=0, kind=kind, order=None)
+            return np.argsort(-1 * self._data, axis=0, kind=kind, order=None)
 
         # returns indices of ascending order of array
-        return np.argsort(self.data, axis=0, kind=kind, order=None)
+        return np.argsort(self._data, axis=0, kind=kind, order=None)
 
     def to_tensor(self) -> torch.Tensor:
         """Use `column.to_tensor()` instead of `torch.tensor(column)`, which is
         very slow."""
         # TODO (Sabri): understand why `torch.tensor(column)` is so slow
-        return torch.tensor(self.data)
+        self._record_column_scan()
+        return numpy_to_tensor(self.data)
 
     def to_pandas(self) -> pd.Series:
         if len(self.shape) == 1:
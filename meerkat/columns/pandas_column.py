@@ -30,6 +30,7 @@ from pandas.core.strings import StringMethods
 from yaml.representer import Representer
 
 from meerkat.block.abstract import BlockView
+from meerkat.block.convert import numpy_to_tensor
 from meerkat.block.pandas_block import PandasBlock
 from meerkat.columns.abstract import AbstractColumn
 
@@ -218,7 +219,7 @@ class PandasSeriesColumn(
         data = self._data.iloc[index]
         if self._is_batch_index(index):
             # only create a numpy array column
-            return self._clone(data=data)
+            return self._clone_rows(data, index)
         else:
             return data
 
@@ -233,9 +234,12 @@ class PandasSeriesColumn(
         data = pd.concat([c.data for c in columns])
         return columns[0]._clone(data=data)
 
+    def memory_usage(self, deep: bool = False) -> int:
+        return int(self._data.memory_usage(index=False, deep=deep))
+
     def _write_data(self, path: str) -> None:
         data_path = os.path.join(path, "data.pd")
-        self.data.to_pickle(data_path)
+        self._data.to_pickle(data_path)
 
     @staticmethod
     def _read_data(
@@ -290,22 +294,22 @@ class PandasSeriesColumn(
 
         # returns indices of descending order of array
         if not ascending:
-            return (-1 * self.data).argsort(kind=kind)
+            return (-1 * self._data).argsort(kind=kind)
 
         # returns indices of ascending order of array
-        return self.data.argsort(kind=kind)
+        return self._data.argsort(kind=kind)
 
     def to_tensor(self) -> torch.Tensor:
         """Use `column.to_tensor()` instead of `torch.tensor(column)`, which is
         very slow."""
-        dtype = self.data.values.dtype
+        dtype = self._data.values.dtype
         if not np.issubdtype(dtype, np.number):
             raise ValueError(
                 f"Cannot convert `PandasSeriesColumn` with dtype={dtype} to tensor."
             )
 
         # TODO (Sabri): understand why `torch.tensor(column)` is so slow
-        return torch.tensor(self.data.values)
+        return numpy_to_tensor(self.data.values)
 
     def to_numpy(self) -> torch.Tensor:
         return self.values
@@ -316,4 +320,4 @@ class PandasSeriesColumn(
     def is_equal(self, other: AbstractColumn) -> bool:
         if other.__class__ != self.__class__:
             return False
-        return (self.data.values == other.data.values).all()
+        return (self._data.values == other._data.values).all()
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import List, Sequence, Union
+
+import numpy as np
+import torch
+
+from meerkat.block.convert import numpy_to_tensor
+from meerkat.block.row_index import RowIndex
+from meerkat.columns.abstract import AbstractColumn
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RaggedArray:
+    """Rows of different lengths stored as a flat array of values, row ``i`` is
+    ``values[offsets[i]:offsets[i + 1]]``.
+
+    The offsets need not start at 0 nor end at ``len(values)``, so that a slice of
+    rows shares both arrays with the rows it was sliced from.
+    """
+
+    values: np.ndarray
+    offsets: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> RaggedArray:
+        rows = [np.asarray(row) for row in rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=offsets[1:])
+        if len(rows) == 0:
+            return cls(values=np.zeros(0), offsets=offsets)
+        return cls(values=np.concatenate(rows), offsets=offsets)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]):
+        if isinstance(index, (int, np.integer)):
+            index = range(len(self))[index]
+            return self.values[self.offsets[index] : self.offsets[index + 1]]
+        if isinstance(index, slice) and index.step in (None, 1):
+            start, stop, _ = index.indices(len(self))
+            return RaggedArray(self.values, self.offsets[start : max(start, stop) + 1])
+        return self.take(np.arange(len(self))[index])
+
+    def take(self, rows: np.ndarray) -> RaggedArray:
+        """Gather the rows ``rows`` (an array of row positions) into new arrays."""
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # the position in `values` of each value of the output
+        positions = np.arange(offsets[-1]) + np.repeat(starts - offsets[:-1], lengths)
+        return RaggedArray(values=self.values[positions], offsets=offsets)
+
+    def compact(self) -> RaggedArray:
+        """Return the rows with offsets starting at 0 and ending at
+        ``len(values)``, which is the array itself unless it is a slice."""
+        start, stop = self.offsets[0], self.offsets[-1]
+        if start == 0 and stop == len(self.values):
+            return self
+        return RaggedArray(self.values[start:stop], self.offsets - start)
+
+
+def ragged_collate(batch: List[np.ndarray], pad_value: float = 0) -> torch.Tensor:
+    """Pad the rows of a ``RaggedArrayColumn`` to the length of the longest row and
+    stack them into a tensor of shape ``(len(batch), max_length, ...)``."""
+    lengths = [len(row) for row in batch]
+    shape = (len(batch), max(lengths, default=0)) + np.shape(batch[0])[1:]
+    out = torch.full(shape, pad_value, dtype=numpy_to_tensor(batch[0][:0]).dtype)
+    for i, row in enumerate(batch):
+        out[i, : lengths[i]] = numpy_to_tensor(row)
+    return out
+
+
+class RaggedArrayColumn(AbstractColumn):
+    """A column of arrays of different lengths (e.g. token ids, bounding boxes or
+    audio frames), stored as a flat array of values and an ``int64`` array of
+    offsets into it.
+
+    A row of the column is a view of the values. Rows are gathered with a few
+    vectorized operations on the offsets and values, and slices of rows share the
+    arrays of the column. The two arrays are written as ``.npy`` files, which are
+    memory-mapped when read with ``mmap=True``.
+
+    Batches are padded into a single tensor, see :meth:`to_tensor`.
+    """
+
+    def __init__(
+        self,
+        data: Union[Sequence, RaggedArray] = None,
+        collate_fn=None,
+        *args,
+        **kwargs,
+    ):
+        if data is not None and not isinstance(data, RaggedArray):
+            data = RaggedArray.from_rows(data)
+        if collate_fn is None:
+            collate_fn = ragged_collate
+        super(RaggedArrayColumn, self).__init__(
+            data=data, collate_fn=collate_fn, *args, **kwargs
+        )
+
+    @classmethod
+    def from_arrays(
+        cls, values: np.ndarray, offsets: np.ndarray, *args, **kwargs
+    ) -> RaggedArrayColumn:
+        """Create a column from a flat array of ``values`` and the ``offsets`` of
+        the rows into it, with ``len(offsets) == nrows + 1``."""
+        offsets = np.asarray(offsets, dtype=np.int64)
+        return cls(RaggedArray(values=values, offsets=offsets), *args, **kwargs)
+
+    @property
+    def values(self) -> np.ndarray:
+        """The values of all rows, one after the other."""
+        return self.data.compact().values
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """The offsets of the rows into :attr:`values`."""
+        return self.data.compact().offsets
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """The length of each row."""
+        return self.data.lengths
+
+    def _get(self, index, materialize: bool = True):
+        if isinstance(index, RowIndex):
+            index = index.to_indexer()
+        elif torch.is_tensor(index):
+            index = index.numpy()
+        elif isinstance(index, (list, tuple)):
+            index = np.asarray(index)
+        elif isinstance(index, np.integer):
+            index = int(index)
+
+        if isinstance(index, np.ndarray) and index.dtype == bool:
+            index = np.flatnonzero(index)
+        data = self._data[index]
+        if self._is_batch_index(index):
+            return self._clone(data=data)
+        return data
+
+    def _set_cell(self, index, value):
+        row = self._data[index]
+        value = np.asarray(value)
+        if len(value) != len(row):
+            raise ValueError(
+                f"Cannot set row of length {len(row)} in `RaggedArrayColumn` to a "
+                f"value of length {len(value)}."
+            )
+        row[:] = value
+
+    def _repr_cell(self, index) -> object:
+        return f"np.ndarray(shape={self[index].shape})"
+
+    def is_equal(self, other: AbstractColumn) -> bool:
+        if other.__class__ != self.__class__ or len(other) != len(self):
+            return False
+        return np.array_equal(self.lengths, other.lengths) and np.array_equal(
+            self.values, other.values
+        )
+
+    def fingerprint(self) -> str:
+        from meerkat.tools.fingerprint import fingerprint
+
+        if getattr(self, "_fingerprint", None) is None:
+            data = self._data.compact()
+            self._fingerprint = fingerprint(type(self), (data.values, data.offsets))
+        return self._fingerprint
+
+    @classmethod
+    def concat(cls, columns: Sequence[RaggedArrayColumn]):
+        lengths = np.concatenate([c.lengths for c in columns])
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        values = np.concatenate([c.values for c in columns])
+        return columns[0]._clone(data=RaggedArray(values=values, offsets=offsets))
+
+    def memory_usage(self, deep: bool = False) -> int:
+        return self._data.values.nbytes + self._data.offsets.nbytes
+
+    def _copy_data(self) -> RaggedArray:
+        data = self.data.compact()
+        return RaggedArray(values=data.values.copy(), offsets=data.offsets.copy())
+
+    def _write_data(self, path: str) -> None:
+        data = self.data.compact()
+        np.save(os.path.join(path, "values.npy"), data.values)
+        np.save(os.path.join(path, "offsets.npy"), data.offsets)
+
+    @staticmethod
+    def _read_data(path: str, mmap: bool = False, *args, **kwargs) -> RaggedArray:
+        mmap_mode = "r" if mmap else None
+        return RaggedArray(
+            values=np.load(os.path.join(path, "values.npy"), mmap_mode=mmap_mode),
+            offsets=np.load(os.path.join(path, "offsets.npy"), mmap_mode=mmap_mode),
+        )
+
+    def to_tensor(self, pad_value: float = 0) -> torch.Tensor:
+        """Return the rows padded with ``pad_value`` to the length of the longest
+        row, as a tensor of shape ``(len(self), max_length, ...)``."""
+        data = self.data.compact()
+        lengths = data.lengths
+        values = numpy_to_tensor(data.values)
+        shape = (len(data), int(lengths.max(initial=0))) + tuple(values.shape[1:])
+        out = torch.full(shape, pad_value, dtype=values.dtype)
+        # the row and position within the row of each value
+        rows = np.repeat(np.arange(len(data)), lengths)
+        positions = np.arange(len(values)) - np.repeat(data.offsets[:-1], lengths)
+        out[torch.from_numpy(rows), torch.from_numpy(positions)] = values
+        return out
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the rows as an object array of arrays."""
+        out = np.empty(len(self), dtype=object)
+        for i in range(len(self)):
+            out[i] = self._data[i]
+        return out
+
+    @staticmethod
+    def _is_ragged(data: Sequence) -> bool:
+        """Whether ``data`` is a sequence of arrays of the same dtype and trailing
+        shape, but of different lengths."""
+        first = data[0]
+        if (
+            not isinstance(first, np.ndarray)
+            or first.ndim == 0
+            or first.dtype == object
+        ):
+            return False
+        shapes = set()
+        for row in data:
+            if (
+                not isinstance(row, np.ndarray)
+                or row.dtype != first.dtype
+                or row.shape[1:] != first.shape[1:]
+            ):
+                return False
+            shapes.add(row.shape)
+        return len(shapes) > 1
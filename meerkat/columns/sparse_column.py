@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+from typing import List, Sequence
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+
+from meerkat.block.abstract import BlockView
+from meerkat.block.convert import sparse_to_tensor, tensor_to_sparse
+from meerkat.block.sparse_block import SparseBlock
+from meerkat.columns.abstract import AbstractColumn
+from meerkat.errors import ImmutableError
+
+logger = logging.getLogger(__name__)
+
+
+def sparse_collate(batch: List[sp.spmatrix]) -> torch.Tensor:
+    """Stack the rows of a ``SparseColumn`` into a sparse CSR tensor."""
+    return sparse_to_tensor(sp.vstack(batch, format="csr"))
+
+
+class SparseColumn(AbstractColumn):
+    """A column of high-dimensional sparse vectors (e.g. bag-of-words features,
+    multi-hot labels or sparse activations), stored as a CSR matrix with one row
+    per row of the column.
+
+    Only the non-zero values of each row are stored. A row of the column is a
+    ``scipy.sparse.csr_matrix`` of shape ``(1, nfeatures)``, and batches are
+    collated into sparse CSR tensors (see :meth:`to_tensor`).
+
+    Like ``ArrowArrayColumn``, the column is immutable: writing to a CSR matrix
+    changes the positions of the values of every row after the one written to.
+    """
+
+    block_class: type = SparseBlock
+
+    def __init__(
+        self,
+        data: Sequence = None,
+        collate_fn=None,
+        *args,
+        **kwargs,
+    ):
+        if isinstance(data, BlockView):
+            if not isinstance(data.block, SparseBlock):
+                raise ValueError(
+                    "Cannot create `SparseColumn` from a `BlockView` not "
+                    "referencing a `SparseBlock`."
+                )
+        elif torch.is_tensor(data):
+            data = tensor_to_sparse(data)
+        elif sp.issparse(data):
+            data = data.tocsr()
+        else:
+            data = sp.csr_matrix(np.asarray(data))
+        if collate_fn is None:
+            collate_fn = sparse_collate
+        super(SparseColumn, self).__init__(
+            data=data, collate_fn=collate_fn, *args, **kwargs
+        )
+
+    def full_length(self):
+        if self._data is None:
+            return 0
+        return self._data.shape[0]
+
+    @property
+    def shape(self):
+        return self._data.shape
+
+    @property
+    def nnz(self) -> int:
+        """The number of values stored."""
+        return self._data.nnz
+
+    def _get(self, index, materialize: bool = True):
+        index = SparseBlock._convert_index(index)
+        if not self._is_batch_index(index):
+            return self._data[index]
+        return self._clone_rows(SparseBlock._take_rows(self._data, index), index)
+
+    def _set(self, index, value):
+        raise ImmutableError("SparseColumn is immutable.")
+
+    def _repr_cell(self, index) -> object:
+        row = self._data[index]
+        return f"scipy.sparse.csr_matrix(shape={row.shape[1:]}, nnz={row.nnz})"
+
+    def is_equal(self, other: AbstractColumn) -> bool:
+        if other.__class__ != self.__class__ or other.shape != self.shape:
+            return False
+        return (self._data != other._data).nnz == 0
+
+    @classmethod
+    def concat(cls, columns: Sequence[SparseColumn]):
+        data = sp.vstack([c.data for c in columns], format="csr")
+        return columns[0]._clone(data=data)
+
+    def memory_usage(self, deep: bool = False) -> int:
+        return (
+            self._data.data.nbytes
+            + self._data.indices.nbytes
+            + self._data.indptr.nbytes
+        )
+
+    def _copy_data(self) -> sp.csr_matrix:
+        return self._data.copy()
+
+    def _write_data(self, path: str) -> None:
+        SparseBlock._write_csr(path, self._data)
+
+    @staticmethod
+    def _read_data(path: str, mmap: bool = False, *args, **kwargs) -> sp.csr_matrix:
+        return SparseBlock._read_csr(path, mmap=mmap)
+
+    def to_tensor(self) -> torch.Tensor:
+        """Return the column as a sparse CSR tensor of shape ``(len(self),
+        nfeatures)``, which shares memory with the column whenever possible."""
+        return sparse_to_tensor(self.data)
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the column as a dense array."""
+        return self.data.toarray()
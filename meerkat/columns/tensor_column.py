@@ -12,6 +12,7 @@ import torch
 from yaml.representer import Representer
 
 from meerkat.block.abstract import BlockView
+from meerkat.block.convert import tensor_to_numpy
 from meerkat.block.tensor_block import TensorBlock
 from meerkat.columns.abstract import AbstractColumn
 from meerkat.mixins.cloneable import CloneableMixin
@@ -74,6 +75,7 @@ class TensorColumn(
     def __torch_function__(self, func, types, args=(), kwargs=None):
         def _process_arg(arg):
             if isinstance(arg, type(self)):
+                arg._record_column_scan()
                 return arg.data
             elif isinstance(arg, (List, Tuple)):
                 # Specifically use list and tuple because these are
@@ -109,8 +111,14 @@ class TensorColumn(
 
     def __getattr__(self, name):
         try:
-            out = getattr(object.__getattribute__(self, "data"), name)
+            out = getattr(object.__getattribute__(self, "_data"), name)
             if isinstance(out, Callable):
+                # methods (e.g. reductions) read the full column, in-place methods
+                # (e.g. `fill_`) write to it, see `AbstractColumn._data_for_write`
+                if name.endswith("_"):
+                    out = getattr(self._data_for_write(), name)
+                elif self._record_column_scan():
+                    out = getattr(object.__getattribute__(self, "_data"), name)
                 return getattr_decorator(out)
             else:
                 return out
@@ -125,7 +133,7 @@ class TensorColumn(
         data = self._data[index]
         if self._is_batch_index(index):
             # only create a numpy array column
-            return self._clone(data=data)
+            return self._clone_rows(data, index)
         else:
             return data
 
@@ -168,9 +176,12 @@ class TensorColumn(
     def _view_data(self) -> object:
         return self._data
 
+    def memory_usage(self, deep: bool = False) -> int:
+        return self._data.element_size() * self._data.nelement()
+
     def _write_data(self, path: str) -> None:
         # Saving all cell data in a single pickle file
-        torch.save(self.data, os.path.join(path, "data.pt"))
+        torch.save(self._data, os.path.join(path, "data.pt"))
 
     @staticmethod
     def _read_data(path: str) -> torch.Tensor:
@@ -217,15 +228,15 @@ class TensorColumn(
         except IndexError:  # Case 1: The array only has one column
             # returns indices of descending order of array
             if not ascending:
-                return torch.argsort(self.data, dim=-1, descending=True)
+                return torch.argsort(self._data, dim=-1, descending=True)
             # returns indices of ascending order of array
-            return torch.argsort(self.data, dim=-1, descending=False)
+            return torch.argsort(self._data, dim=-1, descending=False)
 
         else:  # Case 2: The array has more than one column, raise error.
             raise Exception("No implementation for array with more than one column.")
 
     def is_equal(self, other: AbstractColumn) -> bool:
-        return (other.__class__ == self.__class__) and (self.data == other.data).all()
+        return (other.__class__ == self.__class__) and (self._data == other._data).all()
 
     def to_tensor(self) -> torch.Tensor:
         return self.data
@@ -238,4 +249,5 @@ class TensorColumn(
             return super().to_pandas()
 
     def to_numpy(self) -> pd.Series:
-        return self.data.detach().cpu().numpy()
+        self._record_column_scan()
+        return tensor_to_numpy(self.data)
@@ -11,9 +11,10 @@ CONFIG_ENV_VARIABLE = "MEERKAT_CONFIG"
 
 @dataclass
 class MeerkatConfig:
-
     display: DisplayConfig
     datasets: DatasetsConfig
+    cache: CacheConfig
+    engine: EngineConfig
 
     @classmethod
     def from_yaml(cls, path: str = None):
@@ -30,6 +31,8 @@ class MeerkatConfig:
         return cls(
             display=DisplayConfig(**config.get("display", {})),
             datasets=DatasetsConfig(**config.get("datasets", {})),
+            cache=CacheConfig(**config.get("cache", {})),
+            engine=EngineConfig(**config.get("engine", {})),
         )
 
 
@@ -49,4 +52,55 @@ class DatasetsConfig:
     root_dir: str = os.path.join(Path.home(), ".meerkat/datasets")
 
 
+@dataclass
+class CacheConfig:
+    root_dir: str = os.path.join(Path.home(), ".meerkat/cache")
+
+    # the least recently used entries are evicted once the cache is larger
+    max_size: int = 2**34
+
+
+@dataclass
+class EngineConfig:
+    # merge blocks of the same type once row gathers spread over the blocks have
+    # cost more than merging them would, see `BlockManager._auto_consolidate`. Off
+    # by default, as the data of the merged blocks is copied: arrays previously
+    # taken from their columns (e.g. with `.data`) no longer share memory with them
+    auto_consolidate: bool = False
+
+    # the estimated cost of a row gather on one block, and of each row gathered,
+    # in bytes copied
+    gather_overhead: int = 2**17
+    gather_row_cost: int = 64
+
+    # the most data copied by one automatic consolidation, this bounds the memory
+    # used on top of the blocks being merged
+    max_consolidation_bytes: int = 2**30
+
+    # the number of threads `BlockManager.apply` dispatches blocks and columns to,
+    # with 1 they are applied one after the other in the calling thread
+    num_threads: int = 1
+    # row selections smaller than this are applied in the calling thread, where
+    # dispatching to threads costs more than it saves
+    parallel_min_rows: int = 2**12
+
+    # store numpy and tensor blocks column-major once full-column reads have wasted
+    # more memory traffic than re-laying out the block costs, and row-major again
+    # once row gathers have, see `AbstractBlock._record_access`. Off by default, as
+    # the data of the block is copied: arrays previously taken from its columns
+    # (e.g. with `.data`) would no longer share memory with them
+    auto_layout: bool = False
+    # the largest block whose layout is changed, the data is copied so this bounds
+    # the memory used on top of the block
+    max_layout_bytes: int = 2**28
+
+    # store columns of Python objects (e.g. strings) with at most
+    # `categorical_max_ratio` distinct values per row as a `CategoricalColumn` when
+    # they are created, columns shorter than `categorical_min_rows` are left as is.
+    # Off by default, as it changes the type (and `groupby` output) of the columns
+    auto_categorical: bool = False
+    categorical_min_rows: int = 2**12
+    categorical_max_ratio: float = 0.05
+
+
 config = MeerkatConfig.from_yaml()
@@ -5,6 +5,7 @@ import logging
 import os
 import pathlib
 from typing import (
+    TYPE_CHECKING,
     Callable,
     Dict,
     Iterable,
@@ -24,20 +25,26 @@ import pandas as pd
 import pyarrow as pa
 import torch
 import yaml
-from pandas._libs import lib
 
 import meerkat
 from meerkat.block.manager import BlockManager
+from meerkat.block.memory import MemoryReport
+from meerkat.block.row_index import ArrayIndex, RowIndex
+from meerkat.builder import DataPanelBuilder
 from meerkat.columns.abstract import AbstractColumn
-from meerkat.columns.cell_column import CellColumn
+from meerkat.expr import Expr
 from meerkat.mixins.cloneable import CloneableMixin
 from meerkat.mixins.inspect_fn import FunctionInspectorMixin
 from meerkat.mixins.lambdable import LambdaMixin
 from meerkat.mixins.mapping import MappableMixin
 from meerkat.mixins.materialize import MaterializationMixin
 from meerkat.provenance import ProvenanceMixin, capture_provenance
+from meerkat.tools.prefetch import PrefetchIterator
 from meerkat.tools.utils import MeerkatLoader, convert_to_batch_fn
 
+if TYPE_CHECKING:
+    from meerkat.lazy import LazyDataPanel
+
 logger = logging.getLogger(__name__)
 
 Example = Dict
@@ -108,6 +115,40 @@ class DataPanel(
     def __contains__(self, item):
         return item in self.columns
 
+    def fingerprint(self) -> str:
+        """Return a fingerprint of the columns of the DataPanel, independent of
+        their order.
+
+        See :meth:`AbstractColumn.fingerprint`.
+        """
+        from meerkat.tools.fingerprint import fingerprint
+
+        return fingerprint(
+            "DataPanel",
+            len(self),
+            {name: self[name].fingerprint() for name in self.columns},
+        )
+
+    def memory_usage(self, deep: bool = False) -> pd.Series:
+        """Return the number of bytes used by each column.
+
+        Args:
+            deep (bool): if True, also count the objects referenced by the data of
+                the columns (e.g. the items of a ``ListColumn``). Defaults to False.
+
+        Return:
+            pd.Series: the bytes used by each column, indexed by column name.
+        """
+        return pd.Series(
+            {name: self[name].memory_usage(deep=deep) for name in self.columns},
+            dtype=np.int64,
+        )
+
+    def memory_report(self, deep: bool = False) -> MemoryReport:
+        """Return the number of bytes used by each column and block of the
+        DataPanel, see :meth:`BlockManager.memory_report`."""
+        return self.data.memory_report(deep=deep)
+
     @property
     def data(self) -> BlockManager:
         """Get the underlying data (excluding invisible rows).
@@ -127,12 +168,10 @@ class DataPanel(
                     "Cannot set DataPanel `data` to a Sequence containing object of "
                     f" type {type(value[0])}. Must be a Sequence of Mapping."
                 )
-            gen = (list(x.keys()) for x in value)
-            columns = lib.fast_unique_multiple_list_gen(gen)
-            data = lib.dicts_to_array(value, columns=columns)
-            # Assert all columns are the same length
-            data = {column: list(data[:, idx]) for idx, column in enumerate(columns)}
-            self._data = BlockManager.from_dict(data)
+            # fills typed buffers column by column, rather than going through an
+            # object array and per-column lists
+            builder = DataPanelBuilder(capacity=len(value)).add_rows(value)
+            self._data = BlockManager.from_dict(builder.build_columns())
         elif value is None:
             self._data = BlockManager()
         else:
@@ -245,7 +284,7 @@ class DataPanel(
 
         # cases where `index` returns a datapanel
         index_type = None
-        if isinstance(index, slice):
+        if isinstance(index, (slice, range, RowIndex)):
             # slice index => multiple row selection (DataPanel)
             index_type = "row"
 
@@ -290,6 +329,8 @@ class DataPanel(
             dp = self._clone(data=self.data[index])
             return dp
         elif index_type == "row":  # pragma: no cover
+            # convert the index once, every block and column accepts a RowIndex
+            index = RowIndex.from_index(index, nrows=len(self))
             return self._clone(
                 data=self.data.apply("_get", index=index, materialize=materialize)
             )
@@ -304,6 +345,22 @@ class DataPanel(
     def consolidate(self):
         self.data.consolidate()
 
+    def lazy(self) -> LazyDataPanel:
+        """Start a deferred query over the DataPanel.
+
+        Row selections, column projections, ``filter``, ``sort``, ``sample`` and
+        ``merge`` called on the returned :class:`~meerkat.lazy.LazyDataPanel` are
+        recorded in a plan instead of being run. The plan is only executed when
+        it is consumed with ``collect()``, ``batch()``, ``write()`` or
+        ``to_pandas()``, at which point consecutive row selections are fused into
+        a single index and only the columns that are needed are gathered.
+
+        >>> dp.lazy().lz[dp["label"] == 1].sort("conf").head(100).collect()
+        """
+        from meerkat.lazy import LazyDataPanel
+
+        return LazyDataPanel(self)
+
     @classmethod
     def from_huggingface(cls, *args, **kwargs):
         """Load a Huggingface dataset as a DataPanel.
@@ -336,10 +393,33 @@ class DataPanel(
     def from_jsonl(
         cls,
         json_path: str,
+        backend: str = "pandas",
+        **kwargs,
     ) -> DataPanel:
         """Load a dataset from a .jsonl file on disk, where each line of the
-        json file consists of a single example."""
-        return cls.from_pandas(pd.read_json(json_path, orient="records", lines=True))
+        json file consists of a single example.
+
+        Args:
+            json_path (str): the path of the jsonl file.
+            backend (str): "pandas" to parse the file with :func:`pandas.read_json`,
+                or "arrow" to parse it in parallel with ``pyarrow.json`` into a
+                single ``ArrowBlock``, without creating Python objects for the
+                values. Defaults to "pandas".
+            **kwargs: Keyword arguments for :func:`meerkat.streaming.read_jsonl`
+                (e.g. ``block_size``) if ``backend`` is "arrow".
+
+        Returns:
+            DataPanel: The constructed datapanel.
+        """
+        if backend == "arrow":
+            from meerkat.streaming import read_jsonl
+
+            return cls.from_arrow(read_jsonl(json_path, **kwargs))
+        elif backend != "pandas":
+            raise ValueError(f"Unknown backend `{backend}`.")
+        return cls.from_pandas(
+            pd.read_json(json_path, orient="records", lines=True, **kwargs)
+        )
 
     @classmethod
     @capture_provenance()
@@ -356,14 +436,16 @@ class DataPanel(
         cls,
         batches: Sequence[Batch],
     ) -> DataPanel:
-        """Convert a list of batches to a dataset."""
+        """Convert a list of batches to a dataset.
 
-        return cls.from_batch(
-            tz.merge_with(
-                tz.compose(list, tz.concat),
-                *batches,
-            ),
-        )
+        Each batch maps column names to a sequence of values (e.g. a list, numpy
+        array, tensor or column). Arrays and tensors are copied straight into
+        preallocated buffers, see :class:`~meerkat.builder.DataPanelBuilder`.
+        """
+        builder = DataPanelBuilder()
+        for batch in batches:
+            builder.add_batch(batch)
+        return cls.from_batch(builder.build_columns())
 
     @classmethod
     @capture_provenance()
@@ -409,18 +491,30 @@ class DataPanel(
 
     @classmethod
     @capture_provenance(capture_args=["filepath"])
-    def from_csv(cls, filepath: str, *args, **kwargs):
+    def from_csv(cls, filepath: str, *args, backend: str = "pandas", **kwargs):
         """Create a Dataset from a csv file.
 
         Args:
             filepath (str): The file path or buffer to load from.
                 Same as :func:`pandas.read_csv`.
             *args: Argument list for :func:`pandas.read_csv`.
-            **kwargs: Keyword arguments for :func:`pandas.read_csv`.
+            backend (str): "pandas" to parse the file with :func:`pandas.read_csv`,
+                or "arrow" to parse it in parallel with ``pyarrow.csv`` into a
+                single ``ArrowBlock``, without creating Python objects for the
+                values. Defaults to "pandas".
+            **kwargs: Keyword arguments for :func:`pandas.read_csv`, or for
+                :func:`meerkat.streaming.read_csv` (e.g. ``columns``,
+                ``delimiter``) if ``backend`` is "arrow".
 
         Returns:
             DataPanel: The constructed datapanel.
         """
+        if backend == "arrow":
+            from meerkat.streaming import read_csv
+
+            return cls.from_arrow(read_csv(filepath, *args, **kwargs))
+        elif backend != "pandas":
+            raise ValueError(f"Unknown backend `{backend}`.")
         return cls.from_pandas(pd.read_csv(filepath, *args, **kwargs))
 
     @classmethod
@@ -434,6 +528,64 @@ class DataPanel(
             pd.read_feather(path).to_dict("list"),
         )
 
+    @classmethod
+    @capture_provenance(capture_args=["path"])
+    def from_parquet(
+        cls,
+        path: str,
+        columns: Sequence[str] = None,
+        filter: Expr = None,
+        memory_map: bool = True,
+    ) -> DataPanel:
+        """Create a DataPanel from a Parquet file.
+
+        The columns are ``ArrowArrayColumn`` backed by a single ``ArrowBlock``,
+        whose table holds one chunk per row group read, without converting the
+        data to pandas.
+
+        Args:
+            path (str): the path of the Parquet file.
+            columns (Sequence[str], optional): the columns to read, all columns if
+                None. Defaults to None.
+            filter (Expr, optional): a predicate built with :func:`meerkat.col`,
+                only the rows for which it is true are kept. The row groups whose
+                statistics show that it is false for all their rows are not read.
+                Defaults to None.
+            memory_map (bool): whether to memory-map the file. Defaults to True.
+
+        Returns:
+            DataPanel: The constructed datapanel.
+        """
+        from meerkat.parquet import read_parquet
+
+        table = read_parquet(
+            path, columns=columns, filter=filter, memory_map=memory_map
+        )
+        dp = cls.from_arrow(table)
+        if filter is not None and len(dp) > 0:
+            dp = dp.filter(filter)
+        if columns is not None:
+            dp = dp[[name for name in table.column_names if name in columns]]
+        return dp
+
+    def to_parquet(self, path: str, row_group_size: int = 2**20, **kwargs) -> None:
+        """Save a DataPanel to a Parquet file.
+
+        Rows are converted to arrow and written one row group at a time, so that
+        the memory used is bounded by the size of a row group. Multi-dimensional
+        arrays and tensors are written as (nested) fixed size lists, categorical
+        columns as dictionaries.
+
+        Args:
+            path (str): the path of the Parquet file.
+            row_group_size (int): the number of rows of each row group.
+            **kwargs: Keyword arguments for ``pyarrow.parquet.ParquetWriter``,
+                e.g. ``compression``.
+        """
+        from meerkat.parquet import write_parquet
+
+        write_parquet(self, path, row_group_size=row_group_size, **kwargs)
+
     @capture_provenance()
     def to_pandas(self) -> pd.DataFrame:
         """Convert a Dataset to a pandas DataFrame."""
@@ -444,9 +596,12 @@ class DataPanel(
             }
         )
 
-    def to_jsonl(self, path: str) -> None:
-        """Save a Dataset to a jsonl file."""
-        self.to_pandas().to_json(path, lines=True, orient="records")
+    def to_jsonl(self, path: str, chunk_size: int = 2**16) -> None:
+        """Save a Dataset to a jsonl file, converting ``chunk_size`` rows to pandas
+        at a time."""
+        from meerkat.streaming import write_jsonl
+
+        write_jsonl(self, path, chunk_size=chunk_size)
 
     def _get_collate_fns(self, columns: Iterable[str] = None):
         columns = self.data.keys() if columns is None else columns
@@ -479,6 +634,8 @@ class DataPanel(
         num_workers: int = 0,
         materialize: bool = True,
         shuffle: bool = False,
+        indices: Union[Sequence[int], RowIndex] = None,
+        prefetch: int = 0,
         *args,
         **kwargs,
     ):
@@ -488,32 +645,43 @@ class DataPanel(
         Args:
             batch_size: integer batch size
             drop_last_batch: drop the last batch if its smaller than batch_size
+            indices: the rows to batch over, in order. Defaults to all rows.
+            prefetch: with ``num_workers=0``, the number of batches loaded ahead
+                on a background thread while the current batch is consumed.
+                Defaults to 0, batches are loaded on demand in the calling thread.
+                Only prefetch if the columns can be read from another thread while
+                the caller runs, e.g. if the functions of lambda columns are
+                thread-safe.
 
         Returns:
             batches of data
-        """
-        cell_columns, batch_columns = [], []
-        from meerkat.columns.lambda_column import LambdaColumn
-
-        for name, column in self.items():
-            if isinstance(column, (CellColumn, LambdaColumn)) and materialize:
-                cell_columns.append(name)
-            else:
-                batch_columns.append(name)
-
-        indices = np.arange(len(self))
 
+        Unless ``shuffle`` is set, batches over contiguous rows (e.g. all rows) are
+        slices of the underlying blocks, so they are views and no data is copied.
+        """
+        indices = RowIndex.from_index(
+            slice(None) if indices is None else indices, nrows=len(self)
+        )
         if shuffle:
-            indices = np.random.permutation(indices)
-
-        if batch_columns:
-            batch_indices = []
-            for i in range(0, len(self), batch_size):
-                if drop_last_batch and i + batch_size > len(self):
-                    continue
-                batch_indices.append(indices[i : i + batch_size])
-            batch_dl = torch.utils.data.DataLoader(
-                self[batch_columns] if materialize else self[batch_columns].lz,
+            indices = ArrayIndex(
+                np.random.permutation(indices.to_array()), nrows=len(self)
+            )
+
+        # a single sampler over all columns: composing a slice with a slice gives a
+        # slice, so contiguous batches are taken as views rather than gathered
+        batch_indices = []
+        for i in range(0, len(indices), batch_size):
+            if drop_last_batch and i + batch_size > len(indices):
+                continue
+            batch_indices.append(indices.compose(slice(i, i + batch_size)))
+
+        # with materialize, cell and lambda columns are loaded and collated along
+        # with the rest of the batch
+        dp = self if materialize else self.lz
+        if num_workers > 0 or args or kwargs:
+            # worker processes load batches ahead on their own
+            batches = torch.utils.data.DataLoader(
+                dp,
                 sampler=batch_indices,
                 batch_size=None,
                 batch_sampler=None,
@@ -522,28 +690,12 @@ class DataPanel(
                 *args,
                 **kwargs,
             )
-
-        if cell_columns:
-            dp = self[cell_columns] if not shuffle else self[cell_columns].lz[indices]
-            cell_dl = torch.utils.data.DataLoader(
-                dp if materialize else dp.lz,
-                batch_size=batch_size,
-                collate_fn=self._collate,
-                drop_last=drop_last_batch,
-                num_workers=num_workers,
-                *args,
-                **kwargs,
+        else:
+            batches = PrefetchIterator(
+                (dp[index] for index in batch_indices), size=prefetch
             )
 
-        if batch_columns and cell_columns:
-            for cell_batch, batch_batch in zip(cell_dl, batch_dl):
-                yield self._clone(data={**cell_batch.data, **batch_batch.data})
-        elif batch_columns:
-            for batch_batch in batch_dl:
-                yield batch_batch
-        elif cell_columns:
-            for cell_batch in cell_dl:
-                yield cell_batch
+        yield from batches
 
     @capture_provenance(capture_args=["with_indices"])
     def update(
@@ -560,6 +712,10 @@ class DataPanel(
         mmap_path: str = None,
         materialize: bool = True,
         pbar: bool = False,
+        executor: str = None,
+        num_procs: int = None,
+        cache: bool = False,
+        checkpoint_dir: str = None,
         **kwargs,
     ) -> DataPanel:
         """Update the columns of the dataset."""
@@ -606,6 +762,10 @@ class DataPanel(
             mmap_path=mmap_path,
             materialize=materialize,
             pbar=pbar,
+            executor=executor,
+            num_procs=num_procs,
+            cache=cache,
+            checkpoint_dir=checkpoint_dir,
             **kwargs,
         )
 
@@ -636,6 +796,10 @@ class DataPanel(
         mmap_path: str = None,
         materialize: bool = True,
         pbar: bool = False,
+        executor: str = None,
+        num_procs: int = None,
+        cache: bool = False,
+        checkpoint_dir: str = None,
         **kwargs,
     ) -> Optional[Union[Dict, List, AbstractColumn]]:
         input_columns = self.columns if input_columns is None else input_columns
@@ -652,13 +816,17 @@ class DataPanel(
             mmap_path=mmap_path,
             materialize=materialize,
             pbar=pbar,
+            executor=executor,
+            num_procs=num_procs,
+            cache=cache,
+            checkpoint_dir=checkpoint_dir,
             **kwargs,
         )
 
     @capture_provenance(capture_args=["function"])
     def filter(
         self,
-        function: Optional[Callable] = None,
+        function: Optional[Union[Callable, Expr]] = None,
         with_indices=False,
         input_columns: Optional[Union[str, List[str]]] = None,
         is_batched_fn: bool = False,
@@ -669,13 +837,54 @@ class DataPanel(
         pbar: bool = False,
         **kwargs,
     ) -> Optional[DataPanel]:
-        """Filter operation on the DataPanel."""
+        """Filter operation on the DataPanel.
+
+        ``function`` is either a function returning a boolean for each example
+        (or batch of examples), which is run with :meth:`map`, or an expression
+        built with :func:`meerkat.col`, e.g. ``(mk.col("label") == 3) &
+        (mk.col("conf") > 0.9)``. Expressions are evaluated with vectorized kernels
+        directly on the column data, without running any Python per row.
+        """
 
         # Return if `self` has no examples
         if not len(self):
             logger.info("DataPanel empty, returning None.")
             return None
 
+        indices = self._filter_indices(
+            function=function,
+            with_indices=with_indices,
+            input_columns=input_columns,
+            is_batched_fn=is_batched_fn,
+            batch_size=batch_size,
+            drop_last_batch=drop_last_batch,
+            num_workers=num_workers,
+            materialize=materialize,
+            pbar=pbar,
+            **kwargs,
+        )
+
+        # filter returns a new datapanel
+        return self.lz[indices]
+
+    def _filter_indices(
+        self,
+        function: Optional[Union[Callable, Expr]] = None,
+        with_indices=False,
+        input_columns: Optional[Union[str, List[str]]] = None,
+        is_batched_fn: bool = False,
+        batch_size: Optional[int] = 1,
+        drop_last_batch: bool = False,
+        num_workers: int = 0,
+        materialize: bool = True,
+        pbar: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        """Compute the rows kept by :meth:`filter`, as positions or (for
+        expressions) a boolean mask."""
+        if isinstance(function, Expr):
+            return function.evaluate(self)
+
         # Get some information about the function
         dp = self[input_columns] if input_columns is not None else self
         function_properties = dp._inspect_function(
@@ -701,10 +910,7 @@ class DataPanel(
             pbar=pbar,
             **kwargs,
         )
-        indices = np.where(outputs)[0]
-
-        # filter returns a new datapanel
-        return self.lz[indices]
+        return np.where(outputs)[0]
 
     def merge(
         self,
@@ -811,9 +1017,26 @@ class DataPanel(
         cls,
         path: str,
         *args,
+        columns: Sequence[str] = None,
+        lazy: bool = False,
         **kwargs,
     ) -> DataPanel:
-        """Load a DataPanel stored on disk."""
+        """Load a DataPanel stored on disk.
+
+        Args:
+            path (str): the directory the DataPanel was written to.
+            columns (Sequence[str], optional): the columns to read, all columns if
+                None. Only the data of these columns is read, even if they are
+                stored in a block with other columns. Defaults to None.
+            lazy (bool): whether to defer reading the data of each block until it
+                is first accessed, e.g. ``mk.DataPanel.read(path, lazy=True)["label"]``
+                does not read a block of embeddings. Defaults to False.
+        """
+
+        from meerkat.sharded import is_sharded, read_sharded
+
+        if is_sharded(path):
+            return read_sharded(path, columns=columns)
 
         # Load the metadata
         metadata = dict(
@@ -827,12 +1050,13 @@ class DataPanel(
         # Load the the manager
         mgr_dir = os.path.join(path, "mgr")
         if os.path.exists(mgr_dir):
-            data = BlockManager.read(mgr_dir, **kwargs)
+            data = BlockManager.read(mgr_dir, columns=columns, lazy=lazy, **kwargs)
         else:
             # backwards compatability to pre-manager datapanels
             data = {
                 name: dtype.read(os.path.join(path, "columns", name), *args, **kwargs)
                 for name, dtype in metadata["column_dtypes"].items()
+                if columns is None or name in columns
             }
 
         dp._set_data(data)
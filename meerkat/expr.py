@@ -0,0 +1,484 @@
+"""Declarative, vectorized row predicates.
+
+Build a predicate with :func:`col` and pass it to :meth:`DataPanel.filter`:
+
+.. code-block:: python
+
+    dp.filter((mk.col("label") == 3) & (mk.col("conf") > 0.9))
+
+Predicates are evaluated directly on the arrays backing each column (numpy arrays,
+pandas Series, torch tensors and arrow arrays) with the vectorized kernels of the
+respective library. No Python code is run per row and columns that would need to
+be materialized (e.g. ``LambdaColumn``) cannot be referenced.
+"""
+from __future__ import annotations
+
+import operator
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import torch
+
+from meerkat.columns.arrow_column import ArrowArrayColumn
+from meerkat.columns.list_column import ListColumn
+from meerkat.columns.numpy_column import NumpyArrayColumn
+from meerkat.columns.pandas_column import PandasSeriesColumn
+from meerkat.columns.tensor_column import TensorColumn
+
+if TYPE_CHECKING:
+    from meerkat.datapanel import DataPanel
+    from meerkat.sharded import ColumnStats
+
+
+# operator name => (python operator, pyarrow.compute kernel)
+_COMPARISONS: Dict[str, Tuple[Callable, Callable]] = {
+    "==": (operator.eq, pc.equal),
+    "!=": (operator.ne, pc.not_equal),
+    "<": (operator.lt, pc.less),
+    "<=": (operator.le, pc.less_equal),
+    ">": (operator.gt, pc.greater),
+    ">=": (operator.ge, pc.greater_equal),
+}
+
+# operator name => the operator with its operands swapped
+_FLIPPED = {"==": "==", "!=": "!=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+class Expr:
+    """A predicate (or a value used by a predicate) over the columns of a
+    DataPanel."""
+
+    @property
+    def columns(self) -> List[str]:
+        """The names of the columns referenced by the expression."""
+        raise NotImplementedError
+
+    def _evaluate(self, dp: DataPanel) -> object:
+        raise NotImplementedError
+
+    def _bounds(
+        self, stats: Mapping[str, ColumnStats], nrows: int
+    ) -> Tuple[bool, bool]:
+        """Whether the predicate may be true, and may be false, for some of
+        ``nrows`` rows whose columns have the statistics ``stats`` (e.g. a row
+        group of a sharded DataPanel, see :mod:`meerkat.sharded`). Rows for which
+        the predicate is null count as false.
+
+        The answer errs on the side of ``True``: e.g. a group of rows is only
+        skipped by a filter if the predicate cannot be true for any of them.
+        """
+        return True, True
+
+    def evaluate(self, dp: DataPanel) -> np.ndarray:
+        """Evaluate the predicate on ``dp``.
+
+        Return:
+            np.ndarray: a boolean mask with one entry per row of ``dp``. Rows for
+                which the predicate is null (e.g. comparisons with missing values)
+                are ``False``.
+        """
+        missing = set(self.columns) - set(dp.columns)
+        if missing:
+            raise KeyError(f"DataPanel does not have columns {missing}")
+        mask = _to_mask(self._evaluate(dp))
+        if mask.shape != (len(dp),):
+            raise ValueError(
+                f"Expression must evaluate to one boolean per row, got an array of "
+                f"shape {mask.shape} for a DataPanel of length {len(dp)}."
+            )
+        return mask
+
+    def _compare(self, op: str, other: Any) -> Expr:
+        return Compare(op=op, left=self, right=_wrap(other))
+
+    def __eq__(self, other: Any) -> Expr:
+        return self._compare("==", other)
+
+    def __ne__(self, other: Any) -> Expr:
+        return self._compare("!=", other)
+
+    def __lt__(self, other: Any) -> Expr:
+        return self._compare("<", other)
+
+    def __le__(self, other: Any) -> Expr:
+        return self._compare("<=", other)
+
+    def __gt__(self, other: Any) -> Expr:
+        return self._compare(">", other)
+
+    def __ge__(self, other: Any) -> Expr:
+        return self._compare(">=", other)
+
+    def __and__(self, other: Any) -> Expr:
+        return And(left=self, right=_wrap(other))
+
+    def __rand__(self, other: Any) -> Expr:
+        return And(left=_wrap(other), right=self)
+
+    def __or__(self, other: Any) -> Expr:
+        return Or(left=self, right=_wrap(other))
+
+    def __ror__(self, other: Any) -> Expr:
+        return Or(left=_wrap(other), right=self)
+
+    def __invert__(self) -> Expr:
+        return Not(operand=self)
+
+    def __bool__(self):
+        raise TypeError(
+            "The truth value of an expression is ambiguous. Use `&`, `|` and `~` "
+            "instead of `and`, `or` and `not`, and avoid chained comparisons."
+        )
+
+    # defining __eq__ would otherwise make expressions unhashable silently
+    __hash__ = object.__hash__
+
+    def isin(self, values: Sequence) -> Expr:
+        """Whether each value is contained in ``values``."""
+        return IsIn(operand=self, values=list(values))
+
+    def isnull(self) -> Expr:
+        """Whether each value is missing (``None``, ``NaN`` or an arrow null)."""
+        return IsNull(operand=self)
+
+    def notnull(self) -> Expr:
+        """Whether each value is not missing."""
+        return Not(operand=IsNull(operand=self))
+
+
+class Column(Expr):
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"col({self.name!r})"
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.name]
+
+    def _evaluate(self, dp: DataPanel) -> object:
+        column = dp[self.name]
+        if isinstance(
+            column,
+            (NumpyArrayColumn, TensorColumn, PandasSeriesColumn, ArrowArrayColumn),
+        ):
+            return column._data
+        if isinstance(column, ListColumn):
+            return np.asarray(column.data)
+        raise TypeError(
+            f"Cannot evaluate an expression on column `{self.name}` of type "
+            f"{type(column).__name__}. Expressions can only reference numpy, pandas, "
+            "tensor, arrow and list columns."
+        )
+
+
+class Literal(Expr):
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __repr__(self):
+        return repr(self.value)
+
+    @property
+    def columns(self) -> List[str]:
+        return []
+
+    def _evaluate(self, dp: DataPanel) -> object:
+        return self.value
+
+    def _bounds(
+        self, stats: Mapping[str, ColumnStats], nrows: int
+    ) -> Tuple[bool, bool]:
+        if isinstance(self.value, (bool, np.bool_)):
+            return bool(self.value), not self.value
+        return True, True
+
+
+class Compare(Expr):
+    def __init__(self, op: str, left: Expr, right: Expr):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return f"({self.left!r} {self.op} {self.right!r})"
+
+    @property
+    def columns(self) -> List[str]:
+        return _unique(self.left.columns + self.right.columns)
+
+    def _evaluate(self, dp: DataPanel) -> object:
+        python_op, arrow_op = _COMPARISONS[self.op]
+        left, right = self.left._evaluate(dp), self.right._evaluate(dp)
+        left, right = _align(left, right)
+        if _is_arrow(left) or _is_arrow(right):
+            return arrow_op(left, right)
+        return python_op(left, right)
+
+    def _bounds(
+        self, stats: Mapping[str, ColumnStats], nrows: int
+    ) -> Tuple[bool, bool]:
+        op, column, value = self.op, self.left, self.right
+        if isinstance(column, Literal):
+            op, column, value = _FLIPPED[op], value, column
+        column_stats = _column_stats(column, stats)
+        if column_stats is None or not isinstance(value, Literal):
+            return True, True
+        lo, hi, value = column_stats.min, column_stats.max, value.value
+        nulls = column_stats.null_count != 0
+        if op == "!=" and nulls:
+            # `NaN != value` is true with numpy and pandas (but null with arrow)
+            return True, True
+        if column_stats.null_count == nrows:
+            # other comparisons with nulls (or NaN) are false
+            return False, True
+        try:
+            if op == "==":
+                return lo <= value <= hi, nulls or not lo == hi == value
+            if op == "!=":
+                return not lo == hi == value, lo <= value <= hi
+            if op == "<":
+                return lo < value, nulls or hi >= value
+            if op == "<=":
+                return lo <= value, nulls or hi > value
+            if op == ">":
+                return hi > value, nulls or lo <= value
+            return hi >= value, nulls or lo < value
+        except TypeError:
+            # e.g. a number compared to strings
+            return True, True
+
+
+class And(Expr):
+    def __init__(self, left: Expr, right: Expr):
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return f"({self.left!r} & {self.right!r})"
+
+    @property
+    def columns(self) -> List[str]:
+        return _unique(self.left.columns + self.right.columns)
+
+    def _evaluate(self, dp: DataPanel) -> np.ndarray:
+        return _to_mask(self.left._evaluate(dp)) & _to_mask(self.right._evaluate(dp))
+
+    def _bounds(
+        self, stats: Mapping[str, ColumnStats], nrows: int
+    ) -> Tuple[bool, bool]:
+        left_true, left_false = self.left._bounds(stats, nrows)
+        right_true, right_false = self.right._bounds(stats, nrows)
+        return left_true and right_true, left_false or right_false
+
+
+class Or(Expr):
+    def __init__(self, left: Expr, right: Expr):
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return f"({self.left!r} | {self.right!r})"
+
+    @property
+    def columns(self) -> List[str]:
+        return _unique(self.left.columns + self.right.columns)
+
+    def _evaluate(self, dp: DataPanel) -> np.ndarray:
+        return _to_mask(self.left._evaluate(dp)) | _to_mask(self.right._evaluate(dp))
+
+    def _bounds(
+        self, stats: Mapping[str, ColumnStats], nrows: int
+    ) -> Tuple[bool, bool]:
+        left_true, left_false = self.left._bounds(stats, nrows)
+        right_true, right_false = self.right._bounds(stats, nrows)
+        return left_true or right_true, left_false and right_false
+
+
+class Not(Expr):
+    def __init__(self, operand: Expr):
+        self.operand = operand
+
+    def __repr__(self):
+        return f"~{self.operand!r}"
+
+    @property
+    def columns(self) -> List[str]:
+        return self.operand.columns
+
+    def _evaluate(self, dp: DataPanel) -> np.ndarray:
+        return ~_to_mask(self.operand._evaluate(dp))
+
+    def _bounds(
+        self, stats: Mapping[str, ColumnStats], nrows: int
+    ) -> Tuple[bool, bool]:
+        may_be_true, may_be_false = self.operand._bounds(stats, nrows)
+        return may_be_false, may_be_true
+
+
+class IsIn(Expr):
+    def __init__(self, operand: Expr, values: List):
+        self.operand = operand
+        self.values = values
+
+    def __repr__(self):
+        return f"{self.operand!r}.isin({self.values!r})"
+
+    @property
+    def columns(self) -> List[str]:
+        return self.operand.columns
+
+    def _evaluate(self, dp: DataPanel) -> object:
+        values = self.operand._evaluate(dp)
+        if _is_arrow(values):
+            return pc.is_in(values, value_set=pa.array(self.values))
+        if isinstance(values, pd.Series):
+            return values.isin(self.values)
+        if torch.is_tensor(values):
+            return torch.isin(
+                values, torch.as_tensor(self.values, device=values.device)
+            )
+        return np.isin(values, self.values)
+
+    def _bounds(
+        self, stats: Mapping[str, ColumnStats], nrows: int
+    ) -> Tuple[bool, bool]:
+        column_stats = _column_stats(self.operand, stats)
+        if column_stats is None:
+            return True, True
+        if column_stats.null_count == nrows:
+            return False, True
+        lo, hi = column_stats.min, column_stats.max
+        try:
+            may_be_true = any(lo <= value <= hi for value in self.values)
+            all_true = column_stats.null_count == 0 and lo == hi and lo in self.values
+        except TypeError:
+            return True, True
+        return may_be_true, not all_true
+
+
+class IsNull(Expr):
+    def __init__(self, operand: Expr):
+        self.operand = operand
+
+    def __repr__(self):
+        return f"{self.operand!r}.isnull()"
+
+    @property
+    def columns(self) -> List[str]:
+        return self.operand.columns
+
+    def _evaluate(self, dp: DataPanel) -> object:
+        values = self.operand._evaluate(dp)
+        if _is_arrow(values):
+            return pc.is_null(values, nan_is_null=True)
+        if torch.is_tensor(values):
+            if values.is_floating_point():
+                return torch.isnan(values)
+            return torch.zeros_like(values, dtype=torch.bool)
+        return pd.isnull(values)
+
+    def _bounds(
+        self, stats: Mapping[str, ColumnStats], nrows: int
+    ) -> Tuple[bool, bool]:
+        column_stats = _column_stats(self.operand, stats)
+        if column_stats is None:
+            return True, True
+        null_count = column_stats.null_count
+        return null_count != 0, null_count is None or null_count < nrows
+
+
+def col(name: str) -> Expr:
+    """Reference the column ``name`` in a filter expression.
+
+    Example:
+        >>> dp.filter((mk.col("label") == 3) & (mk.col("conf") > 0.9))
+    """
+    return Column(name)
+
+
+def _wrap(value: Any) -> Expr:
+    return value if isinstance(value, Expr) else Literal(value)
+
+
+def _column_stats(
+    operand: Expr, stats: Mapping[str, ColumnStats]
+) -> Optional[ColumnStats]:
+    if not isinstance(operand, Column):
+        return None
+    return stats.get(operand.name)
+
+
+def _unique(names: List[str]) -> List[str]:
+    return list(dict.fromkeys(names))
+
+
+def _is_arrow(values: object) -> bool:
+    return isinstance(values, (pa.Array, pa.ChunkedArray))
+
+
+def _align(left: object, right: object):
+    """Bring two operands to a common representation.
+
+    Operands of the same kind (or an array and a scalar) are left untouched so
+    that the native kernels are used, arrays of different kinds are compared as
+    numpy arrays.
+    """
+    kinds = {_kind(left), _kind(right)} - {None}
+    if len(kinds) <= 1:
+        if kinds == {"pandas"} and isinstance(right, pd.Series):
+            # do not align on the pandas index
+            return left.values, right.values
+        return left, right
+    return _to_numpy(left), _to_numpy(right)
+
+
+def _kind(values: object):
+    if _is_arrow(values):
+        return "arrow"
+    if isinstance(values, pd.Series):
+        return "pandas"
+    if torch.is_tensor(values):
+        return "torch"
+    if isinstance(values, np.ndarray):
+        return "numpy"
+    return None
+
+
+def _to_numpy(values: object) -> object:
+    if _is_arrow(values):
+        return values.to_numpy(zero_copy_only=False)
+    if isinstance(values, pd.Series):
+        return values.values
+    if torch.is_tensor(values):
+        return values.cpu().numpy()
+    return values
+
+
+def _to_mask(values: object) -> np.ndarray:
+    if _is_arrow(values):
+        values = pc.fill_null(values, False)
+    elif isinstance(values, pd.Series) and values.dtype != bool:
+        # nullable booleans
+        values = values.fillna(False).astype(bool)
+    mask = _to_numpy(values)
+    if not isinstance(mask, np.ndarray) or mask.dtype != bool:
+        raise TypeError(
+            "Expression must evaluate to a boolean array, got "
+            f"{getattr(mask, 'dtype', type(mask))}."
+        )
+    return mask
@@ -0,0 +1,380 @@
+"""Deferred query plans over DataPanels."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from meerkat.block.row_index import ArrayIndex, RowIndex, SliceIndex
+from meerkat.datapanel import DataPanel
+from meerkat.expr import Expr
+
+logger = logging.getLogger(__name__)
+
+
+class PlanNode:
+    """A single step recorded in the plan of a :class:`LazyDataPanel`."""
+
+    def __repr__(self):
+        return self.__class__.__name__
+
+
+@dataclass(repr=False)
+class SelectRows(PlanNode):
+    index: Any
+
+    def __repr__(self):
+        if isinstance(self.index, slice):
+            return f"SelectRows({self.index.start}:{self.index.stop}:{self.index.step})"
+        if isinstance(self.index, RowIndex):
+            return f"SelectRows({self.index!r})"
+        return f"SelectRows(n={len(self.index)})"
+
+
+@dataclass(repr=False)
+class SelectColumns(PlanNode):
+    columns: List[str]
+
+    def __repr__(self):
+        return f"SelectColumns({self.columns})"
+
+
+@dataclass(repr=False)
+class Filter(PlanNode):
+    function: Callable
+    input_columns: Optional[List[str]] = None
+    kwargs: Dict = field(default_factory=dict)
+
+    def __repr__(self):
+        name = getattr(self.function, "__qualname__", repr(self.function))
+        return f"Filter({name})"
+
+
+@dataclass(repr=False)
+class Sort(PlanNode):
+    by: List[str]
+    ascending: Union[bool, List[bool]] = True
+    kind: str = "quicksort"
+
+    def __repr__(self):
+        return f"Sort(by={self.by})"
+
+
+@dataclass(repr=False)
+class Sample(PlanNode):
+    n: int = None
+    frac: float = None
+    replace: bool = False
+    weights: Union[str, np.ndarray] = None
+    random_state: Union[int, np.random.RandomState] = None
+
+    def __repr__(self):
+        return f"Sample(n={self.n}, frac={self.frac})"
+
+
+@dataclass(repr=False)
+class Merge(PlanNode):
+    right: LazyDataPanel
+    kwargs: Dict = field(default_factory=dict)
+
+    def __repr__(self):
+        return f"Merge(right={self.right!r})"
+
+
+class _PlanState:
+    """The state threaded through the execution of a plan: a source DataPanel,
+    the columns currently projected and the (fused) row index into the
+    source."""
+
+    def __init__(self, source: DataPanel):
+        self.source = source
+        self.columns: List[str] = list(source.columns)
+        self.index: Optional[RowIndex] = None
+
+    def __len__(self):
+        return len(self.source) if self.index is None else len(self.index)
+
+    def rows(self, columns: Sequence[str]) -> DataPanel:
+        """Gather ``columns`` at the current rows, touching no other column."""
+        dp = self.source[list(columns)]
+        return dp if self.index is None else dp.lz[self.index]
+
+    def select_rows(self, index):
+        """Select rows from the current selection, ``index`` is relative to the
+        current selection."""
+        if self.index is None:
+            self.index = RowIndex.from_index(index, nrows=len(self.source))
+        else:
+            self.index = self.index.compose(index)
+
+    def select_columns(self, columns: Sequence[str]):
+        missing = set(columns) - set(self.columns)
+        if missing:
+            raise KeyError(f"DataPanel does not have columns {missing}")
+        self.columns = list(columns)
+
+    def finalize(self) -> Tuple[DataPanel, Optional[RowIndex]]:
+        """Return the projected source and the row index that must be gathered
+        from it."""
+        dp = self.source[self.columns]
+        index = self.index
+        if isinstance(index, ArrayIndex) and _is_contiguous(index.array):
+            # contiguous rows can be taken with a slice, which gives views
+            # instead of copies for most blocks
+            index = SliceIndex(
+                range(int(index.array[0]), int(index.array[-1]) + 1),
+                nrows=index.nrows,
+            )
+        return dp, index
+
+
+class LazyDataPanel:
+    """A deferred query over a :class:`~meerkat.DataPanel`.
+
+    Operations on a ``LazyDataPanel`` are recorded in a plan rather than run. When
+    the plan is consumed (``collect``, ``batch``, ``write`` or ``to_pandas``),
+    consecutive row selections are fused into a single composed index and only the
+    columns needed by each step are gathered, so every block is touched at most
+    once. Create one with :meth:`DataPanel.lazy`.
+
+    ``merge`` acts as a barrier: the plans on both sides of the merge are executed
+    (each fused on its own) before the merge is run.
+    """
+
+    def __init__(self, source: DataPanel, plan: Sequence[PlanNode] = ()):
+        self.source = source
+        self.plan: Tuple[PlanNode] = tuple(plan)
+
+    def __repr__(self):
+        steps = " -> ".join(repr(node) for node in self.plan)
+        return f"{self.__class__.__name__}(source={self.source!r}" + (
+            f", plan: {steps})" if steps else ")"
+        )
+
+    def _append(self, node: PlanNode) -> LazyDataPanel:
+        return self.__class__(source=self.source, plan=self.plan + (node,))
+
+    @property
+    def lz(self) -> LazyDataPanel:
+        # row selections on a LazyDataPanel are always lazy
+        return self
+
+    def __getitem__(self, index):
+        if isinstance(index, str):
+            return self[[index]].collect()[index]
+
+        if isinstance(index, (int, np.integer)):
+            dp = self._append(SelectRows(np.array([index]))).collect()
+            return dp.lz[0]
+
+        if (
+            isinstance(index, (tuple, list))
+            and len(index)
+            and isinstance(index[0], str)
+        ):
+            return self._append(SelectColumns(list(index)))
+
+        return self._append(SelectRows(index))
+
+    def head(self, n: int = 5) -> LazyDataPanel:
+        """Get the first `n` examples of the DataPanel."""
+        return self[:n]
+
+    def tail(self, n: int = 5) -> LazyDataPanel:
+        """Get the last `n` examples of the DataPanel."""
+        return self[-n:]
+
+    def filter(
+        self,
+        function: Union[Callable, Expr],
+        input_columns: Optional[Union[str, List[str]]] = None,
+        **kwargs,
+    ) -> LazyDataPanel:
+        """Record a :meth:`DataPanel.filter`.
+
+        Only ``input_columns`` (or the columns referenced by an expression) are
+        gathered to evaluate ``function``, all remaining keyword arguments are
+        passed through to ``filter``.
+        """
+        if isinstance(input_columns, str):
+            input_columns = [input_columns]
+        elif input_columns is None and isinstance(function, Expr):
+            input_columns = function.columns
+        return self._append(
+            Filter(function=function, input_columns=input_columns, kwargs=kwargs)
+        )
+
+    def sort(
+        self,
+        by: Union[str, List[str]],
+        ascending: Union[bool, List[bool]] = True,
+        kind: str = "quicksort",
+    ) -> LazyDataPanel:
+        """Record a :func:`meerkat.sort`, only the ``by`` columns are
+        gathered."""
+        by = [by] if isinstance(by, str) else list(by)
+        return self._append(Sort(by=by, ascending=ascending, kind=kind))
+
+    def sample(
+        self,
+        n: int = None,
+        frac: float = None,
+        replace: bool = False,
+        weights: Union[str, np.ndarray] = None,
+        random_state: Union[int, np.random.RandomState] = None,
+    ) -> LazyDataPanel:
+        """Record a :func:`meerkat.sample`."""
+        return self._append(
+            Sample(
+                n=n,
+                frac=frac,
+                replace=replace,
+                weights=weights,
+                random_state=random_state,
+            )
+        )
+
+    def merge(
+        self,
+        right: Union[DataPanel, LazyDataPanel],
+        how: str = "inner",
+        on: Union[str, List[str]] = None,
+        left_on: Union[str, List[str]] = None,
+        right_on: Union[str, List[str]] = None,
+        sort: bool = False,
+        suffixes: Sequence[str] = ("_x", "_y"),
+        validate=None,
+    ) -> LazyDataPanel:
+        """Record a :func:`meerkat.merge`."""
+        if not isinstance(right, LazyDataPanel):
+            right = LazyDataPanel(right)
+        return self._append(
+            Merge(
+                right=right,
+                kwargs=dict(
+                    how=how,
+                    on=on,
+                    left_on=left_on,
+                    right_on=right_on,
+                    sort=sort,
+                    suffixes=suffixes,
+                    validate=validate,
+                ),
+            )
+        )
+
+    def _execute(self) -> _PlanState:
+        source, plan = self.source, self.plan
+
+        # everything before the last merge is executed (and fused) on its own
+        merges = [idx for idx, node in enumerate(plan) if isinstance(node, Merge)]
+        if merges:
+            from meerkat.ops.merge import merge
+
+            last = merges[-1]
+            left = self.__class__(source=source, plan=plan[:last]).collect()
+            right = plan[last].right.collect()
+            source = merge(left, right, **plan[last].kwargs)
+            plan = plan[last + 1 :]
+
+        state = _PlanState(source)
+        for node in plan:
+            if isinstance(node, SelectRows):
+                state.select_rows(node.index)
+            elif isinstance(node, SelectColumns):
+                state.select_columns(node.columns)
+            elif len(state) == 0:
+                # index-producing ops are no-ops on an empty selection
+                continue
+            elif isinstance(node, Filter):
+                columns = (
+                    state.columns if node.input_columns is None else node.input_columns
+                )
+                state.select_rows(
+                    state.rows(columns)._filter_indices(node.function, **node.kwargs)
+                )
+            elif isinstance(node, Sort):
+                from meerkat.ops.sort import _sort_indices
+
+                state.select_rows(
+                    _sort_indices(
+                        state.rows(node.by),
+                        by=node.by,
+                        ascending=node.ascending,
+                        kind=node.kind,
+                    )
+                )
+            elif isinstance(node, Sample):
+                from meerkat.ops.sample import _sample_indices
+
+                state.select_rows(
+                    _sample_indices(
+                        data=(
+                            state.rows([node.weights])
+                            if isinstance(node.weights, str)
+                            else range(len(state))
+                        ),
+                        n=node.n,
+                        frac=node.frac,
+                        replace=node.replace,
+                        weights=node.weights,
+                        random_state=node.random_state,
+                    )
+                )
+            else:
+                raise ValueError(f"Unsupported plan node {node}.")
+        return state
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names of the result.
+
+        Computed from the plan without gathering any rows, unless the plan
+        contains a merge.
+        """
+        if any(isinstance(node, Merge) for node in self.plan):
+            return self.collect().columns
+        columns = self.source.columns
+        for node in self.plan:
+            if isinstance(node, SelectColumns):
+                columns = list(node.columns)
+        return columns
+
+    def __len__(self):
+        # resolves the row index, but does not gather any columns
+        return len(self._execute())
+
+    def collect(self) -> DataPanel:
+        """Execute the plan and return the resulting DataPanel."""
+        dp, index = self._execute().finalize()
+        return dp if index is None else dp.lz[index]
+
+    def batch(self, *args, **kwargs):
+        """Batch the result of the plan, see :meth:`DataPanel.batch`.
+
+        Rows are gathered batch by batch straight from the source, the full
+        result is never materialized.
+        """
+        dp, index = self._execute().finalize()
+        return dp.batch(*args, indices=index, **kwargs)
+
+    def write(self, path: str) -> None:
+        """Execute the plan and write the result to disk, see
+        :meth:`DataPanel.write`."""
+        self.collect().write(path)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Execute the plan and convert the result to a pandas DataFrame."""
+        return self.collect().to_pandas()
+
+
+def _is_contiguous(index: np.ndarray) -> bool:
+    return (
+        len(index) > 0
+        and index[0] >= 0
+        and index[-1] - index[0] == len(index) - 1
+        and (len(index) == 1 or bool((np.diff(index) == 1).all()))
+    )
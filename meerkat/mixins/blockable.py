@@ -1,6 +1,23 @@
 from meerkat.block.abstract import BlockView
 
 
+class LazyBlockData:
+    """The ``_data`` of the columns of blocks read with ``lazy=True`` (see
+    :meth:`AbstractBlock.read`), which is fetched from the block, and so read, on
+    first access.
+
+    Other columns set ``_data`` on the instance, which takes precedence over this
+    (non-data) descriptor.
+    """
+
+    def __get__(self, column, owner=None):
+        if column is None or "_block" not in column.__dict__:
+            return None
+        data = column._block._get_data(column._block_index)
+        column.__dict__["_data"] = data
+        return data
+
+
 class BlockableMixin:
     def __init__(self, *args, **kwargs):
         super(BlockableMixin, self).__init__(*args, **kwargs)
@@ -19,7 +36,46 @@ class BlockableMixin:
         else:
             block_view: BlockView = self.block_class.from_column_data(data)
             self._block, self._block_index = block_view.block, block_view.block_index
+        self._block._register_column(self)
         return data
 
+    def _set_lazy_block_view(self, data: BlockView):
+        self._block, self._block_index = data.block, data.block_index
+        # fetched from the block on first access, see `LazyBlockData`
+        self.__dict__.pop("_data", None)
+        self._block._register_column(self)
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        if self.is_blockable() and "_block" in state:
+            self._block._register_column(self)
+
+    def copy(self, **kwargs):
+        if not self.is_blockable():
+            return super().copy(**kwargs)
+        # the new block shares the data of the column, which is copied on the first
+        # write to either column, see `AbstractBlock._copy_on_write`
+        block_view = self.block_class.from_column_data(
+            self._block._get_data(self._block_index)
+        )
+        block_view.block._share(self._block)
+        return self._clone(data=block_view)
+
+    def _record_column_scan(self) -> bool:
+        """Record that the full column is about to be read, so that the block can
+        adapt its layout, see :meth:`AbstractBlock._record_column_scan`.
+
+        Return:
+            bool: whether the data of the column was replaced.
+        """
+        return self._block._record_column_scan(self._block_index)
+
     def _pack_block_view(self):
         return BlockView(block_index=self._block_index, block=self._block)
+
+    def _clone_rows(self, data: object, index: object):
+        """Clone the column with ``data``, the rows ``index`` of the column, so
+        that the new block derives its fingerprint from this column's block."""
+        column = self._clone(data=data)
+        column._block._set_source(self._block, index, source_index=self._block_index)
+        return column
@@ -1,13 +1,29 @@
+import itertools
+import json
 import logging
-from typing import Callable, Dict, Mapping, Optional, Union
+import math
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Mapping, Optional, Union
 
 import numpy as np
+import torch
 from tqdm.auto import tqdm
 
 from meerkat.provenance import capture_provenance
+from meerkat.tools.cache import get_cache
+from meerkat.tools.fingerprint import fingerprint
 
 logger = logging.getLogger(__name__)
 
+# with a `checkpoint_dir` and no `flush_size`, the progress of a map is saved every
+# this many batches
+CHECKPOINT_SIZE = 100
+
 
 class MappableMixin:
     def __init__(self, *args, **kwargs):
@@ -28,19 +44,76 @@ class MappableMixin:
         mmap: bool = False,
         mmap_path: str = None,
         flush_size: int = None,
+        executor: str = None,
+        num_procs: int = None,
+        cache: bool = False,
+        checkpoint_dir: str = None,
         **kwargs,
     ):
         # TODO (sabri): add materialize?
         from meerkat.columns.abstract import AbstractColumn
         from meerkat.datapanel import DataPanel
 
-        """Map a function over the elements of the column."""
+        """Map a function over the elements of the column.
+
+        With ``executor="process"``, the batches are split into ``num_procs``
+        contiguous shards (defaults to the number of CPUs) and ``function`` is run
+        on each shard in a separate, forked process. Workers share the data of the
+        DataPanel or column with the main process (in-memory arrays copy-on-write,
+        memmapped arrays through the page cache), so it is never pickled. With
+        ``mmap=True`` workers write their outputs directly into the memmapped output
+        file, otherwise the outputs are sent back to the main process. Forking is
+        not available on Windows and not safe on macOS, where the shards are run one
+        after the other in the main process instead.
+
+        With ``cache=True``, the output is stored in the on-disk cache configured in
+        ``meerkat.config.cache``, keyed by a fingerprint of the data, of
+        ``function`` (its code, closure and referenced globals), of ``kwargs`` and
+        of the batching arguments. Later calls with the same fingerprint return the
+        cached output without running ``function``.
+
+        With ``checkpoint_dir``, the progress of the map is saved every
+        ``flush_size`` batches (100 by default) and when the map is interrupted by
+        an exception: the number of batches completed and the state of the writers.
+        Memmapped outputs are flushed to their file, other outputs are written to
+        ``checkpoint_dir`` chunk by chunk. Calling ``map`` again with the same
+        ``checkpoint_dir`` skips the completed batches and keeps writing into the
+        same outputs, if the data, ``function`` and arguments are the same (with the
+        fingerprint used by ``cache``), otherwise the checkpoint is discarded. The
+        checkpoint is removed once the map completes.
+        """
 
         # Return if `self` has no examples
         if not len(self):
             logger.info("Dataset empty, returning None.")
             return None
 
+        if executor not in (None, "process"):
+            raise ValueError(
+                f"Unknown executor '{executor}', expected None or 'process'."
+            )
+
+        map_key = None
+        if cache or checkpoint_dir is not None:
+            map_key = _map_key(
+                self,
+                function,
+                with_indices=with_indices,
+                is_batched_fn=is_batched_fn,
+                batch_size=batch_size,
+                drop_last_batch=drop_last_batch,
+                output_type=output_type,
+                materialize=materialize,
+                kwargs=kwargs,
+            )
+        cache_key = map_key if cache else None
+        if cache:
+            if cache_key is not None:
+                outputs = get_cache().get(cache_key)
+                if outputs is not None:
+                    logger.info("Returning the cached output of `map`.")
+                    return outputs
+
         if not is_batched_fn:
             # Convert to a batch function
             function = self._convert_to_batch_fn(
@@ -49,122 +122,214 @@ class MappableMixin:
             is_batched_fn = True
             logger.info(f"Converting `function` {function} to a batched function.")
 
-        # Run the map
-        logger.info("Running `map`, the dataset will be left unchanged.")
-        for i, batch in tqdm(
-            enumerate(
-                self.batch(
-                    batch_size=batch_size,
-                    drop_last_batch=drop_last_batch,
-                    num_workers=num_workers,
-                    materialize=materialize
-                    # TODO: collate=batched was commented out in list_column
-                )
-            ),
-            total=(len(self) // batch_size)
-            + int(not drop_last_batch and len(self) % batch_size != 0),
-            disable=not pbar,
-        ):
-            # Calculate the start and end indexes for the batch
-            start_index = i * batch_size
-            end_index = min(len(self), (i + 1) * batch_size)
-
-            # Use the first batch for setup
-            if i == 0:
-                # Get some information about the function
-                function_properties = self._inspect_function(
-                    function,
-                    with_indices,
-                    is_batched_fn,
-                    batch,
-                    range(start_index, end_index),
-                    materialize=materialize,
-                    **kwargs,
+        num_batches = (len(self) // batch_size) + int(
+            not drop_last_batch and len(self) % batch_size != 0
+        )
+        checkpoint, resumed, start_batch = None, False, 1
+        if checkpoint_dir is not None:
+            checkpoint = _MapCheckpoint(
+                checkpoint_dir,
+                num_rows=len(self),
+                batch_size=batch_size,
+                drop_last_batch=drop_last_batch,
+                map_key=map_key,
+            )
+            resumed = checkpoint.next_batch > 0
+            start_batch = max(checkpoint.next_batch, 1)
+            if flush_size is None:
+                flush_size = CHECKPOINT_SIZE
+            if resumed:
+                logger.info(
+                    f"Resuming `map` from batch {start_batch} of {num_batches}."
                 )
 
-                # Pull out information
-                output = function_properties.output
-                dtype = function_properties.output_dtype
-                is_mapping = isinstance(output, Mapping)
-                is_type_mapping = isinstance(output_type, Mapping)
-
-                if not is_mapping and is_type_mapping:
-                    raise ValueError(
-                        "output_type is a mapping but function output is not a mapping"
-                    )
-
-                writers = {}
-                for key, curr_output in (
-                    output.items() if is_mapping else [("0", output)]
-                ):
-                    curr_output_type = (
-                        type(AbstractColumn.from_data(curr_output))
-                        if output_type is None
-                        or (is_type_mapping and key not in output_type.keys())
-                        else output_type[key]
-                        if is_type_mapping
-                        else output_type
-                    )
+        if executor == "process" or checkpoint is not None:
+            # the first batch is always run in the main process, to set up the
+            # writers, the remaining batches are run by the workers or from
+            # `start_batch` on
+            batches = _shard_batches(
+                self,
+                range(0, 1),
+                batch_size=batch_size,
+                drop_last_batch=drop_last_batch,
+                materialize=materialize,
+            )
+            batch_numbers = [0]
+            if executor != "process" and start_batch < num_batches:
+                batches = itertools.chain(
+                    batches,
+                    _shard_batches(
+                        self,
+                        range(start_batch, num_batches),
+                        batch_size=batch_size,
+                        drop_last_batch=drop_last_batch,
+                        materialize=materialize,
+                        num_workers=num_workers,
+                    ),
+                )
+                batch_numbers = itertools.chain(
+                    batch_numbers, range(start_batch, num_batches)
+                )
+        else:
+            batches = self.batch(
+                batch_size=batch_size,
+                drop_last_batch=drop_last_batch,
+                num_workers=num_workers,
+                materialize=materialize
+                # TODO: collate=batched was commented out in list_column
+            )
+            batch_numbers = range(num_batches)
 
-                    writer = curr_output_type.get_writer(
-                        mmap=mmap,
-                        template=(
-                            curr_output.copy()
-                            if isinstance(curr_output, AbstractColumn)
-                            else None
-                        ),
-                    )
+        # Run the map
+        logger.info("Running `map`, the dataset will be left unchanged.")
+        progress = tqdm(total=num_batches, initial=start_batch - 1, disable=not pbar)
+        writers, completed = None, 0
+        try:
+            for batch, i in zip(batches, batch_numbers):
+                # Calculate the start and end indexes for the batch
+                start_index = i * batch_size
+                end_index = min(len(self), (i + 1) * batch_size)
 
-                    # Setup for writing to a certain output column
-                    # TODO: support optionally memmapping only some columns
-                    if mmap:
-                        if not hasattr(curr_output, "shape"):
-                            curr_output = np.array(curr_output)
-
-                        # Assumes first dimension of output is the batch dimension.
-                        shape = (len(self), *curr_output.shape[1:])
-
-                        # Construct the mmap file path
-                        if mmap_path is None:
-                            mmap_path = self.logdir / f"{hash(function)}" / key
-                        # Open the output writer
-                        writer.open(str(mmap_path), dtype, shape=shape)
-                    else:
-                        # Create an empty dict or list for the outputs
-                        writer.open()
-                    writers[key] = writer
-
-            else:
-                # Run `function` on the batch
-                output = (
-                    function(
+                # Use the first batch for setup
+                if i == 0:
+                    # Get some information about the function
+                    function_properties = self._inspect_function(
+                        function,
+                        with_indices,
+                        is_batched_fn,
                         batch,
-                        range(i * batch_size, min(len(self), (i + 1) * batch_size)),
+                        range(start_index, end_index),
+                        materialize=materialize,
                         **kwargs,
                     )
-                    if with_indices
-                    else function(batch, **kwargs)
-                )
 
-            # Append the output
-            if output is not None:
-                if isinstance(output, Mapping):
-                    if set(output.keys()) != set(writers.keys()):
+                    # Pull out information
+                    output = function_properties.output
+                    dtype = function_properties.output_dtype
+                    is_mapping = isinstance(output, Mapping)
+                    is_type_mapping = isinstance(output_type, Mapping)
+
+                    if not is_mapping and is_type_mapping:
                         raise ValueError(
-                            "Map function must return same keys for each batch."
+                            "output_type is a mapping but function output is not a "
+                            "mapping"
+                        )
+
+                    keys = list(output.keys()) if is_mapping else ["0"]
+                    if resumed and set(keys) != set(checkpoint.writers):
+                        raise ValueError(
+                            f"Checkpoint in {checkpoint.path} has outputs "
+                            f"{sorted(checkpoint.writers)}, but function returns "
+                            f"{sorted(keys)}."
+                        )
+
+                    writers = {}
+                    for key, curr_output in (
+                        output.items() if is_mapping else [("0", output)]
+                    ):
+                        curr_output_type = (
+                            type(AbstractColumn.from_data(curr_output))
+                            if output_type is None
+                            or (is_type_mapping and key not in output_type.keys())
+                            else output_type[key]
+                            if is_type_mapping
+                            else output_type
+                        )
+
+                        writer = curr_output_type.get_writer(
+                            mmap=mmap,
+                            template=(
+                                curr_output.copy()
+                                if isinstance(curr_output, AbstractColumn)
+                                else None
+                            ),
                         )
-                    for k, writer in writers.items():
-                        writer.write(output[k])
+
+                        # Setup for writing to a certain output column
+                        # TODO: support optionally memmapping only some columns
+                        if resumed:
+                            # continue writing into the outputs of the checkpoint
+                            writer.restore(
+                                checkpoint.writer_dir(key), checkpoint.writers[key]
+                            )
+                        elif mmap:
+                            if not hasattr(curr_output, "shape"):
+                                curr_output = np.array(curr_output)
+
+                            # Assumes first dimension of output is the batch
+                            # dimension.
+                            shape = (len(self), *curr_output.shape[1:])
+
+                            # Construct the mmap file path
+                            if mmap_path is None:
+                                mmap_path = (
+                                    self.logdir
+                                    / (cache_key or _function_fingerprint(function))
+                                    / key
+                                )
+                            # Open the output writer
+                            writer.open(str(mmap_path), dtype, shape=shape)
+                        else:
+                            # Create an empty dict or list for the outputs
+                            writer.open()
+                        writers[key] = writer
+
+                    if resumed:
+                        # the output of the first batch is already in the writers
+                        output = None
+
                 else:
-                    writers["0"].write(output)
+                    # Run `function` on the batch
+                    output = (
+                        function(batch, range(start_index, end_index), **kwargs)
+                        if with_indices
+                        else function(batch, **kwargs)
+                    )
+
+                # Append the output
+                _write_output(writers, output)
+                completed = i + 1 if i > 0 else start_batch
+
+                # intermittently flush
+                if flush_size is not None and ((i + 1) % flush_size == 0):
+                    for writer in writers.values():
+                        writer.flush()
+                    if checkpoint is not None:
+                        checkpoint.save(completed, writers)
+                progress.update()
 
-            # intermittently flush
-            if flush_size is not None and ((i + 1) % flush_size == 0):
-                for writer in writers.values():
-                    writer.flush()
+            if executor == "process" and start_batch < num_batches:
+                _map_in_processes(
+                    self,
+                    function,
+                    writers=writers,
+                    batches=range(start_batch, num_batches),
+                    num_procs=num_procs,
+                    progress=progress,
+                    checkpoint=checkpoint,
+                    with_indices=with_indices,
+                    batch_size=batch_size,
+                    drop_last_batch=drop_last_batch,
+                    materialize=materialize,
+                    mmap=mmap,
+                    flush_size=flush_size,
+                    kwargs=kwargs,
+                )
+        except BaseException:
+            # save the progress made since the last checkpoint
+            if (
+                checkpoint is not None
+                and writers is not None
+                and completed > checkpoint.next_batch
+            ):
+                checkpoint.save(completed, writers)
+            raise
+        progress.close()
 
         # Check if we are returning a special output type
         outputs = {key: writer.finalize() for key, writer in writers.items()}
+        if checkpoint is not None:
+            checkpoint.remove()
 
         if not is_mapping:
             outputs = outputs["0"]
@@ -177,4 +342,260 @@ class MappableMixin:
                 else DataPanel.from_batch(outputs)
             )
             outputs._visible_columns = None
+
+        if cache_key is not None:
+            get_cache().put(cache_key, outputs)
         return outputs
+
+
+def _map_key(data: object, function: Callable, **arguments) -> Optional[str]:
+    """A fingerprint of the data, function and arguments of a map, which keys its
+    cached output and identifies its checkpoints."""
+    try:
+        return fingerprint("map", data, function, arguments)
+    except TypeError as e:
+        logger.warning(
+            "Not caching the output of `map`, nor checking that its checkpoint was "
+            f"saved by the same function and data: {e}"
+        )
+        return None
+
+
+def _function_fingerprint(function: Callable) -> str:
+    try:
+        return fingerprint(function)
+    except TypeError:
+        # e.g. functions referencing unpicklable objects
+        return str(hash(function))
+
+
+def _write_output(writers: Dict[str, object], output: object):
+    if output is None:
+        return
+    if isinstance(output, Mapping):
+        if set(output.keys()) != set(writers.keys()):
+            raise ValueError("Map function must return same keys for each batch.")
+        for k, writer in writers.items():
+            writer.write(output[k])
+    else:
+        writers["0"].write(output)
+
+
+def _shard_batches(
+    data: object,
+    shard: range,
+    batch_size: int,
+    drop_last_batch: bool,
+    materialize: bool,
+    num_workers: int = 0,
+):
+    """Batch the rows of the batches numbered ``shard``.
+
+    Shards start at a multiple of ``batch_size``, so the batches are the same as
+    those of ``data.batch``. The shard is a lazy slice, i.e. a view of ``data``.
+    """
+    start = shard.start * batch_size
+    stop = min(len(data), shard.stop * batch_size)
+    return data.lz[start:stop].batch(
+        batch_size=batch_size,
+        drop_last_batch=drop_last_batch,
+        materialize=materialize,
+        num_workers=num_workers,
+    )
+
+
+class _MapCheckpoint:
+    """The progress of a map saved in ``path``: the number of batches completed,
+    which are always the first batches, and the state of the writers.
+
+    A checkpoint can only be resumed by a map with the same batching, data,
+    function and arguments (see :func:`_map_key`), the checkpoints of other maps
+    are discarded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        num_rows: int,
+        batch_size: int,
+        drop_last_batch: bool,
+        map_key: Optional[str] = None,
+    ):
+        self.path = str(path)
+        self.job = {
+            "num_rows": num_rows,
+            "batch_size": batch_size,
+            "drop_last_batch": drop_last_batch,
+            "map_key": map_key,
+        }
+        self.next_batch = 0
+        self.writers = {}
+
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+            if state["job"] != self.job:
+                logger.warning(
+                    f"Discarding the checkpoint in {self.path}, which was saved by "
+                    f"a map with {state['job']}, not {self.job}."
+                )
+                self.remove()
+                return
+            self.next_batch = state["next_batch"]
+            self.writers = state["writers"]
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.path, "checkpoint.json")
+
+    def writer_dir(self, key: str) -> str:
+        return os.path.join(self.path, "writers", key)
+
+    def save(self, next_batch: int, writers: Dict[str, object]):
+        state = {
+            "job": self.job,
+            "next_batch": next_batch,
+            "writers": {
+                key: writer.checkpoint(self.writer_dir(key))
+                for key, writer in writers.items()
+            },
+        }
+        os.makedirs(self.path, exist_ok=True)
+        # replace the state atomically, so that an interrupted save does not
+        # corrupt the previous checkpoint
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+        self.next_batch = next_batch
+        self.writers = state["writers"]
+
+    def remove(self):
+        shutil.rmtree(os.path.join(self.path, "writers"), ignore_errors=True)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+
+# the arguments of a process map, inherited by the forked workers
+_PROCESS_MAP_STATE: Optional[dict] = None
+
+
+def _map_in_processes(
+    data: object,
+    function: Callable,
+    writers: Dict[str, object],
+    batches: range,
+    num_procs: Optional[int],
+    progress: tqdm,
+    checkpoint: Optional[_MapCheckpoint],
+    **state,
+):
+    """Run ``function`` on the batches of ``data`` numbered ``batches`` in a pool of
+    forked processes (or in the main process, if processes cannot be forked, see
+    :func:`_can_fork`) and write the outputs to ``writers``."""
+    global _PROCESS_MAP_STATE
+
+    num_procs = os.cpu_count() if num_procs is None else num_procs
+    if num_procs < 1:
+        raise ValueError("`num_procs` must be at least 1.")
+    num_shards = num_procs
+    if checkpoint is not None:
+        # a checkpoint is saved after each shard
+        num_shards = max(num_procs, math.ceil(len(batches) / state["flush_size"]))
+    shards = [
+        range(int(part[0]), int(part[-1]) + 1)
+        for part in np.array_split(np.array(batches), num_shards)
+        if len(part)
+    ]
+
+    # the workers are forked, so they inherit `data` and `function` instead of
+    # receiving pickled copies
+    _PROCESS_MAP_STATE = dict(data=data, function=function, writers=writers, **state)
+    fork = _can_fork()
+    if not fork:
+        logger.warning(
+            f"Cannot fork processes on {sys.platform}, running the shards of `map` "
+            "in the main process."
+        )
+    try:
+        with (
+            multiprocessing.get_context("fork").Pool(
+                min(num_procs, len(shards)), initializer=_init_worker
+            )
+            if fork
+            else nullcontext()
+        ) as pool:
+            # the shards are returned in order, so the completed batches are always
+            # those before the end of the last shard
+            results = pool.imap(_map_shard, shards) if fork else map(_map_shard, shards)
+            for shard, outputs in zip(shards, results):
+                if state["mmap"]:
+                    # memmapped outputs are written by the workers
+                    rows = min(len(data), shard.stop * state["batch_size"])
+                    for writer in writers.values():
+                        writer.seek(rows)
+                else:
+                    for output in outputs:
+                        _write_output(writers, output)
+                if checkpoint is not None:
+                    checkpoint.save(shard.stop, writers)
+                progress.update(len(shard))
+    finally:
+        _PROCESS_MAP_STATE = None
+
+
+def _can_fork() -> bool:
+    """Whether the workers of a process map can be forked: Windows has no fork, and
+    system libraries on macOS may crash in forked processes."""
+    return (
+        sys.platform != "darwin" and "fork" in multiprocessing.get_all_start_methods()
+    )
+
+
+def _init_worker():
+    # as in DataLoader workers, avoid oversubscribing the CPUs with torch threads
+    torch.set_num_threads(1)
+    # Ctrl-C is handled by the main process, which terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _map_shard(shard: range) -> Optional[List]:
+    state = _PROCESS_MAP_STATE
+    batch_size, writers = state["batch_size"], state["writers"]
+    if state["mmap"]:
+        # the memmap is shared with the main process, write the shard in place
+        for writer in writers.values():
+            writer.seek(shard.start * batch_size)
+
+    outputs = []
+    for i, batch in enumerate(
+        _shard_batches(
+            state["data"],
+            shard,
+            batch_size=batch_size,
+            drop_last_batch=state["drop_last_batch"],
+            materialize=state["materialize"],
+        )
+    ):
+        start = (shard.start + i) * batch_size
+        end = min(len(state["data"]), start + batch_size)
+        output = (
+            state["function"](batch, range(start, end), **state["kwargs"])
+            if state["with_indices"]
+            else state["function"](batch, **state["kwargs"])
+        )
+        if not state["mmap"]:
+            outputs.append(output)
+            continue
+
+        _write_output(writers, output)
+        flush_size = state["flush_size"]
+        if flush_size is not None and ((i + 1) % flush_size == 0):
+            for writer in writers.values():
+                writer.flush()
+
+    if state["mmap"]:
+        for writer in writers.values():
+            writer.file.flush()
+        return None
+    return outputs
@@ -109,7 +109,9 @@ def groupby(
         if isinstance(by, str):
             by = [by]
         return GroupBy(
-            data=data, indices=data[by].to_pandas().groupby(by).indices, by=by
+            data=data,
+            indices=data[by].to_pandas().groupby(by, observed=True).indices,
+            by=by,
         )
     except Exception as e:
         # future work needed here.
@@ -24,6 +24,21 @@ def merge(
     suffixes: Sequence[str] = ("_x", "_y"),
     validate=None,
 ):
+    from meerkat.lazy import LazyDataPanel
+
+    if isinstance(left, LazyDataPanel) or isinstance(right, LazyDataPanel):
+        left = left if isinstance(left, LazyDataPanel) else LazyDataPanel(left)
+        return left.merge(
+            right,
+            how=how,
+            on=on,
+            left_on=left_on,
+            right_on=right_on,
+            sort=sort,
+            suffixes=suffixes,
+            validate=validate,
+        )
+
     if how == "cross":
         raise ValueError("DataPanel does not support cross merges.")  # pragma: no cover
 
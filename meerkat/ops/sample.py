@@ -36,6 +36,33 @@ def sample(
         Union[DataPanel, AbstractColumn]: A random sample of rows from DataPanel or
             Column.
     """
+    from meerkat.lazy import LazyDataPanel
+
+    if isinstance(data, LazyDataPanel):
+        return data.sample(
+            n=n, frac=frac, replace=replace, weights=weights, random_state=random_state
+        )
+
+    sampled_indices = _sample_indices(
+        data=data,
+        n=n,
+        frac=frac,
+        replace=replace,
+        weights=weights,
+        random_state=random_state,
+    )
+    return data.lz[sampled_indices]
+
+
+def _sample_indices(
+    data: Union[DataPanel, AbstractColumn],
+    n: int = None,
+    frac: float = None,
+    replace: bool = False,
+    weights: Union[str, np.ndarray] = None,
+    random_state: Union[int, np.random.RandomState] = None,
+) -> np.ndarray:
+    """Compute the positions of the rows drawn by :func:`sample`."""
     import pandas.core.common as com
     from pandas.core.sample import process_sampling_size
     from pandas.core.sample import sample as _sample
@@ -52,11 +79,10 @@ def sample(
     if frac is not None:
         n = round(frac * len(data))
 
-    sampled_indices = _sample(
+    return _sample(
         obj_len=len(data),
         size=n,
         replace=replace,
         weights=weights,
         random_state=rs,
     )
-    return data.lz[sampled_indices]
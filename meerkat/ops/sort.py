@@ -26,6 +26,22 @@ def sort(
     Return:
         DataPanel: A sorted view of DataPanel.
     """
+    from meerkat.lazy import LazyDataPanel
+
+    if isinstance(data, LazyDataPanel):
+        return data.sort(by=by, ascending=ascending, kind=kind)
+
+    return data.lz[_sort_indices(data, by=by, ascending=ascending, kind=kind)]
+
+
+def _sort_indices(
+    data: DataPanel,
+    by: Union[str, List[str]],
+    ascending: Union[bool, List[bool]] = True,
+    kind: str = "quicksort",
+) -> np.ndarray:
+    """Compute the row order that would sort ``data`` by the columns in
+    ``by``."""
     by = [by] if isinstance(by, str) else by
 
     if len(by) > 1:  # Sort with multiple column
@@ -41,4 +57,4 @@ def sort(
     else:  # Sort with single column
         sorted_indices = data[by[0]].argsort(ascending=ascending, kind=kind)
 
-    return data.lz[sorted_indices]
+    return sorted_indices
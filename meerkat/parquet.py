@@ -0,0 +1,140 @@
+"""Reading and writing Parquet files one row group at a time, see
+:meth:`DataPanel.from_parquet` and :meth:`DataPanel.to_parquet`."""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Dict, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from meerkat.block.convert import column_to_arrow
+from meerkat.expr import Expr
+from meerkat.sharded import ColumnStats
+
+if TYPE_CHECKING:
+    from meerkat.datapanel import DataPanel
+
+logger = logging.getLogger(__name__)
+
+# the default number of rows of a row group written by `write_parquet`
+DEFAULT_ROW_GROUP_SIZE = 2**20
+
+
+def read_parquet(
+    path: str,
+    columns: Sequence[str] = None,
+    filter: Expr = None,
+    memory_map: bool = True,
+) -> pa.Table:
+    """Read the columns ``columns`` (and those referenced by ``filter``) of the
+    row groups of the Parquet file at ``path`` for which ``filter`` may be true,
+    according to the statistics of the row groups.
+
+    Each row group is read on its own and is a chunk of the returned table, the
+    rows for which ``filter`` is false are not removed.
+    """
+    parquet_file = pq.ParquetFile(path, memory_map=memory_map)
+    names = parquet_file.schema_arrow.names
+    if columns is not None or filter is not None:
+        needed = set(names if columns is None else columns)
+        if filter is not None:
+            needed.update(filter.columns)
+        missing = needed - set(names)
+        if missing:
+            raise KeyError(f"Parquet file {path} does not have columns {missing}")
+        names = [name for name in names if name in needed]
+
+    row_groups = list(range(parquet_file.num_row_groups))
+    if filter is not None:
+        metadata = parquet_file.metadata
+        row_groups = [
+            index
+            for index in row_groups
+            if filter._bounds(
+                _row_group_stats(metadata.row_group(index), parquet_file.schema_arrow),
+                metadata.row_group(index).num_rows,
+            )[0]
+        ]
+        logger.info(
+            f"Reading {len(row_groups)} of {parquet_file.num_row_groups} row groups "
+            f"of {path}."
+        )
+    if len(row_groups) == 0:
+        return parquet_file.schema_arrow.empty_table().select(names)
+    # `read_row_groups` would concatenate the row groups into a single chunk
+    return pa.concat_tables(
+        [parquet_file.read_row_group(index, columns=names) for index in row_groups]
+    )
+
+
+def write_parquet(
+    dp: DataPanel,
+    path: str,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    **kwargs,
+) -> None:
+    """Write ``dp`` to a Parquet file at ``path``, converting and writing one row
+    group of ``row_group_size`` rows at a time. Other keyword arguments (e.g.
+    ``compression``) are passed to ``pyarrow.parquet.ParquetWriter``."""
+    writer = None
+    try:
+        for start in range(0, max(len(dp), 1), row_group_size):
+            table = pa.table(
+                {
+                    name: _to_arrow(name, column[start : start + row_group_size])
+                    for name, column in dp.items()
+                }
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, **kwargs)
+            writer.write_table(table, row_group_size=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _to_arrow(name: str, column):
+    try:
+        return column_to_arrow(column)
+    except ValueError as e:
+        raise ValueError(f"Cannot write column `{name}` to Parquet. {e}")
+
+
+def _row_group_stats(
+    row_group: pq.RowGroupMetaData, schema: pa.Schema
+) -> Dict[str, ColumnStats]:
+    """The statistics of the top-level columns of scalars of a row group."""
+    stats = {}
+    for index in range(row_group.num_columns):
+        column = row_group.column(index)
+        name = column.path_in_schema
+        statistics = column.statistics
+        if (
+            name not in schema.names
+            or statistics is None
+            or not statistics.has_min_max
+            or not _has_scalar_stats(schema.field(name).type)
+        ):
+            continue
+        null_count = statistics.null_count if statistics.has_null_count else None
+        if pa.types.is_floating(schema.field(name).type):
+            # NaNs are not counted as nulls (nor as minimum or maximum), so the
+            # number of nulls is unknown and `!=` may be true for any row
+            null_count = None
+        stats[name] = ColumnStats(
+            min=statistics.min, max=statistics.max, null_count=null_count
+        )
+    return stats
+
+
+def _has_scalar_stats(type: pa.DataType) -> bool:
+    if pa.types.is_dictionary(type):
+        # e.g. categorical columns, the statistics are of the values
+        type = type.value_type
+    return (
+        pa.types.is_integer(type)
+        or pa.types.is_floating(type)
+        or pa.types.is_string(type)
+        or pa.types.is_large_string(type)
+    )
@@ -0,0 +1,390 @@
+"""A sharded on-disk format for DataPanels larger than memory.
+
+A sharded DataPanel is a directory of row groups, each a DataPanel of consecutive
+rows written with :meth:`DataPanel.write` (so each of its blocks holds the rows of
+the group only), and a manifest listing the row groups with the statistics of
+their columns (minimum, maximum and number of nulls):
+
+.. code-block:: text
+
+    path/
+        manifest.yaml
+        row_groups/
+            000000/
+            000001/
+            ...
+
+Row groups are written one at a time, so a DataPanel can be written from a
+generator of batches and appended to later:
+
+.. code-block:: python
+
+    with mk.ShardedWriter(path, row_group_size=2**20) as writer:
+        for batch in batches:
+            writer.write(batch)
+
+    dp = mk.read_sharded(path, columns=["id", "loss"], filter=mk.col("loss") > 5)
+
+Filters skip the row groups whose statistics show that no row matches, without
+reading them.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import torch
+import yaml
+
+from meerkat.columns.abstract import AbstractColumn
+from meerkat.columns.arrow_column import ArrowArrayColumn
+from meerkat.columns.numpy_column import NumpyArrayColumn
+from meerkat.columns.pandas_column import PandasSeriesColumn
+from meerkat.columns.tensor_column import TensorColumn
+from meerkat.datapanel import DataPanel
+from meerkat.expr import Expr
+from meerkat.ops.concat import concat
+from meerkat.tools.utils import MeerkatLoader
+from meerkat.writers.abstract import AbstractWriter
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.yaml"
+
+# the default number of rows of a row group
+DEFAULT_ROW_GROUP_SIZE = 2**20
+
+
+@dataclass
+class ColumnStats:
+    """The statistics of a column over the rows of a row group, ``min`` and
+    ``max`` are over the values that are not null."""
+
+    min: object
+    max: object
+    # the number of null (or NaN) values, None if unknown
+    null_count: Optional[int]
+
+
+@dataclass
+class RowGroup:
+    """A row group of a sharded DataPanel, stored in ``row_groups/<name>``."""
+
+    name: str
+    nrows: int
+    # column name => statistics, for the columns that have them
+    stats: Dict[str, ColumnStats] = field(default_factory=dict)
+
+
+@dataclass
+class Manifest:
+    """The columns and row groups of a sharded DataPanel."""
+
+    # column name => column type, in column order
+    columns: Dict[str, type] = field(default_factory=dict)
+    row_groups: List[RowGroup] = field(default_factory=list)
+
+    @property
+    def nrows(self) -> int:
+        return sum(row_group.nrows for row_group in self.row_groups)
+
+    def write(self, path: str):
+        meta = {
+            "columns": self.columns,
+            "row_groups": [asdict(row_group) for row_group in self.row_groups],
+        }
+        # readers never see a partially written manifest
+        tmp_path = os.path.join(path, f"{MANIFEST_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            yaml.dump(meta, f, sort_keys=False)
+        os.replace(tmp_path, os.path.join(path, MANIFEST_FILE))
+
+    @classmethod
+    def read(cls, path: str) -> Manifest:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            meta = yaml.load(f, Loader=MeerkatLoader)
+        return cls(
+            columns=meta["columns"],
+            row_groups=[
+                RowGroup(
+                    name=row_group["name"],
+                    nrows=row_group["nrows"],
+                    stats={
+                        name: ColumnStats(**stats)
+                        for name, stats in row_group["stats"].items()
+                    },
+                )
+                for row_group in meta["row_groups"]
+            ],
+        )
+
+
+def is_sharded(path: str) -> bool:
+    """Whether ``path`` holds a sharded DataPanel."""
+    return os.path.exists(os.path.join(path, MANIFEST_FILE))
+
+
+class ShardedWriter(AbstractWriter):
+    """Write a sharded DataPanel to ``path`` one batch of rows at a time.
+
+    Rows are buffered until they fill a row group of ``row_group_size`` rows,
+    which is then written along with the manifest. The rows left over are written
+    as a smaller row group by :meth:`flush` and :meth:`close`. If ``path`` already
+    holds a sharded DataPanel, rows are appended to it.
+
+    Args:
+        path (str): the directory to write to.
+        row_group_size (int): the number of rows of each row group.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        *args,
+        **kwargs,
+    ):
+        super(ShardedWriter, self).__init__(*args, **kwargs)
+        self.path = None
+        self.row_group_size = row_group_size
+        self.manifest: Optional[Manifest] = None
+        self._pending: List[DataPanel] = []
+        self._pending_rows = 0
+        if path is not None:
+            self.open(path)
+
+    def open(self, path: str) -> None:
+        os.makedirs(os.path.join(path, "row_groups"), exist_ok=True)
+        self.path = path
+        self.manifest = Manifest.read(path) if is_sharded(path) else Manifest()
+        self._pending, self._pending_rows = [], 0
+
+    def write(self, dp: DataPanel, **kwargs) -> None:
+        """Append the rows of ``dp``, which must have the columns of the rows
+        written before."""
+        columns = self.manifest.columns or (
+            self._pending[0].columns if self._pending else None
+        )
+        if columns is not None and list(dp.columns) != list(columns):
+            raise ValueError(
+                f"Cannot write a DataPanel with columns {list(dp.columns)} to a "
+                f"sharded DataPanel with columns {list(columns)}."
+            )
+        if len(dp) == 0:
+            return
+        self._pending.append(dp)
+        self._pending_rows += len(dp)
+        if self._pending_rows >= self.row_group_size:
+            dp = self._take_pending()
+            stop = len(dp) - len(dp) % self.row_group_size
+            for start in range(0, stop, self.row_group_size):
+                self._write_row_group(dp[start : start + self.row_group_size])
+            if stop < len(dp):
+                self._pending, self._pending_rows = [dp[stop:]], len(dp) - stop
+
+    def _take_pending(self) -> DataPanel:
+        pending = self._pending
+        self._pending, self._pending_rows = [], 0
+        if len(pending) == 1:
+            return pending[0]
+        # `concat` does not keep the order of the columns
+        return concat(pending)[list(pending[0].columns)]
+
+    def _write_row_group(self, dp: DataPanel):
+        name = f"{len(self.manifest.row_groups):06d}"
+        dp.write(os.path.join(self.path, "row_groups", name))
+        if not self.manifest.columns:
+            self.manifest.columns = {
+                column_name: type(col) for column_name, col in dp.items()
+            }
+        stats = {}
+        for column_name, column in dp.items():
+            column_stats = _compute_stats(column)
+            if column_stats is not None:
+                stats[column_name] = column_stats
+        self.manifest.row_groups.append(RowGroup(name=name, nrows=len(dp), stats=stats))
+        self.manifest.write(self.path)
+        logger.info(f"Wrote row group {name} with {len(dp)} rows to {self.path}.")
+
+    def flush(self) -> None:
+        """Write the buffered rows as a row group, even if it is not full."""
+        if self._pending_rows > 0:
+            self._write_row_group(self._take_pending())
+
+    def close(self) -> None:
+        self.flush()
+
+    def finalize(self) -> Manifest:
+        self.close()
+        return self.manifest
+
+    def __enter__(self) -> ShardedWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+
+def write_sharded(
+    path: str,
+    data: Union[DataPanel, Iterable[DataPanel]],
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> Manifest:
+    """Write a DataPanel, or the DataPanels yielded by a generator (e.g. batches of
+    an evaluation run), to ``path`` as a sharded DataPanel, see
+    :class:`ShardedWriter`. Rows are appended if ``path`` already holds one.
+
+    Return:
+        Manifest: the row groups written to ``path``.
+    """
+    if isinstance(data, DataPanel):
+        data = [data]
+    writer = ShardedWriter(path, row_group_size=row_group_size)
+    for dp in data:
+        writer.write(dp)
+    return writer.finalize()
+
+
+def iter_sharded(
+    path: str,
+    columns: Sequence[str] = None,
+    filter: Expr = None,
+    lazy: bool = False,
+) -> Iterator[DataPanel]:
+    """Iterate over the row groups of the sharded DataPanel at ``path``, reading
+    one at a time.
+
+    Args:
+        path (str): the directory of the sharded DataPanel.
+        columns (Sequence[str], optional): the columns to read, all if None.
+        filter (Expr, optional): a predicate built with :func:`meerkat.col`. Only
+            the rows for which it is true are yielded, and row groups whose
+            statistics show that it is false for all their rows are not read.
+        lazy (bool): whether to read the blocks of each row group on first access,
+            see :meth:`DataPanel.read`.
+    """
+    manifest = Manifest.read(path)
+    if columns is None:
+        columns = list(manifest.columns)
+    else:
+        columns = [name for name in manifest.columns if name in columns]
+    read_columns = columns
+    if filter is not None:
+        read_columns = [
+            name
+            for name in manifest.columns
+            if name in columns or name in filter.columns
+        ]
+
+    for row_group in manifest.row_groups:
+        may_be_true, may_be_false = True, False
+        if filter is not None:
+            may_be_true, may_be_false = filter._bounds(row_group.stats, row_group.nrows)
+            if not may_be_true:
+                continue
+        dp = DataPanel.read(
+            os.path.join(path, "row_groups", row_group.name),
+            columns=read_columns,
+            lazy=lazy,
+        )
+        if may_be_false:
+            dp = dp.filter(filter)
+            if len(dp) == 0:
+                continue
+        yield dp[columns] if read_columns != columns else dp
+
+
+def read_sharded(
+    path: str,
+    columns: Sequence[str] = None,
+    filter: Expr = None,
+) -> DataPanel:
+    """Read the rows of the sharded DataPanel at ``path`` into a single
+    DataPanel, see :func:`iter_sharded` for the arguments."""
+    dps = list(iter_sharded(path, columns=columns, filter=filter))
+    if len(dps) == 0:
+        manifest = Manifest.read(path)
+        if len(manifest.row_groups) == 0:
+            return DataPanel()
+        # no rows match, the columns are taken from the first row group
+        row_group_dir = os.path.join(path, "row_groups", manifest.row_groups[0].name)
+        return DataPanel.read(row_group_dir, columns=columns)[:0]
+    if len(dps) == 1:
+        return dps[0]
+    return concat(dps)[list(dps[0].columns)]
+
+
+def _compute_stats(column: AbstractColumn) -> Optional[ColumnStats]:
+    """Compute the statistics of a column of scalars, None for other columns."""
+    if isinstance(column, ArrowArrayColumn):
+        data = column.data
+        if not (
+            pa.types.is_integer(data.type)
+            or pa.types.is_floating(data.type)
+            or pa.types.is_string(data.type)
+            or pa.types.is_large_string(data.type)
+        ):
+            return None
+        min_max = pc.min_max(data)
+        null_count = data.null_count
+        if pa.types.is_floating(data.type):
+            null_count += pc.sum(pc.is_nan(data)).as_py() or 0
+        return _make_stats(min_max["min"].as_py(), min_max["max"].as_py(), null_count)
+
+    if isinstance(column, PandasSeriesColumn):
+        data = column.data
+        if isinstance(data.dtype, pd.CategoricalDtype):
+            codes = data.cat.codes.values
+            present = codes[codes >= 0]
+            values = data.cat.categories[np.unique(present)]
+            null_count = len(codes) - len(present)
+        else:
+            values = data.dropna()
+            null_count = len(data) - len(values)
+        if len(values) == 0:
+            return ColumnStats(min=None, max=None, null_count=null_count)
+        try:
+            return _make_stats(values.min(), values.max(), null_count)
+        except TypeError:
+            # e.g. a mix of strings and numbers
+            return None
+
+    if isinstance(column, (NumpyArrayColumn, TensorColumn)):
+        data = column.data
+        if torch.is_tensor(data):
+            data = data.cpu().numpy()
+        if data.ndim != 1 or data.dtype.kind not in "biuf":
+            return None
+        null_count = int(np.isnan(data).sum()) if data.dtype.kind == "f" else 0
+        if null_count == len(data):
+            return ColumnStats(min=None, max=None, null_count=null_count)
+        return _make_stats(np.nanmin(data), np.nanmax(data), null_count)
+
+    return None
+
+
+def _make_stats(lo: object, hi: object, null_count: int) -> Optional[ColumnStats]:
+    lo, hi = _to_python(lo), _to_python(hi)
+    if lo is None or hi is None:
+        return None
+    return ColumnStats(min=lo, max=hi, null_count=int(null_count))
+
+
+def _to_python(value: object) -> object:
+    """Convert a scalar to a Python value that can be written to the manifest,
+    None if it cannot."""
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (bool, int, float, str, datetime.datetime)):
+        return value
+    return None
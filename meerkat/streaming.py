@@ -0,0 +1,207 @@
+"""Reading CSV and JSON lines files into ``ArrowBlock`` s with pyarrow's
+multi-threaded parsers, and writing JSON lines files, one chunk at a time.
+
+The ``read_*`` functions parse a file in blocks of ``block_size`` bytes in
+parallel into a table with a chunk per block parsed, which
+:meth:`DataPanel.from_csv` and :meth:`DataPanel.from_jsonl` (with
+``backend="arrow"``) hold in a single ``ArrowBlock``. Unlike ``pandas``, no Python
+objects are created for strings or nested values, so the memory used is about the
+size of the arrow data.
+
+The ``iter_*`` functions yield a DataPanel per block, so that files larger than
+memory can be processed (or written to a sharded DataPanel) chunk by chunk:
+
+.. code-block:: python
+
+    mk.write_sharded(path, mk.iter_jsonl("outputs.jsonl"), row_group_size=2**20)
+"""
+from __future__ import annotations
+
+import io
+from typing import Iterator, Sequence
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+
+from meerkat.datapanel import DataPanel
+
+# the default number of bytes parsed at a time
+DEFAULT_BLOCK_SIZE = 2**24
+# the default number of rows written at a time by `write_jsonl`
+DEFAULT_CHUNK_SIZE = 2**16
+
+# the keyword arguments of `read_csv` passed to `pyarrow.csv.ReadOptions` and
+# `pyarrow.csv.ParseOptions`, the others are passed to `pyarrow.csv.ConvertOptions`
+_CSV_READ_OPTIONS = {
+    "skip_rows",
+    "skip_rows_after_names",
+    "column_names",
+    "autogenerate_column_names",
+    "encoding",
+}
+_CSV_PARSE_OPTIONS = {
+    "delimiter",
+    "quote_char",
+    "double_quote",
+    "escape_char",
+    "newlines_in_values",
+    "ignore_empty_lines",
+    "invalid_row_handler",
+}
+
+
+def read_csv(
+    path: str,
+    columns: Sequence[str] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_threads: bool = True,
+    **kwargs,
+) -> pa.Table:
+    """Read the CSV file at ``path``.
+
+    Args:
+        path (str): the path of the CSV file.
+        columns (Sequence[str], optional): the columns to read, all if None.
+        block_size (int): the number of bytes parsed at a time.
+        use_threads (bool): whether to parse blocks in parallel.
+        **kwargs: Keyword arguments for ``pyarrow.csv.ReadOptions`` (e.g.
+            ``skip_rows``), ``pyarrow.csv.ParseOptions`` (e.g. ``delimiter``) and
+            ``pyarrow.csv.ConvertOptions`` (e.g. ``column_types``).
+    """
+    return pa_csv.read_csv(
+        path, **_csv_options(columns, block_size, use_threads, kwargs)
+    )
+
+
+def iter_csv(
+    path: str,
+    columns: Sequence[str] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_threads: bool = True,
+    **kwargs,
+) -> Iterator[DataPanel]:
+    """Iterate over the CSV file at ``path``, yielding a DataPanel per block of
+    ``block_size`` bytes parsed. The types of the columns are inferred from the
+    first block, see :func:`read_csv` for the arguments."""
+    reader = pa_csv.open_csv(
+        path, **_csv_options(columns, block_size, use_threads, kwargs)
+    )
+    for batch in reader:
+        yield DataPanel.from_arrow(pa.Table.from_batches([batch]))
+
+
+def _csv_options(
+    columns: Sequence[str], block_size: int, use_threads: bool, kwargs: dict
+) -> dict:
+    read_kwargs = {
+        key: kwargs.pop(key) for key in list(kwargs) if key in _CSV_READ_OPTIONS
+    }
+    parse_kwargs = {
+        key: kwargs.pop(key) for key in list(kwargs) if key in _CSV_PARSE_OPTIONS
+    }
+    if columns is not None:
+        kwargs["include_columns"] = list(columns)
+    return dict(
+        read_options=pa_csv.ReadOptions(
+            block_size=block_size, use_threads=use_threads, **read_kwargs
+        ),
+        parse_options=pa_csv.ParseOptions(**parse_kwargs),
+        convert_options=pa_csv.ConvertOptions(**kwargs),
+    )
+
+
+def read_jsonl(
+    path: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_threads: bool = True,
+    schema: pa.Schema = None,
+) -> pa.Table:
+    """Read the JSON lines file at ``path``.
+
+    Args:
+        path (str): the path of the JSON lines file, one object per line.
+        block_size (int): the number of bytes parsed at a time, must be larger
+            than the longest line.
+        use_threads (bool): whether to parse blocks in parallel.
+        schema (pa.Schema, optional): the types of the columns, inferred if None.
+    """
+    return pa_json.read_json(
+        path,
+        read_options=pa_json.ReadOptions(
+            block_size=block_size, use_threads=use_threads
+        ),
+        parse_options=pa_json.ParseOptions(explicit_schema=schema),
+    )
+
+
+def iter_jsonl(
+    path: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_threads: bool = True,
+    schema: pa.Schema = None,
+) -> Iterator[DataPanel]:
+    """Iterate over the JSON lines file at ``path``, yielding a DataPanel per block
+    of about ``block_size`` bytes of lines, see :func:`read_jsonl` for the
+    arguments.
+
+    If ``schema`` is None, the fields are those of the first block, and their
+    types are inferred from the first block in which they are not all null. Until
+    then, the columns of a field have the ``null`` type, which ``mk.concat`` casts
+    to the type inferred later.
+    """
+    read_options = pa_json.ReadOptions(block_size=block_size, use_threads=use_threads)
+    with open(path, "rb") as f:
+        while True:
+            # a block ends at the end of a line
+            data = f.read(block_size) + f.readline()
+            if not data.strip():
+                return
+            if schema is None:
+                parse_options = pa_json.ParseOptions()
+            else:
+                # the types of the fields only null so far are inferred again
+                parse_options = pa_json.ParseOptions(
+                    explicit_schema=pa.schema(
+                        [field for field in schema if not pa.types.is_null(field.type)]
+                    ),
+                    unexpected_field_behavior="infer",
+                )
+            table = pa_json.read_json(
+                io.BytesIO(data), read_options=read_options, parse_options=parse_options
+            )
+            if schema is not None:
+                table = _conform(table, schema)
+            schema = table.schema
+            yield DataPanel.from_arrow(table)
+
+
+def _conform(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Order the columns of ``table`` as the fields of ``schema``, with null columns
+    for the fields missing from ``table``."""
+    unexpected = set(table.column_names) - set(schema.names)
+    if unexpected:
+        raise ValueError(f"Fields {unexpected} are not in the schema {schema}.")
+    return pa.table(
+        {
+            field.name: table[field.name]
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        }
+    )
+
+
+def write_jsonl(dp: DataPanel, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Write ``dp`` to a JSON lines file at ``path``, converting ``chunk_size`` rows
+    to ``pandas`` at a time."""
+    with open(path, "w") as f:
+        for start in range(0, len(dp), chunk_size):
+            text = (
+                dp[start : start + chunk_size]
+                .to_pandas()
+                .to_json(lines=True, orient="records")
+            )
+            # depending on the version of pandas, the last line may not end with a
+            # new line
+            f.write(text.rstrip("\n") + "\n")
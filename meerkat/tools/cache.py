@@ -0,0 +1,160 @@
+"""An on-disk cache for the results of ``map`` and ``update``."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from meerkat.columns.abstract import AbstractColumn
+    from meerkat.datapanel import DataPanel
+
+logger = logging.getLogger(__name__)
+
+_ENTRY_FILE = "entry.json"
+
+
+class ResultCache:
+    """Columns and DataPanels stored on disk under a key, typically a fingerprint
+    computed with :func:`meerkat.tools.fingerprint.fingerprint`.
+
+    Each entry is a directory in ``root_dir``. When the total size of the entries
+    exceeds ``max_size`` bytes, the least recently used entries are evicted.
+
+    Args:
+        root_dir (str): the directory holding the entries.
+        max_size (int): the maximum total size of the entries, in bytes.
+    """
+
+    def __init__(self, root_dir: str, max_size: int):
+        self.root_dir = root_dir
+        self.max_size = max_size
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root_dir, key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self._entry_dir(key), _ENTRY_FILE))
+
+    def get(self, key: str) -> Optional[Union[AbstractColumn, DataPanel]]:
+        """Return the entry stored under ``key``, or ``None`` if there is none."""
+        from meerkat.columns.abstract import AbstractColumn
+        from meerkat.datapanel import DataPanel
+
+        entry_dir = self._entry_dir(key)
+        entry_path = os.path.join(entry_dir, _ENTRY_FILE)
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        # the modification time of the entry file is the time of last use
+        os.utime(entry_path)
+        data_path = os.path.join(entry_dir, "data")
+        if entry["type"] == "datapanel":
+            return DataPanel.read(data_path)
+        return AbstractColumn.read(data_path)
+
+    def put(self, key: str, data: Union[AbstractColumn, DataPanel]) -> bool:
+        """Store ``data`` under ``key`` and evict the least recently used entries
+        if the cache is full.
+
+        Return:
+            bool: whether ``data`` was stored. Data that cannot be written or that is
+                larger than the cache is not stored.
+        """
+        from meerkat.datapanel import DataPanel
+
+        # write to a temporary directory first, so that concurrent readers never
+        # see a partial entry
+        tmp_dir = os.path.join(self.root_dir, f".tmp-{key}-{uuid.uuid4().hex}")
+        try:
+            data.write(os.path.join(tmp_dir, "data"))
+        except Exception as e:
+            logger.warning(f"Could not write {type(data).__name__} to the cache: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+        size = _dir_size(tmp_dir)
+        if size > self.max_size:
+            logger.warning(
+                f"Not caching {type(data).__name__} of size {size} bytes, the cache "
+                f"holds at most {self.max_size} bytes."
+            )
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+        entry = {
+            "type": "datapanel" if isinstance(data, DataPanel) else "column",
+            "size": size,
+        }
+        with open(os.path.join(tmp_dir, _ENTRY_FILE), "w") as f:
+            json.dump(entry, f)
+
+        entry_dir = self._entry_dir(key)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # another process stored the same key in the meantime
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.evict(keep=key)
+        return True
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """Return (time of last use, size, key) for each entry."""
+        if not os.path.isdir(self.root_dir):
+            return []
+        entries = []
+        for key in os.listdir(self.root_dir):
+            entry_path = os.path.join(self._entry_dir(key), _ENTRY_FILE)
+            try:
+                with open(entry_path) as f:
+                    size = json.load(f)["size"]
+                entries.append((os.path.getmtime(entry_path), size, key))
+            except (FileNotFoundError, NotADirectoryError, ValueError, KeyError):
+                # temporary directories and foreign files are not entries
+                continue
+        return entries
+
+    def size(self) -> int:
+        """The total size of the entries, in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, keep: str = None):
+        """Remove the least recently used entries until the cache holds at most
+        ``max_size`` bytes. The entry ``keep`` is never removed."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_size:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove all entries."""
+        for _, _, key in self._entries():
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+
+def get_cache() -> ResultCache:
+    """Return the cache configured in ``meerkat.config.cache``."""
+    from meerkat.config import config
+
+    return ResultCache(root_dir=config.cache.root_dir, max_size=config.cache.max_size)
+
+
+def _dir_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
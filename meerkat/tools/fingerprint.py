@@ -0,0 +1,195 @@
+"""Stable fingerprints of data and functions.
+
+Unlike ``hash``, fingerprints are the same across Python sessions: they are
+computed from the content of arrays, tensors, Series, arrow arrays, columns and
+DataPanels, and from the code, defaults, closure and referenced globals of
+functions. They are used as keys for cached results.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import pickle
+import types
+from typing import Set
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import torch
+
+# arrays are hashed in chunks of this many bytes, so that no copy of a full
+# (possibly memmapped) array is made
+CHUNK_SIZE = 2**24
+
+
+class _Hasher:
+    def __init__(self):
+        # a hash from the standard library, so that fingerprints (and the keys of
+        # cached results) are the same in every environment
+        self.hasher = hashlib.blake2b(digest_size=16)
+        # ids of the functions already hashed, to stop on recursive references
+        self._seen: Set[int] = set()
+
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+    def _tag(self, tag: str):
+        self.hasher.update(tag.encode())
+        self.hasher.update(b"\0")
+
+    def update(self, obj: object):
+        from meerkat.block.row_index import ArrayIndex, BitmapIndex, SliceIndex
+        from meerkat.columns.abstract import AbstractColumn
+        from meerkat.datapanel import DataPanel
+
+        if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+            self._tag(type(obj).__name__)
+            self.hasher.update(repr(obj).encode())
+        elif isinstance(obj, (list, tuple)):
+            self._tag(f"{type(obj).__name__}:{len(obj)}")
+            for item in obj:
+                self.update(item)
+        elif isinstance(obj, dict):
+            self._tag(f"dict:{len(obj)}")
+            for key in sorted(obj, key=repr):
+                self.update(key)
+                self.update(obj[key])
+        elif isinstance(obj, (range, slice)):
+            self._tag(type(obj).__name__)
+            self.update((obj.start, obj.stop, obj.step))
+        elif isinstance(obj, SliceIndex):
+            self._tag(f"SliceIndex:{obj.nrows}")
+            self.update(obj.range)
+        elif isinstance(obj, ArrayIndex):
+            self._tag(f"ArrayIndex:{obj.nrows}")
+            self.update(obj.array)
+        elif isinstance(obj, BitmapIndex):
+            self._tag("BitmapIndex")
+            self.update(obj.mask)
+        elif isinstance(obj, np.ndarray):
+            self._update_array(obj)
+        elif torch.is_tensor(obj):
+            self._tag(f"tensor:{obj.dtype}")
+            self._update_array(obj.detach().cpu().numpy())
+        elif isinstance(obj, (pd.Series, pd.DataFrame)):
+            self._tag(f"{type(obj).__name__}:{obj.shape}:{obj.dtypes}")
+            self._update_array(pd.util.hash_pandas_object(obj, index=False).values)
+        elif isinstance(obj, (pa.Array, pa.ChunkedArray, pa.Table)):
+            self._update_arrow(obj)
+        elif isinstance(obj, (DataPanel, AbstractColumn)):
+            # the fingerprints of blocks are stored, so they are only computed once
+            self._tag("fingerprint")
+            self.update(obj.fingerprint())
+        elif isinstance(obj, (np.generic, np.dtype, torch.dtype)):
+            self._tag(type(obj).__name__)
+            self.hasher.update(repr(obj).encode())
+        elif isinstance(obj, type) or inspect.isbuiltin(obj):
+            self._tag("qualname")
+            self.update((obj.__module__, obj.__qualname__))
+        elif isinstance(obj, types.ModuleType):
+            self._tag("module")
+            self.update(obj.__name__)
+        elif isinstance(obj, functools.partial):
+            self._tag("partial")
+            self.update((obj.func, obj.args, obj.keywords))
+        elif isinstance(obj, types.MethodType):
+            self._tag("method")
+            self.update(obj.__func__)
+            self.update(obj.__self__)
+        elif isinstance(obj, types.FunctionType):
+            self._update_function(obj)
+        elif isinstance(obj, types.CodeType):
+            self._update_code(obj)
+        else:
+            try:
+                data = pickle.dumps(obj, protocol=4)
+            except Exception as e:
+                raise TypeError(
+                    f"Cannot fingerprint object of type {type(obj).__name__}."
+                ) from e
+            self._tag(f"pickle:{type(obj).__qualname__}")
+            self.hasher.update(data)
+
+    def _update_array(self, array: np.ndarray):
+        self._tag(f"ndarray:{array.dtype.str}:{array.shape}")
+        if array.dtype == object:
+            for item in array.ravel():
+                self.update(item)
+            return
+        flat = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+        for start in range(0, len(flat), CHUNK_SIZE):
+            self.hasher.update(flat[start : start + CHUNK_SIZE])
+
+    def _update_arrow(self, data: object):
+        self._tag(f"arrow:{type(data).__name__}")
+        if not isinstance(data, pa.Table):
+            data = pa.table({"0": data})
+        # the IPC format only contains the sliced part of each buffer
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, data.schema) as writer:
+            writer.write_table(data)
+        self.hasher.update(sink.getvalue())
+
+    def _update_function(self, fn: types.FunctionType):
+        self._tag(f"function:{fn.__module__}.{fn.__qualname__}")
+        if id(fn) in self._seen:
+            return
+        self._seen.add(id(fn))
+        self._update_code(fn.__code__)
+        self.update(fn.__defaults__)
+        self.update(fn.__kwdefaults__)
+        self.update(
+            [cell.cell_contents for cell in fn.__closure__ or () if _has_contents(cell)]
+        )
+
+        # the globals referenced by the function (and by nested functions), in
+        # order of first appearance
+        names = dict.fromkeys(_global_names(fn.__code__))
+        self.update(
+            [(name, fn.__globals__[name]) for name in names if name in fn.__globals__]
+        )
+
+    def _update_code(self, code: types.CodeType):
+        self._tag("code")
+        self.hasher.update(code.co_code)
+        self.update(code.co_names)
+        self.update(code.co_varnames)
+        self.update(code.co_consts)
+
+
+def _has_contents(cell: types.CellType) -> bool:
+    try:
+        cell.cell_contents
+    except ValueError:
+        # an empty cell, e.g. a variable of the enclosing scope not yet assigned
+        return False
+    return True
+
+
+def _global_names(code: types.CodeType):
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _global_names(const)
+
+
+def fingerprint(*objects: object) -> str:
+    """Compute a fingerprint of ``objects`` that is stable across sessions.
+
+    Data (numpy arrays, tensors, pandas and arrow objects, columns and
+    DataPanels) is hashed by content, functions by their code, defaults, closure
+    and the globals they reference. Other objects are hashed by their pickled
+    representation.
+
+    Return:
+        str: a 32 character hex digest.
+
+    Raises:
+        TypeError: if one of the objects (or an object they reference) cannot be
+            fingerprinted.
+    """
+    hasher = _Hasher()
+    hasher.update(objects)
+    return hasher.hexdigest()
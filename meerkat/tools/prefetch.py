@@ -0,0 +1,83 @@
+import queue
+import threading
+from typing import Iterable, Iterator
+
+# sentinel put on the queue by the producer once the source is exhausted
+_DONE = object()
+
+
+class PrefetchIterator(Iterator):
+    """Iterate over ``source`` while a background thread loads up to ``size`` items
+    ahead, so that producing item N+1 overlaps with the consumption of item N.
+
+    Exceptions raised by ``source`` are re-raised by ``__next__`` in the consuming
+    thread. If the consumer stops early, call :meth:`close` (or let the iterator be
+    garbage collected) to stop the producer.
+
+    Args:
+        source (Iterable): the items to iterate over.
+        size (int): the maximum number of items loaded ahead of the consumer. With
+            ``size=0`` no thread is started and ``source`` is iterated directly.
+    """
+
+    def __init__(self, source: Iterable, size: int = 2):
+        self._source = iter(source)
+        self._thread = None
+        if size <= 0:
+            return
+
+        self._queue = queue.Queue(maxsize=size)
+        self._stop = threading.Event()
+        # the producer must not hold a reference to the iterator, so that an
+        # iterator abandoned by its consumer can be garbage collected (and closed)
+        self._thread = threading.Thread(
+            target=_produce, args=(self._source, self._queue, self._stop), daemon=True
+        )
+        self._thread.start()
+
+    def __next__(self):
+        if self._thread is None:
+            return next(self._source)
+
+        item, error = self._queue.get()
+        if error is not None:
+            self.close()
+            raise error
+        if item is _DONE:
+            self.close()
+            raise StopIteration
+        return item
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        # any remaining items are dropped
+        self._source = iter(())
+
+    def __del__(self):
+        self.close()
+
+
+def _put(q: queue.Queue, stop: threading.Event, item) -> bool:
+    # poll so that a blocked producer notices when the consumer closes
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(source: Iterator, q: queue.Queue, stop: threading.Event):
+    try:
+        for item in source:
+            if not _put(q, stop, (item, None)):
+                return
+    except BaseException as e:  # re-raised in the consuming thread
+        _put(q, stop, (None, e))
+        return
+    _put(q, stop, (_DONE, None))
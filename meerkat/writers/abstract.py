@@ -30,3 +30,12 @@ class AbstractWriter(abc.ABC):
     @abc.abstractmethod
     def finalize(self, *args, **kwargs) -> None:
         return NotImplemented
+
+    def checkpoint(self, path: str) -> dict:
+        """Persist the data written so far, using ``path`` for any files, and
+        return the state needed to :meth:`restore` the writer."""
+        raise NotImplementedError(f"{self} does not support checkpoints.")
+
+    def restore(self, path: str, state: dict) -> None:
+        """Open the writer in the state returned by :meth:`checkpoint`."""
+        raise NotImplementedError(f"{self} does not support checkpoints.")
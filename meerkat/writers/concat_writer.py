@@ -1,3 +1,6 @@
+import os
+import shutil
+
 from meerkat.columns.abstract import AbstractColumn
 from meerkat.writers.abstract import AbstractWriter
 
@@ -16,6 +19,9 @@ class ConcatWriter(AbstractWriter):
 
     def open(self) -> None:
         self.outputs = []
+        # outputs written to disk by `checkpoint`, in order
+        self.path = None
+        self.chunks = []
 
     def write(self, data, **kwargs) -> None:
         # convert to Meerkat column if not already
@@ -34,7 +40,29 @@ class ConcatWriter(AbstractWriter):
     def close(self, *args, **kwargs):
         pass
 
+    def checkpoint(self, path: str) -> dict:
+        # spill the outputs written since the last checkpoint to a new chunk
+        if self.outputs:
+            from meerkat.ops.concat import concat
+
+            chunk = f"chunk-{len(self.chunks):06d}"
+            # remove a partial chunk left by an interrupted checkpoint
+            shutil.rmtree(os.path.join(path, chunk), ignore_errors=True)
+            concat(self.outputs).write(os.path.join(path, chunk))
+            self.chunks.append(chunk)
+            self.outputs = []
+        self.path = path
+        return {"chunks": self.chunks}
+
+    def restore(self, path: str, state: dict) -> None:
+        self.outputs = []
+        self.path = path
+        self.chunks = list(state["chunks"])
+
     def finalize(self, *args, **kwargs) -> None:
         from meerkat.ops.concat import concat
 
-        return concat(self.outputs)
+        chunks = [
+            AbstractColumn.read(os.path.join(self.path, chunk)) for chunk in self.chunks
+        ]
+        return concat(chunks + self.outputs)
@@ -60,6 +60,11 @@ class NumpyMemmapWriter(AbstractWriter):
         self.file[self._pointer : self._pointer + len(arr)] = arr
         self._pointer += len(arr)
 
+    def seek(self, pointer: int) -> None:
+        """Move the position at which the next array is written to row
+        ``pointer``."""
+        self._pointer = pointer
+
     def flush(self):
         """Close the mmap file and reopen to release memory."""
         self.file.flush()
@@ -67,6 +72,17 @@ class NumpyMemmapWriter(AbstractWriter):
         # ‘r+’ Open existing file for reading and writing.
         self.file = open_memmap(self.file.filename, mode="r+")
 
+    def checkpoint(self, path: str) -> dict:
+        # the rows are written in place, the file only needs to be flushed
+        self.file.flush()
+        return {"path": str(self.path), "pointer": self._pointer}
+
+    def restore(self, path: str, state: dict) -> None:
+        self.file = open_memmap(state["path"], mode="r+")
+        self.path = state["path"]
+        self.shape = self.file.shape
+        self._pointer = state["pointer"]
+
     def finalize(self, *args, **kwargs) -> AbstractColumn:
         self.flush()
         data = self.file
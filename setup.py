@@ -39,6 +39,7 @@ REQUIRED = [
     "ujson",
     "torch>=1.7.0",
     "scikit-learn",
+    "scipy",
     "tqdm>=4.49.0",
     "datasets>=1.4.1",
     "PyYAML>=5.4.1",
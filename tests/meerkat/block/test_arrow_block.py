@@ -90,6 +90,37 @@ def test_consolidate_mismatched_signature():
         ArrowBlock.consolidate(block_refs)
 
 
+@pytest.mark.parametrize("sort", [True, False])
+def test_get_index_chunked(sort):
+    # a table with several record batches of different lengths
+    table = pa.concat_tables(
+        [
+            pa.Table.from_pydict(
+                {"a": np.arange(start, stop), "b": [str(i) for i in range(start, stop)]}
+            )
+            for start, stop in [(0, 7), (7, 10), (10, 25)]
+        ]
+    )
+    block = ArrowBlock(table)
+    block_ref = BlockRef(
+        block=block,
+        columns={
+            name: ArrowArrayColumn(BlockView(block=block, block_index=name))
+            for name in ["a", "b"]
+        },
+    )
+    index = np.random.default_rng(0).integers(0, 25, size=40)
+    if sort:
+        index = np.sort(index)
+
+    out = block._get(index, block_ref=block_ref)
+    assert out.block.data.equals(table.take(index))
+    assert out["a"].data.to_pylist() == list(index)
+
+    with pytest.raises(IndexError):
+        block._get(np.array([0, 25]), block_ref=block_ref)
+
+
 def test_io(tmpdir):
     block = ArrowBlock(pa.Table.from_pydict({"a": [1, 2, 3], "b": ["4", "5", "6"]}))
     block.write(tmpdir)
@@ -0,0 +1,98 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+import torch
+
+import meerkat as mk
+from meerkat.block.convert import (
+    arrow_to_numpy,
+    convert_column,
+    numpy_to_arrow,
+    numpy_to_tensor,
+)
+
+
+def test_arrow_to_numpy():
+    data = pa.array(np.arange(10, dtype=np.float32))
+    array = arrow_to_numpy(data)
+    assert not array.flags.writeable
+    assert array.ctypes.data == data.buffers()[1].address
+
+    # slices share the buffer too
+    array = arrow_to_numpy(data[2:5])
+    assert (array == np.arange(2, 5)).all()
+    assert array.ctypes.data == data.buffers()[1].address + 2 * 4
+
+    # copies are needed for several chunks, nulls and booleans
+    chunked = pa.chunked_array([pa.array([1, 2]), pa.array([3])])
+    assert (arrow_to_numpy(chunked) == np.array([1, 2, 3])).all()
+    assert np.isnan(arrow_to_numpy(pa.array([1, None]))[1])
+    assert arrow_to_numpy(pa.array([True, False])).dtype == bool
+
+
+@pytest.mark.parametrize("shape", [(4,), (4, 3), (4, 3, 2)])
+def test_numpy_arrow_roundtrip(shape):
+    array = np.arange(np.prod(shape)).reshape(shape)
+    data = numpy_to_arrow(array)
+    assert len(data) == 4
+
+    out = arrow_to_numpy(data)
+    assert out.shape == shape
+    assert (out == array).all()
+    assert np.shares_memory(out, array)
+
+    out = arrow_to_numpy(data[1:3])
+    assert (out == array[1:3]).all()
+    assert np.shares_memory(out, array)
+
+
+def test_numpy_to_tensor():
+    array = np.arange(10)
+    tensor = numpy_to_tensor(array)
+    assert np.shares_memory(tensor.numpy(), array)
+
+    # read-only arrays and negative strides are copied
+    array.flags.writeable = False
+    assert not np.shares_memory(numpy_to_tensor(array).numpy(), array)
+    array = np.arange(10)[::-1]
+    assert (numpy_to_tensor(array).numpy() == array).all()
+
+
+def test_to_tensor():
+    col = mk.NumpyArrayColumn(np.arange(10))
+    assert np.shares_memory(col.to_tensor().numpy(), col.data)
+
+    col = mk.PandasSeriesColumn(np.arange(10))
+    assert np.shares_memory(col.to_tensor().numpy(), col.data.values)
+
+    col = mk.ArrowArrayColumn(np.arange(10))
+    assert (col.to_tensor() == torch.arange(10)).all()
+
+
+@pytest.mark.parametrize(
+    "klass",
+    [mk.NumpyArrayColumn, mk.TensorColumn, mk.PandasSeriesColumn, mk.ArrowArrayColumn],
+)
+@pytest.mark.parametrize(
+    "other",
+    [mk.NumpyArrayColumn, mk.TensorColumn, mk.PandasSeriesColumn, mk.ArrowArrayColumn],
+)
+def test_convert_column(klass, other):
+    col = klass(np.arange(10, dtype=np.float64))
+    out = convert_column(col, other)
+    assert isinstance(out, other)
+    assert (out.to_numpy() == np.arange(10)).all()
+
+    # only arrow data handed to torch is copied, as it is read-only
+    if not (klass is mk.ArrowArrayColumn and other is mk.TensorColumn):
+        assert np.shares_memory(out.to_numpy(), col.to_numpy())
+
+
+def test_convert_column_in_datapanel():
+    dp = mk.DataPanel({"a": np.arange(10)})
+    dp["b"] = convert_column(dp["a"], mk.TensorColumn)
+    assert isinstance(dp["b"]._block, type(mk.TensorColumn(torch.arange(1))._block))
+    assert np.shares_memory(dp["b"].data.numpy(), dp["a"].data)
+
+    with pytest.raises(ValueError):
+        convert_column(mk.ListColumn([1, 2]), mk.TensorColumn)
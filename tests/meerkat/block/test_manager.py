@@ -1,12 +1,15 @@
 import os
+import threading
 from itertools import product
 
 import numpy as np
+import pandas as pd
 import pytest
 import torch
 
 import meerkat as mk
 from meerkat.block.manager import BlockManager
+from meerkat.block.row_index import RowIndex
 
 
 def test_consolidate_no_op():
@@ -97,6 +100,188 @@ def test_consolidate_preserves_order():
     assert list(mgr.keys()) == order
 
 
+def _gather(mgr: BlockManager, index):
+    return mgr.apply("_get", index=RowIndex.from_index(index, nrows=mgr.nrows))
+
+
+def test_auto_consolidate(monkeypatch):
+    monkeypatch.setattr(mk.config.engine, "auto_consolidate", True)
+    monkeypatch.setattr(mk.config.engine, "gather_overhead", 100)
+    monkeypatch.setattr(mk.config.engine, "gather_row_cost", 0)
+    mgr = BlockManager()
+    mgr.add_column(mk.NumpyArrayColumn(np.arange(100)), "a")
+    mgr.add_column(mk.NumpyArrayColumn(np.arange(100) * 2), "b")
+    mgr.add_column(mk.TensorColumn(torch.arange(100)), "c")
+    mgr.add_column(mk.NumpyArrayColumn(np.arange(100) * 3), "d")
+    order = list(mgr.keys())
+
+    # slices do not count towards consolidation
+    mgr.apply("_get", index=RowIndex.from_index(slice(0, 10), nrows=100))
+    assert len(mgr._block_refs) == 4
+
+    # merging "a", "b" and "d" copies 2400 bytes, each gather on the separate blocks
+    # costs 2 * 100 more than on a single block
+    for _ in range(11):
+        _gather(mgr, [1, 5, 7])
+    assert len(mgr._block_refs) == 4
+    out = _gather(mgr, [1, 5, 7])
+    assert len(mgr._block_refs) == 2
+    assert list(mgr.keys()) == order
+    assert (out["d"].data == np.array([3, 15, 21])).all()
+    assert (mgr["b"].data == np.arange(100) * 2).all()
+
+
+def test_auto_consolidate_max_bytes(monkeypatch):
+    monkeypatch.setattr(mk.config.engine, "auto_consolidate", True)
+    monkeypatch.setattr(mk.config.engine, "max_consolidation_bytes", 1000)
+    mgr = BlockManager()
+    mgr.add_column(mk.PandasSeriesColumn(np.arange(100)), "a")
+    mgr.add_column(mk.PandasSeriesColumn(np.arange(100, dtype=np.int8)), "b")
+    mgr.add_column(mk.PandasSeriesColumn(np.arange(100)), "c")
+
+    # only the smallest blocks are merged
+    _gather(mgr, [1, 2])
+    assert len(mgr._block_refs) == 2
+    assert mgr.get_block_ref("a").block is mgr.get_block_ref("b").block
+    assert mgr.get_block_ref("c").block is not mgr.get_block_ref("a").block
+
+
+def test_auto_consolidate_disabled():
+    # off by default
+    mgr = BlockManager()
+    mgr.add_column(mk.NumpyArrayColumn(np.arange(10)), "a")
+    mgr.add_column(mk.NumpyArrayColumn(np.arange(10)), "b")
+    _gather(mgr, [1, 2])
+    assert len(mgr._block_refs) == 2
+
+
+def test_auto_consolidate_held_column(monkeypatch):
+    monkeypatch.setattr(mk.config.engine, "auto_consolidate", True)
+    dp = mk.DataPanel({name: np.zeros(100) for name in "abc"})
+    col = dp["a"]
+    dp.lz[np.arange(0, 100, 3)]
+    assert len(dp.data._block_refs) == 1
+
+    # the columns held are pointed to the merged block
+    col[0] = 42
+    assert dp["a"][0] == 42
+    dp["a"][1] = 7
+    assert col[1] == 7
+
+    # blocks with views (or copies) are not merged
+    dp = mk.DataPanel({name: np.zeros(100) for name in "abc"})
+    view = dp[10:20]
+    dp.lz[np.arange(0, 100, 3)]
+    assert len(dp.data._block_refs) == 3
+    dp["a"][10] = 1
+    assert view["a"][0] == 1
+
+
+@pytest.mark.parametrize("module", [np, torch])
+def test_auto_layout(module, monkeypatch):
+    monkeypatch.setattr(mk.config.engine, "auto_layout", True)
+    dp = mk.DataPanel({name: module.arange(1000) for name in "abcd"})
+    dp.data.consolidate()
+    block = dp["a"]._block
+    assert not block.column_major
+    view = dp[10:20]
+
+    # reading full columns switches the block to column-major
+    for name in "abcd":
+        assert dp[name].sum() == 499500
+    assert block.column_major
+    # the data of each column is contiguous
+    data = dp["b"]._data
+    assert data.is_contiguous() if module is torch else data.flags.c_contiguous
+    # views and columns still share the data of the block
+    dp["c"][12] = -1
+    assert view["c"][2] == -1
+
+    # row gathers keep the layout
+    index = np.arange(0, 1000, 7)[::-1].copy()
+    gathered = dp[index]
+    assert gathered["a"]._block.column_major
+    assert (gathered["d"]._data == dp["d"]._data[index]).all()
+    assert dp[index].fingerprint() == gathered.fingerprint()
+
+    # and switch the block back to row-major once they dominate
+    for _ in range(100):
+        dp[index]
+    assert not block.column_major
+    assert (dp["a"][:5] == module.arange(5)).all()
+
+    # blocks whose data was handed out keep their layout
+    data = dp["a"].data
+    for name in "abcd":
+        dp[name].sum()
+    assert not block.column_major
+    data[0] = -1
+    assert dp["a"][0] == -1
+
+
+def test_auto_layout_disabled(monkeypatch):
+    dp = mk.DataPanel({name: np.arange(1000) for name in "ab"})
+    dp.data.consolidate()
+    for _ in range(10):
+        dp["a"].sum()
+    assert not dp["a"]._block.column_major
+
+    # blocks shared with a copy keep their layout
+    monkeypatch.setattr(mk.config.engine, "auto_layout", True)
+    copy = dp.copy()
+    for _ in range(10):
+        dp["a"].sum()
+    assert not dp["a"]._block.column_major
+    del copy
+
+
+def test_auto_layout_max_bytes(monkeypatch):
+    monkeypatch.setattr(mk.config.engine, "auto_layout", True)
+    monkeypatch.setattr(mk.config.engine, "max_layout_bytes", 1000)
+    dp = mk.DataPanel({name: np.arange(1000) for name in "ab"})
+    dp.data.consolidate()
+    for _ in range(10):
+        dp["a"].sum()
+    # the block holds 16000 bytes, copying it would use more than the cap
+    assert not dp["a"]._block.column_major
+
+
+def test_apply_threads(monkeypatch):
+    monkeypatch.setattr(mk.config.engine, "auto_consolidate", False)
+    monkeypatch.setattr(mk.config.engine, "parallel_min_rows", 0)
+    source = mk.DataPanel({"x": np.arange(100)})
+    dp = mk.DataPanel(
+        {
+            "a": np.arange(100),
+            "b": mk.NumpyArrayColumn(np.arange(100, dtype=float)),
+            "c": torch.arange(100),
+            "d": mk.PandasSeriesColumn([str(i) for i in range(100)]),
+            "e": mk.ArrowArrayColumn(np.arange(100)),
+            "f": mk.ListColumn(list(range(100))),
+            # indexes `source`, so its `_get` applies another BlockManager
+            "g": mk.LambdaColumn(source, fn=lambda row: row["x"] * 2),
+        }
+    )
+    index = RowIndex.from_index(np.arange(0, 100, 3), nrows=100)
+    serial = dp.data.apply("_get", index=index, materialize=True)
+
+    threads = set()
+    get = mk.ListColumn._get
+
+    def _get(self, *args, **kwargs):
+        threads.add(threading.current_thread().name)
+        return get(self, *args, **kwargs)
+
+    monkeypatch.setattr(mk.ListColumn, "_get", _get)
+    monkeypatch.setattr(mk.config.engine, "num_threads", 4)
+    threaded = dp.data.apply("_get", index=index, materialize=True)
+
+    assert list(threaded.keys()) == list(dp.columns)
+    for name in dp.columns:
+        assert threaded[name].is_equal(serial[name])
+    assert all(name.startswith("meerkat-apply") for name in threads)
+
+
 @pytest.mark.parametrize(
     "num_blocks, consolidated",
     product([1, 2, 3], [True, False]),
@@ -263,6 +448,164 @@ def test_len(num_blocks, consolidated):
     assert len(mgr) == num_blocks * 2
 
 
+def test_copy_on_write():
+    dp = mk.DataPanel(
+        {
+            "a": np.arange(10),
+            "b": torch.arange(10),
+            "c": mk.PandasSeriesColumn(np.arange(10)),
+        }
+    )
+    view = dp[2:6]
+    copy = dp.copy()
+    for name in ["a", "b", "c"]:
+        assert np.shares_memory(
+            np.asarray(dp[name]._data), np.asarray(copy[name]._data)
+        )
+
+    # writing to the DataPanel copies its data, views still share it
+    dp["a"][3] = -1
+    assert copy["a"][3] == 3
+    assert view["a"][1] == -1
+
+    # writing to a view copies the data of the DataPanel
+    copy = dp.copy()
+    view["b"][0] = -1
+    assert dp["b"][2] == -1
+    assert copy["b"][2] == 2
+
+    # writing to the copy leaves the DataPanel and its views untouched
+    copy = dp.copy()
+    copy["c"][2] = -1
+    assert dp["c"][2] == 2
+    assert view["c"][0] == 2
+
+    # copies of columns
+    copy = dp["a"].copy()
+    copy[0] = -1
+    assert dp["a"][0] == 0
+
+
+def test_copy_on_write_data():
+    dp = mk.DataPanel(
+        {
+            "a": np.arange(10),
+            "b": torch.arange(10),
+            "c": mk.PandasSeriesColumn(np.arange(10)),
+        }
+    )
+    view = dp[2:6]
+
+    # the numpy data handed out by `.data` is read-only while it is shared
+    copy = dp.copy()
+    with pytest.raises(ValueError):
+        copy["a"].data[2] = 7
+    assert copy["a"].to_tensor().numpy().flags.writeable
+    copy["a"].to_tensor()[0] = 100
+    assert dp["a"][0] == 0 and copy["a"][0] == 0
+
+    # in-place ufuncs and in-place methods copy the data
+    copy = dp.copy()
+    np.add(copy["a"], 1, out=copy["a"])
+    assert (dp["a"].data == np.arange(10)).all()
+    assert (copy["a"].data == np.arange(1, 11)).all()
+    copy = dp.copy()
+    copy["a"].fill(5)
+    copy["b"].fill_(5)
+    assert dp["a"][0] == 0 and dp["b"][0] == 0
+    assert view["a"][0] == 2 and view["b"][0] == 2
+
+    # once the data is no longer shared, `.data` can be written to
+    copy = dp.copy()
+    dp["a"][0] = 0
+    dp["a"].data[1] = -1
+    assert view["a"].data.flags.writeable
+    assert copy["a"][1] == 1
+
+    # copies of columns
+    col = dp["b"]
+    copy = col.copy()
+    copy[0] = -5
+    assert col[0] == 0
+
+
+def test_copy_on_write_read():
+    dp = mk.DataPanel({"a": np.arange(10), "b": np.arange(10)})
+    dp.data.consolidate()
+    copy = dp.copy()
+
+    # reading the data of a copy keeps it shared
+    assert copy["a"].data.sum() == 45
+    assert len(copy.filter(mk.col("a") > 5)) == 4
+    assert (copy["a"] + 1).sum() == 55
+    assert copy["a"].mean() == 4.5
+    assert copy["a"]._block._is_shared()
+    assert np.shares_memory(dp["a"]._data, copy["a"]._data)
+
+
+def test_memory_report():
+    dp = mk.DataPanel(
+        {
+            "a": np.arange(10, dtype=np.int64),
+            "b": np.arange(10, dtype=np.int64),
+            "c": mk.PandasSeriesColumn(np.arange(10, dtype=np.int64)),
+            "d": mk.ListColumn(["abc"] * 10),
+        }
+    )
+    dp.data.consolidate()
+    report = dp.memory_report()
+    assert list(report.columns.index) == ["a", "b", "c", "d"]
+    assert list(report.columns["nbytes"][:3]) == [80, 80, 80]
+    assert report.columns.loc["a", "block"] == report.columns.loc["b", "block"]
+    assert pd.isna(report.columns.loc["d", "block"])
+    assert len(report.blocks) == 2
+    assert report.blocks.loc[report.columns.loc["a", "block"], "columns"] == [
+        "a",
+        "b",
+    ]
+    assert report.resident_bytes == 240 + dp["d"].memory_usage()
+    assert report.mmap_bytes == 0
+    assert report.shared_bytes == 0
+    assert not report.columns["shared"].any()
+
+    # views and copies share the blocks of the DataPanel
+    view = dp[2:6]
+    report = dp.memory_report()
+    assert report.columns["shared"][:3].all()
+    assert report.shared_bytes == 240
+    view_report = view.memory_report()
+    assert view_report.shared_bytes == 4 * 8 * 3
+    del view
+
+    copy = dp.copy()
+    report, copy_report = dp.memory_report(), copy.memory_report()
+    assert report.shared_bytes == copy_report.shared_bytes == 240
+    assert set(report.blocks["buffer"]) == set(copy_report.blocks["buffer"])
+
+    # once written to, the copy no longer shares the block of `c`
+    copy["c"][0] = -1
+    report = dp.memory_report()
+    assert report.shared_bytes == 160
+    assert not report.columns.loc["c", "shared"]
+
+
+def test_memory_report_mmap(tmpdir):
+    path = os.path.join(tmpdir, "data.npy")
+    np.save(path, np.arange(10, dtype=np.int64))
+    dp = mk.DataPanel(
+        {"a": np.load(path, mmap_mode="r"), "b": np.arange(10, dtype=np.int64)}
+    )
+    report = dp.memory_report()
+    assert list(report.columns["mmap"]) == [True, False]
+    assert report.mmap_bytes == 80
+    assert report.resident_bytes == 80
+
+    # gathering rows of a memory-mapped column reads them into memory
+    report = dp[[0, 1]].memory_report()
+    assert report.mmap_bytes == 0
+    assert report.resident_bytes == 32
+
+
 def test_io(tmpdir):
     tmpdir = os.path.join(tmpdir, "test")
     mgr = BlockManager()
@@ -325,3 +668,141 @@ def test_io_no_overwrite(tmpdir):
         match=f"Cannot write `BlockManager`. {new_dir} is a directory.",
     ):
         mgr.write(new_dir)
+
+
+def _block_files(path: str) -> dict:
+    blocks_dir = os.path.join(path, "blocks")
+    return {
+        block_dir: os.stat(os.path.join(blocks_dir, block_dir, "data.npy")).st_ino
+        for block_dir in os.listdir(blocks_dir)
+    }
+
+
+@pytest.mark.parametrize("num_threads", [1, 4])
+def test_io_incremental(tmpdir, monkeypatch, num_threads):
+    monkeypatch.setattr(mk.config.engine, "num_threads", num_threads)
+    path = os.path.join(tmpdir, "test")
+    mgr = BlockManager()
+    mgr.add_column(mk.NumpyArrayColumn(np.random.rand(10, 4)), "emb")
+    mgr.add_column(mk.NumpyArrayColumn(np.arange(10)), "a")
+    mgr.write(path)
+    files = _block_files(path)
+    assert len(files) == 2
+
+    # blocks read from `path` are not written again
+    mgr = BlockManager.read(path)
+    mgr.add_column(mk.NumpyArrayColumn(np.random.rand(10)), "pred")
+    mgr.write(path)
+    new_files = _block_files(path)
+    assert len(new_files) == 3
+    assert files.items() <= new_files.items()
+    new_mgr = BlockManager.read(path)
+    for name in ["emb", "a", "pred"]:
+        assert mgr[name].is_equal(new_mgr[name])
+
+    # blocks written to are written again, the old block is removed
+    new_mgr["emb"][0] = 0
+    new_mgr.write(path)
+    files = _block_files(path)
+    assert len(files) == 3
+    assert len(files.items() & new_files.items()) == 2
+    assert (BlockManager.read(path)["emb"][0] == 0).all()
+
+    # blocks stored in another directory are hard-linked
+    other_path = os.path.join(tmpdir, "other")
+    new_mgr.write(other_path)
+    assert set(_block_files(other_path).values()) == set(files.values())
+
+
+@pytest.mark.parametrize("module", [np, torch])
+def test_io_incremental_inplace(tmpdir, module):
+    path = os.path.join(tmpdir, "test")
+    mk.DataPanel({"a": module.zeros(3), "b": module.zeros(3)}).write(path)
+
+    # writes to the data that do not go through the block are written
+    dp = mk.DataPanel.read(path)
+    data = dp["a"].data
+    dp.write(path)
+    data[0] = 5
+    if module is np:
+        np.add(dp["a"].data, 1, out=dp["a"].data)
+    else:
+        dp["a"].data.add_(1)
+    dp.write(path)
+    assert mk.DataPanel.read(path)["a"].data.tolist() == [6, 1, 1]
+
+    # blocks whose data is unchanged are still not written again
+    if module is np:
+        files = _block_files(os.path.join(path, "mgr"))
+        mk.DataPanel.read(path).write(path)
+        assert _block_files(os.path.join(path, "mgr")) == files
+
+
+def _make_io_mgr():
+    mgr = BlockManager()
+    mgr.add_column(mk.NumpyArrayColumn(np.arange(10)), "a")
+    mgr.add_column(mk.NumpyArrayColumn(np.random.rand(10, 4)), "emb")
+    mgr.add_column(mk.NumpyArrayColumn(np.random.rand(10, 2)), "emb2")
+    mgr.add_column(mk.TensorColumn(torch.arange(10)), "t")
+    mgr.add_column(mk.TensorColumn(torch.rand(10, 3)), "t2")
+    mgr.add_column(mk.PandasSeriesColumn(np.arange(10) * 2), "p")
+    mgr.add_column(mk.PandasSeriesColumn([str(i) for i in range(10)]), "p2")
+    mgr.add_column(mk.ArrowArrayColumn(list(range(10))), "r")
+    mgr.add_column(mk.ArrowArrayColumn([str(i) for i in range(10)]), "r2")
+    mgr.add_column(mk.ListColumn(list(range(10))), "l")
+    return mgr
+
+
+@pytest.mark.parametrize(
+    "columns", [["emb2"], ["a", "t2"], ["p2", "r", "l"], ["emb", "emb2"]]
+)
+def test_io_columns(tmpdir, columns):
+    path = os.path.join(tmpdir, "test")
+    mgr = _make_io_mgr()
+    mgr.write(path)
+
+    new_mgr = BlockManager.read(path, columns=columns)
+    assert list(new_mgr.keys()) == [name for name in mgr.keys() if name in columns]
+    for name in columns:
+        assert new_mgr[name].is_equal(mgr[name])
+
+    # only the data of the selected columns is read
+    for block_ref in new_mgr._block_refs.values():
+        indices = [col._block_index for col in block_ref.values()]
+        assert block_ref.block._covered_by(indices)
+
+
+def test_io_lazy(tmpdir):
+    path = os.path.join(tmpdir, "test")
+    mgr = _make_io_mgr()
+    mgr.write(path)
+
+    new_mgr = BlockManager.read(path, lazy=True)
+    assert new_mgr.nrows == 10
+    assert all(
+        new_mgr[name]._block._lazy is not None
+        for name in new_mgr.keys()
+        if new_mgr[name].is_blockable()
+    )
+
+    # only the block of the column accessed is read
+    assert new_mgr["a"].is_equal(mgr["a"])
+    assert new_mgr["a"]._block._lazy is None
+    assert new_mgr["emb"]._block._lazy is not None
+
+    # views of a lazy column are lazy as well
+    view = new_mgr["emb"].view()
+    assert view._block._lazy is not None
+    assert view.is_equal(mgr["emb"])
+    assert new_mgr["emb"]._block._lazy is None
+
+    for name in mgr.keys():
+        assert new_mgr[name].is_equal(mgr[name])
+
+    # a lazy manager can be written back to its directory
+    new_mgr = BlockManager.read(path, lazy=True)
+    new_mgr["a"][0] = 100
+    new_mgr.write(path)
+    new_mgr = BlockManager.read(path, columns=["a", "emb"], lazy=True)
+    assert new_mgr["a"][0] == 100
+    assert new_mgr["emb"].is_equal(mgr["emb"])
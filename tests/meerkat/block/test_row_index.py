@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+
+import meerkat as mk
+from meerkat.block.row_index import ArrayIndex, BitmapIndex, RowIndex, SliceIndex
+
+NROWS = 50
+
+
+def _indices(nrows: int = NROWS):
+    np.random.seed(0)
+    return [
+        slice(None),
+        slice(3, 40, 3),
+        slice(None, None, -2),
+        slice(-10, None),
+        range(5, 25),
+        [1, 4, -1],
+        np.random.randint(0, nrows, size=20),
+        np.random.rand(nrows) > 0.5,
+        np.random.rand(nrows) > 0.97,
+        torch.arange(0, nrows, 7),
+        pd.Series(np.arange(nrows) % 2 == 0),
+        mk.NumpyArrayColumn(np.arange(nrows) < 10),
+        np.zeros(0, dtype=int),
+    ]
+
+
+@pytest.mark.parametrize("index", _indices())
+def test_from_index(index):
+    expected = np.arange(NROWS)[
+        np.asarray(index.data if isinstance(index, mk.AbstractColumn) else index)
+        if not isinstance(index, (slice, range))
+        else index
+    ]
+    row_index = RowIndex.from_index(index, nrows=NROWS)
+    assert len(row_index) == len(expected)
+    assert (row_index.to_array() == expected).all()
+    assert (np.arange(NROWS)[row_index.to_indexer()] == expected).all()
+    assert list(row_index) == expected.tolist()
+
+
+def test_representation():
+    assert isinstance(RowIndex.from_index(slice(2, 10), NROWS), SliceIndex)
+    assert isinstance(RowIndex.from_index(range(2, 10), NROWS), SliceIndex)
+    assert isinstance(RowIndex.from_index(np.array([1, 2]), NROWS), ArrayIndex)
+    dense = np.arange(NROWS) % 2 == 0
+    assert isinstance(RowIndex.from_index(dense, NROWS), BitmapIndex)
+    sparse = np.arange(NROWS) == 3
+    assert isinstance(RowIndex.from_index(sparse, NROWS), ArrayIndex)
+
+
+@pytest.mark.parametrize("first", _indices())
+@pytest.mark.parametrize("second", [slice(1, None, 2), [0, -1], slice(None, 0, -1)])
+def test_compose(first, second):
+    row_index = RowIndex.from_index(first, nrows=NROWS)
+    if len(row_index) == 0:
+        return
+    expected = row_index.to_array()[second]
+    composed = row_index.compose(second)
+    assert composed.nrows == NROWS
+    assert (composed.to_array() == expected).all()
+
+
+def test_compose_slices_stays_slice():
+    composed = RowIndex.from_index(slice(10, 40), NROWS).compose(slice(None, None, -3))
+    assert isinstance(composed, SliceIndex)
+    assert composed.to_array().tolist() == list(range(39, 9, -3))
+    assert composed.to_indexer() == slice(39, 9, -3)
+
+
+def test_compose_bitmaps_stays_bitmap():
+    first = RowIndex.from_index(np.arange(NROWS) % 2 == 0, NROWS)
+    second = RowIndex.from_index(np.arange(len(first)) < 20, len(first))
+    composed = first.compose(second)
+    assert isinstance(composed, BitmapIndex)
+    assert composed.to_array().tolist() == list(range(0, 40, 2))
+
+
+def test_errors():
+    with pytest.raises(IndexError):
+        RowIndex.from_index(np.ones(NROWS + 1, dtype=bool), NROWS)
+    with pytest.raises(IndexError):
+        RowIndex.from_index(np.array([1.0, 2.0]), NROWS)
+    with pytest.raises(IndexError):
+        RowIndex.from_index(range(NROWS + 1), NROWS)
+    with pytest.raises(TypeError):
+        RowIndex.from_index(np.zeros((2, 2), dtype=int), NROWS)
+    with pytest.raises(IndexError):
+        RowIndex.from_index(RowIndex.from_index(slice(2), NROWS), NROWS + 1)
+
+
+@pytest.mark.parametrize("position", [NROWS, -NROWS - 1])
+def test_out_of_bounds(position: int):
+    with pytest.raises(IndexError):
+        RowIndex.from_index(np.array([0, position]), NROWS)
+    with pytest.raises(IndexError):
+        mk.DataPanel({"a": np.arange(NROWS)})[[position]]
+
+    # positions out of the rows of a selection do not select other rows
+    selection = RowIndex.from_index(slice(10, 20), NROWS)
+    with pytest.raises(IndexError):
+        selection.compose(np.array([10 if position > 0 else -11]))
+
+
+@pytest.mark.parametrize("index", _indices())
+def test_datapanel_get(index):
+    dp = mk.DataPanel(
+        {
+            "a": np.arange(NROWS),
+            "b": torch.arange(NROWS),
+            "c": mk.PandasSeriesColumn(np.arange(NROWS)),
+            "d": mk.ArrowArrayColumn(np.arange(NROWS)),
+            "e": mk.ListColumn(list(range(NROWS))),
+        }
+    )
+    expected = RowIndex.from_index(index, nrows=NROWS).to_array()
+    row_index = RowIndex.from_index(index, nrows=NROWS)
+    for out in [dp[index], dp[row_index]]:
+        for name in dp.columns:
+            assert _values(out[name]) == expected.tolist()
+    # columns accept a RowIndex directly
+    for name in dp.columns:
+        assert _values(dp[name][row_index]) == expected.tolist()
+
+
+def _values(column: mk.AbstractColumn):
+    return [x.as_py() if hasattr(x, "as_py") else int(x) for x in column]
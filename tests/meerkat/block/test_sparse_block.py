@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from meerkat import SparseColumn
+from meerkat.block.abstract import BlockView
+from meerkat.block.ref import BlockRef
+from meerkat.block.sparse_block import SparseBlock
+from meerkat.errors import ConsolidationError
+
+
+def _random(nrows: int = 100, ncols: int = 20, seed: int = 0):
+    return sp.random(
+        nrows, ncols, density=0.1, format="csr", dtype=np.float32, random_state=seed
+    )
+
+
+def test_signature_hash():
+    block1 = SparseBlock(_random(ncols=20))
+    block2 = SparseBlock(_random(ncols=30))
+    assert hash(block1.signature) == hash(block2.signature)
+
+    block2 = SparseBlock(_random(nrows=90))
+    assert hash(block1.signature) != hash(block2.signature)
+
+
+def test_consolidate():
+    data = [_random(ncols=10 * (i + 1), seed=i) for i in range(3)]
+    block_refs = [
+        BlockRef(
+            block=block,
+            columns={
+                str(i): SparseColumn(
+                    BlockView(block=block, block_index=slice(0, data[i].shape[1]))
+                )
+            },
+        )
+        for i, block in enumerate(SparseBlock(d) for d in data)
+    ]
+    block_ref = SparseBlock.consolidate(block_refs=block_refs)
+    assert block_ref.block.data.shape == (100, 60)
+    for i, d in enumerate(data):
+        assert (block_ref[str(i)].data != d).nnz == 0
+
+
+def test_consolidate_empty():
+    with pytest.raises(ConsolidationError):
+        SparseBlock.consolidate([])
+
+
+def test_get_slice_is_view():
+    data = _random(nrows=1000)
+    block = SparseBlock(data)
+    col = SparseColumn(block[slice(0, 20)])
+    block_ref = BlockRef(block=block, columns={"a": col})
+
+    out = block._get(slice(100, 200), block_ref=block_ref)
+    assert np.shares_memory(out.block.data.data, data.data)
+    assert (out["a"].data != data[100:200]).nnz == 0
+
+    index = np.array([5, 1, 500])
+    out = block._get(index, block_ref=block_ref)
+    assert (out["a"].data != data[index]).nnz == 0
+
+    out = block._get(3, block_ref=block_ref)
+    assert (out["a"] != data[3]).nnz == 0
+
+
+def test_io_mmap(tmpdir):
+    data = _random()
+    SparseBlock(data).write(str(tmpdir))
+    block = SparseBlock.read(str(tmpdir), mmap=True)
+    assert block.is_mmap
+    assert block.mmap_nbytes == block.nbytes
+    assert (block.data != data).nnz == 0
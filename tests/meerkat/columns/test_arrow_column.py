@@ -229,3 +229,13 @@ class TestArrowArrayColumn(TestAbstractColumn):
     def test_repr_pandas(self, testbed):
         series = testbed.col.to_pandas()
         assert isinstance(series, pd.Series)
+
+
+def test_concat_chunked():
+    cols = [
+        ArrowArrayColumn(pa.chunked_array([pa.array([1, 2]), pa.array([3])])),
+        ArrowArrayColumn(pa.array([4, 5])),
+    ]
+    out = ArrowArrayColumn.concat(cols)
+    assert isinstance(out, ArrowArrayColumn)
+    assert out.data.to_pylist() == [1, 2, 3, 4, 5]
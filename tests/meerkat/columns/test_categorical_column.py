@@ -0,0 +1,113 @@
+"""Unittests for CategoricalColumn."""
+import os
+
+import numpy as np
+import pandas as pd
+
+import meerkat as mk
+from meerkat import CategoricalColumn, PandasSeriesColumn
+from meerkat.block.dictionary_block import DictionaryBlock
+from meerkat.ops.groupby import groupby
+
+SPLITS = ["train", "valid", "test"]
+
+
+def _make_dp(length: int = 6000):
+    return mk.DataPanel(
+        {
+            "split": CategoricalColumn([SPLITS[i % 3] for i in range(length)]),
+            "x": np.arange(length),
+        }
+    )
+
+
+def test_from_data():
+    col = CategoricalColumn(["a", "b", "a"])
+    assert isinstance(col.data.dtype, pd.CategoricalDtype)
+    assert list(col.categories) == ["a", "b"]
+    assert list(col.codes) == [0, 1, 0]
+
+    col = mk.AbstractColumn.from_data(pd.Series(["a", "b"], dtype="category"))
+    assert isinstance(col, CategoricalColumn)
+
+
+def test_auto_encode(monkeypatch):
+    monkeypatch.setattr(mk.config.engine, "auto_categorical", True)
+    dp = mk.DataPanel({"split": [SPLITS[i % 3] for i in range(6000)]})
+    assert isinstance(dp["split"], CategoricalColumn)
+    assert isinstance(dp["split"]._block, DictionaryBlock)
+    # one byte per row for the codes
+    assert dp["split"].memory_usage() < 2 * len(dp)
+
+    # too few rows
+    dp = mk.DataPanel({"split": SPLITS * 4})
+    assert isinstance(dp["split"], PandasSeriesColumn)
+    assert not isinstance(dp["split"], CategoricalColumn)
+
+    # too many distinct values
+    dp = mk.DataPanel({"id": [str(i) for i in range(6000)]})
+    assert not isinstance(dp["id"], CategoricalColumn)
+
+
+def test_auto_encode_disabled():
+    # off by default
+    dp = mk.DataPanel({"split": [SPLITS[i % 3] for i in range(6000)]})
+    assert isinstance(dp["split"], PandasSeriesColumn)
+    assert not isinstance(dp["split"], CategoricalColumn)
+
+
+def test_gather():
+    dp = _make_dp()
+    out = dp[[1, 2, 3]]
+    assert isinstance(out["split"], CategoricalColumn)
+    assert out["split"].data.tolist() == ["valid", "test", "train"]
+    assert out["split"].categories is dp["split"].categories
+
+    out = dp[10:13]
+    assert out["split"].data.tolist() == ["valid", "test", "train"]
+
+
+def test_filter():
+    dp = _make_dp()
+    out = dp.filter(mk.col("split") == "train")
+    assert len(out) == len(dp) // 3
+    assert (out["x"] % 3 == 0).all()
+
+    out = dp.filter(mk.col("split").isin(["train", "test"]))
+    assert len(out) == 2 * len(dp) // 3
+
+
+def test_groupby():
+    dp = _make_dp()
+    out = groupby(dp, "split")["x"].mean()
+    means = dict(zip(out["split"].data, out["x"].data))
+    assert means == {
+        "train": dp["x"][0::3].mean(),
+        "valid": dp["x"][1::3].mean(),
+        "test": dp["x"][2::3].mean(),
+    }
+
+
+def test_set_new_category():
+    dp = _make_dp()
+    view = dp[:10]
+
+    view["split"][0] = "extra"
+    assert dp["split"][0] == "extra"
+    assert "extra" in dp["split"].categories
+
+    dp["split"][[4, 5]] = ["a", "train"]
+    assert view["split"][4:6].data.tolist() == ["a", "train"]
+
+    copy = dp["split"].copy()
+    copy[1] = "b"
+    assert copy[1] == "b"
+    assert dp["split"][1] == "valid"
+
+
+def test_io(tmpdir):
+    dp = _make_dp()
+    dp.write(os.path.join(tmpdir, "dp"))
+    out = mk.DataPanel.read(os.path.join(tmpdir, "dp"))
+    assert isinstance(out["split"], CategoricalColumn)
+    assert out["split"].is_equal(dp["split"])
@@ -0,0 +1,101 @@
+"""Unittests for RaggedArrayColumn."""
+import os
+
+import numpy as np
+import pytest
+import torch
+
+import meerkat as mk
+from meerkat import RaggedArrayColumn
+
+
+def _rows(nrows: int = 50, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 100, size=rng.integers(0, 10)) for _ in range(nrows)]
+
+
+def _assert_rows_equal(col, rows):
+    assert len(col) == len(rows)
+    for i, row in enumerate(rows):
+        assert np.array_equal(col[i], row)
+
+
+def test_from_data():
+    rows = _rows()
+    col = mk.AbstractColumn.from_data(rows)
+    assert isinstance(col, RaggedArrayColumn)
+    _assert_rows_equal(col, rows)
+    assert np.array_equal(col.lengths, [len(row) for row in rows])
+
+    # rows of the same length are stored in a numpy array
+    col = mk.AbstractColumn.from_data([np.zeros(3), np.ones(3)])
+    assert isinstance(col, mk.NumpyArrayColumn)
+
+
+def test_from_arrays():
+    col = RaggedArrayColumn.from_arrays(np.arange(6), [0, 1, 1, 6])
+    _assert_rows_equal(col, [np.array([0]), np.array([]), np.arange(1, 6)])
+
+
+def test_get():
+    rows = _rows()
+    col = RaggedArrayColumn(rows)
+
+    out = col[10:20]
+    assert isinstance(out, RaggedArrayColumn)
+    assert np.shares_memory(out.data.values, col.data.values)
+    _assert_rows_equal(out, rows[10:20])
+
+    index = np.array([5, 1, 7, -1])
+    _assert_rows_equal(col[index], [rows[i] for i in index])
+
+    mask = np.arange(50) % 3 == 0
+    _assert_rows_equal(col[mask], [row for row, m in zip(rows, mask) if m])
+
+    dp = mk.DataPanel({"tokens": col, "x": np.arange(50)})
+    _assert_rows_equal(dp[[3, 2]]["tokens"], [rows[3], rows[2]])
+
+
+def test_set():
+    rows = _rows()
+    col = RaggedArrayColumn(rows)
+    view = col[2:5]
+    col[3] = np.zeros(len(rows[3]))
+    assert (view[1] == 0).all()
+
+    with pytest.raises(ValueError):
+        col[3] = np.zeros(len(rows[3]) + 1)
+
+
+def test_concat():
+    rows = _rows()
+    col = RaggedArrayColumn(rows)
+    out = RaggedArrayColumn.concat([col[:20], col[20:]])
+    assert out.is_equal(col)
+
+
+def test_to_tensor():
+    rows = [np.arange(3), np.arange(1), np.arange(2)]
+    col = RaggedArrayColumn(rows)
+    expected = torch.tensor([[0, 1, 2], [0, -1, -1], [0, 1, -1]])
+    assert torch.equal(col.to_tensor(pad_value=-1), expected)
+    assert torch.equal(col[1:].to_tensor(pad_value=-1), expected[1:, :2])
+    assert torch.equal(col.collate(rows, pad_value=-1), expected)
+
+    col = RaggedArrayColumn([np.ones((2, 4)), np.ones((1, 4))])
+    assert col.to_tensor().shape == (2, 2, 4)
+
+
+def test_io(tmpdir):
+    rows = _rows()
+    dp = mk.DataPanel({"tokens": rows, "x": np.arange(50)})
+    dp.write(os.path.join(tmpdir, "dp"))
+
+    out = mk.DataPanel.read(os.path.join(tmpdir, "dp"), mmap=True)
+    assert isinstance(out["tokens"].data.values, np.memmap)
+    assert out["tokens"].is_equal(dp["tokens"])
+
+    # slices are written without the rows outside of them
+    dp[10:20]["tokens"].write(os.path.join(tmpdir, "col"))
+    out = RaggedArrayColumn.read(os.path.join(tmpdir, "col"))
+    _assert_rows_equal(out, rows[10:20])
@@ -0,0 +1,96 @@
+"""Unittests for SparseColumn."""
+import os
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import torch
+
+import meerkat as mk
+from meerkat import SparseColumn
+from meerkat.errors import ImmutableError
+
+
+def _random(nrows: int = 100, ncols: int = 2000, seed: int = 0):
+    return sp.random(
+        nrows, ncols, density=0.01, format="csr", dtype=np.float32, random_state=seed
+    )
+
+
+def test_from_data():
+    data = _random()
+    assert isinstance(mk.AbstractColumn.from_data(data), SparseColumn)
+    assert isinstance(
+        mk.AbstractColumn.from_data(torch.eye(3).to_sparse()), SparseColumn
+    )
+
+    col = SparseColumn(data.toarray())
+    assert col.shape == data.shape
+    assert col.nnz == data.nnz
+    assert len(col) == 100
+    assert col.memory_usage() < data.toarray().nbytes
+
+
+def test_get():
+    data = _random()
+    col = SparseColumn(data)
+    assert (col[3] != data[3]).nnz == 0
+
+    out = col[10:20]
+    assert isinstance(out, SparseColumn)
+    assert np.shares_memory(out.data.data, data.data)
+    assert (out.data != data[10:20]).nnz == 0
+
+    index = np.array([5, 1, 50])
+    assert (col[index].data != data[index]).nnz == 0
+    mask = np.arange(100) % 3 == 0
+    assert (col[mask].data != data[mask]).nnz == 0
+
+
+def test_set():
+    col = SparseColumn(_random())
+    with pytest.raises(ImmutableError):
+        col[0] = np.zeros(2000)
+
+
+def test_concat():
+    data = _random()
+    col = SparseColumn(data)
+    out = SparseColumn.concat([col[:30], col[30:]])
+    assert out.is_equal(col)
+
+
+def test_consolidate():
+    features, labels = _random(seed=0), _random(ncols=50, seed=1)
+    dp = mk.DataPanel({"features": features, "labels": labels})
+    dp.consolidate()
+    assert len(dp.data._block_refs) == 1
+    assert (dp["features"].data != features).nnz == 0
+    assert (dp["labels"].data != labels).nnz == 0
+    assert (dp[[3, 4]]["labels"].data != labels[[3, 4]]).nnz == 0
+
+
+def test_to_tensor():
+    data = _random()
+    col = SparseColumn(data)
+    tensor = col.to_tensor()
+    assert tensor.layout == torch.sparse_csr
+    assert torch.equal(tensor.to_dense(), torch.tensor(data.toarray()))
+
+    batch = col.collate([col[i] for i in range(4)])
+    assert batch.layout == torch.sparse_csr
+    assert torch.equal(batch.to_dense(), torch.tensor(data[:4].toarray()))
+
+
+def test_io(tmpdir):
+    data = _random()
+    dp = mk.DataPanel({"features": data, "x": np.arange(100)})
+    dp.write(os.path.join(tmpdir, "dp"))
+    out = mk.DataPanel.read(os.path.join(tmpdir, "dp"))
+    assert isinstance(out["features"], SparseColumn)
+    assert out["features"].is_equal(dp["features"])
+
+    dp["features"].write(os.path.join(tmpdir, "col"))
+    out = SparseColumn.read(os.path.join(tmpdir, "col"), mmap=True)
+    assert out._block.is_mmap
+    assert out.is_equal(dp["features"])
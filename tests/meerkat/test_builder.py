@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+
+import meerkat as mk
+from meerkat.builder import DataPanelBuilder
+
+
+def _rows(n: int = 10):
+    return [
+        {
+            "int": i,
+            "float": i / 2,
+            "bool": i % 2 == 0,
+            "float32": np.float32(i),
+            "str": str(i),
+            "array": np.ones(3) * i,
+            "tensor": torch.ones(2) * i,
+            "list": [i] * (i % 3),
+        }
+        for i in range(n)
+    ]
+
+
+def test_rows_types():
+    dp = mk.DataPanel(_rows())
+    assert dp.columns == [
+        "int",
+        "float",
+        "bool",
+        "float32",
+        "str",
+        "array",
+        "tensor",
+        "list",
+    ]
+    assert isinstance(dp["int"], mk.NumpyArrayColumn)
+    assert dp["int"].data.dtype == np.int64
+    assert dp["float"].data.dtype == np.float64
+    assert dp["bool"].data.dtype == bool
+    assert dp["float32"].data.dtype == np.float32
+    assert isinstance(dp["str"], mk.PandasSeriesColumn)
+    assert dp["array"].shape == (10, 3)
+    assert isinstance(dp["tensor"], mk.TensorColumn)
+    assert dp["tensor"].shape == (10, 2)
+    assert isinstance(dp["list"], mk.ListColumn)
+    assert (dp["int"].data == np.arange(10)).all()
+    assert list(dp["str"]) == [str(i) for i in range(10)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_chunks_and_fallback(chunk_size):
+    rows = [{"a": 1, "b": 1}, {"a": 2.5, "b": 2}, {"a": 3, "b": "x"}, {"a": 4}]
+    dp = DataPanelBuilder(chunk_size=chunk_size).add_rows(rows).build()
+    # ints are promoted to floats
+    assert dp["a"].data.dtype == np.float64
+    assert dp["a"].data.tolist() == [1, 2.5, 3, 4]
+    # a string after ints falls back to the column type `DataPanel` would pick
+    expected = mk.AbstractColumn.from_data([1, 2, "x", np.nan])
+    assert type(dp["b"]) is type(expected)
+    assert [str(x) for x in dp["b"]] == [str(x) for x in expected]
+
+
+def test_missing_and_new_columns():
+    rows = [{"a": 1}, {"a": 2, "b": 0.5}, {"b": 1.5, "a": 3}]
+    dp = DataPanelBuilder(chunk_size=1).add_rows(rows).build()
+    assert dp.columns == ["a", "b"]
+    assert dp["a"].data.tolist() == [1, 2, 3]
+    assert np.isnan(dp["b"].data[0])
+    assert dp["b"].data[1:].tolist() == [0.5, 1.5]
+
+
+def test_batches():
+    batches = [
+        {
+            "a": np.arange(3),
+            "b": [1.0, 2.0, 3.0],
+            "c": ["x", "y", "z"],
+            "d": torch.zeros(3, 2),
+            "e": mk.NumpyArrayColumn(np.ones((3, 4))),
+            "f": pd.Series([1, 2, 3]),
+        }
+    ] * 5
+    dp = mk.DataPanel.from_batches(batches)
+    assert len(dp) == 15
+    assert dp["a"].data.tolist() == [0, 1, 2] * 5
+    assert dp["b"].data.dtype == np.float64
+    assert isinstance(dp["c"], mk.PandasSeriesColumn)
+    assert isinstance(dp["d"], mk.TensorColumn) and dp["d"].shape == (15, 2)
+    assert dp["e"].shape == (15, 4)
+    assert dp["f"].data.tolist() == [1, 2, 3] * 5
+
+
+def test_batch_errors():
+    builder = DataPanelBuilder()
+    with pytest.raises(ValueError):
+        builder.add_batch({"a": [1, 2], "b": [1]})
+    builder.add_batch({"a": [1, 2]})
+    with pytest.raises(ValueError):
+        builder.add_batch({"b": [1, 2]})
+
+
+def test_grow():
+    builder = DataPanelBuilder(capacity=2)
+    for i in range(10):
+        builder.add_rows([{"a": i, "b": torch.tensor([i])}])
+    dp = builder.build()
+    assert len(builder) == 10
+    assert dp["a"].data.tolist() == list(range(10))
+    assert dp["b"].data.flatten().tolist() == list(range(10))
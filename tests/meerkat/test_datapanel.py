@@ -1,6 +1,7 @@
 """Unittests for Datasets."""
 import os
 import tempfile
+import threading
 from functools import wraps
 from itertools import product
 from typing import Dict, Sequence, Set
@@ -17,6 +18,7 @@ from meerkat import NumpyArrayColumn
 from meerkat.block.manager import BlockManager
 from meerkat.columns.abstract import AbstractColumn
 from meerkat.columns.arrow_column import ArrowArrayColumn
+from meerkat.columns.lambda_column import LambdaColumn
 from meerkat.columns.list_column import ListColumn
 from meerkat.columns.pandas_column import PandasSeriesColumn
 from meerkat.columns.tensor_column import TensorColumn
@@ -452,6 +454,15 @@ class TestDataPanel:
     )
     def test_map_return_multiple(
         self, testbed: DataPanelTestBed, batched: bool, materialize: bool
+    ):
+        self._test_map_return_multiple(testbed, batched, materialize)
+
+    def _test_map_return_multiple(
+        self,
+        testbed: DataPanelTestBed,
+        batched: bool,
+        materialize: bool,
+        executor: str = None,
     ):
         dp = testbed.dp
         map_specs = {
@@ -475,11 +486,21 @@ class TestDataPanel:
                 for key, map_spec in map_specs.items()
                 if "output_type" in map_spec
             },
+            executor=executor,
+            num_procs=2,
         )
         assert isinstance(result, DataPanel)
         for key, map_spec in map_specs.items():
             assert result[key].is_equal(map_spec["expected_result"])
 
+    @DataPanelTestBed.parametrize(params={"batched": [True, False]})
+    def test_map_return_multiple_process(
+        self, testbed: DataPanelTestBed, batched: bool
+    ):
+        self._test_map_return_multiple(
+            testbed=testbed, batched=batched, materialize=True, executor="process"
+        )
+
     @DataPanelTestBed.parametrize(
         column_configs={"img": {"testbed_class": ImageColumnTestBed, "n": 2}},
         params={"batched": [True, False], "materialize": [True, False]},
@@ -538,6 +559,153 @@ class TestDataPanel:
             testbed, batched=True, materialize=True, num_workers=2, use_kwargs=False
         )
 
+    def test_map_process_mmap(self, tmpdir):
+        dp = DataPanel({"a": np.arange(103), "b": torch.arange(103)})
+
+        def func(batch, indices):
+            return batch["a"].data * 2 + np.asarray(indices)
+
+        result = dp.map(
+            func,
+            with_indices=True,
+            is_batched_fn=True,
+            batch_size=10,
+            executor="process",
+            num_procs=3,
+            mmap=True,
+            mmap_path=os.path.join(tmpdir, "out.npy"),
+        )
+        assert isinstance(result, NumpyArrayColumn)
+        assert result.is_mmap
+        assert (result.data == np.arange(103) * 3).all()
+
+    @pytest.mark.parametrize("mmap", [False, True])
+    def test_map_process_no_fork(self, tmpdir, monkeypatch, mmap: bool):
+        # where processes cannot be forked, the shards are run in the main process
+        monkeypatch.setattr("meerkat.mixins.mapping._can_fork", lambda: False)
+        pids = set()
+
+        def func(batch):
+            pids.add(os.getpid())
+            return batch["a"].data * 2
+
+        dp = DataPanel({"a": np.arange(103)})
+        result = dp.map(
+            func,
+            is_batched_fn=True,
+            batch_size=10,
+            executor="process",
+            num_procs=3,
+            mmap=mmap,
+            mmap_path=os.path.join(tmpdir, "out.npy") if mmap else None,
+        )
+        assert (result.data == np.arange(103) * 2).all()
+        assert pids == {os.getpid()}
+
+    def test_map_process_errors(self):
+        dp = DataPanel({"a": np.arange(10)})
+
+        with pytest.raises(ValueError, match="Unknown executor"):
+            dp.map(lambda x: x, executor="thread")
+
+        def func(batch):
+            if batch["a"][0] > 5:
+                raise RuntimeError("bad batch")
+            return batch["a"]
+
+        with pytest.raises(RuntimeError, match="bad batch"):
+            dp.map(func, is_batched_fn=True, batch_size=2, executor="process")
+
+    @pytest.mark.parametrize("executor", [None, "process"])
+    @pytest.mark.parametrize("mmap", [False, True])
+    def test_map_checkpoint(self, tmpdir, executor: str, mmap: bool):
+        dp = DataPanel({"a": np.arange(100), "b": [str(i) for i in range(100)]})
+        checkpoint_dir = os.path.join(tmpdir, "checkpoint")
+        # the rows that fail, read from a file so that the function is the same
+        fail_path = os.path.join(tmpdir, "fail.json")
+        with open(fail_path, "w") as f:
+            json.dump([55, 100], f)
+
+        def func(batch, indices):
+            with open(fail_path) as f:
+                start, stop = json.load(f)
+            if start <= indices[0] < stop:
+                raise RuntimeError("preempted")
+            out = {"x": batch["a"].data * 2}
+            if not mmap:
+                out["y"] = batch["b"].data + "!"
+            return out
+
+        kwargs = dict(
+            with_indices=True,
+            is_batched_fn=True,
+            batch_size=5,
+            flush_size=3,
+            checkpoint_dir=checkpoint_dir,
+            executor=executor,
+            num_procs=2,
+            mmap=mmap,
+            mmap_path=os.path.join(tmpdir, "x.npy") if mmap else None,
+        )
+        with pytest.raises(RuntimeError, match="preempted"):
+            dp.map(func, **kwargs)
+        with open(os.path.join(checkpoint_dir, "checkpoint.json")) as f:
+            next_batch = json.load(f)["next_batch"]
+        assert 0 < next_batch <= 11
+
+        # the completed batches (except the first, used for setup) are not run
+        # again
+        with open(fail_path, "w") as f:
+            json.dump([5, next_batch * 5], f)
+        result = dp.map(func, **kwargs)
+        assert (result["x"].data == np.arange(100) * 2).all()
+        if not mmap:
+            assert (result["y"].data == dp["b"].data + "!").all()
+        assert not os.path.exists(os.path.join(checkpoint_dir, "checkpoint.json"))
+
+    def test_map_checkpoint_mismatch(self, tmpdir):
+        dp = DataPanel({"a": np.arange(10)})
+
+        def func(batch):
+            raise RuntimeError("preempted")
+
+        # the first batch is run to set up the writers, fail on the second one
+        with pytest.raises(RuntimeError):
+            dp.map(
+                lambda x: func(x) if x["a"][0] > 0 else x["a"],
+                is_batched_fn=True,
+                batch_size=2,
+                checkpoint_dir=tmpdir,
+            )
+        assert os.path.exists(os.path.join(tmpdir, "checkpoint.json"))
+
+        # the checkpoint of a map with a different batching or function is
+        # discarded
+        result = dp.map(
+            lambda x: x["a"] + 1,
+            is_batched_fn=True,
+            batch_size=3,
+            checkpoint_dir=tmpdir,
+        )
+        assert (result.data == np.arange(1, 11)).all()
+
+        with pytest.raises(RuntimeError):
+            dp.map(
+                lambda x: func(x) if x["a"][0] > 0 else x["a"],
+                is_batched_fn=True,
+                batch_size=2,
+                flush_size=1,
+                checkpoint_dir=tmpdir,
+            )
+        result = dp.map(
+            lambda x: x["a"] * 10,
+            is_batched_fn=True,
+            batch_size=2,
+            flush_size=1,
+            checkpoint_dir=tmpdir,
+        )
+        assert (result.data == np.arange(10) * 10).all()
+
     @DataPanelTestBed.parametrize(
         params={"batched": [True, False], "materialize": [True, False]}
     )
@@ -732,6 +900,56 @@ class TestDataPanel:
         else:
             assert (order == np.arange(len(dp))).all()
 
+    @pytest.mark.parametrize("shuffle", [True, False])
+    def test_batch_views(self, shuffle: bool):
+        dp = DataPanel(
+            {
+                "a": np.arange(16),
+                "b": torch.arange(16),
+                "c": PandasSeriesColumn(np.arange(16)),
+            }
+        )
+        for batch in dp.batch(batch_size=5, shuffle=shuffle):
+            # contiguous batches are views into the blocks, shuffled ones are copies
+            assert np.shares_memory(batch["a"].data, dp["a"].data) != shuffle
+            assert (
+                batch["b"].data.untyped_storage().data_ptr()
+                == dp["b"].data.untyped_storage().data_ptr()
+            ) != shuffle
+        # a subset of contiguous rows is batched as views too
+        batch = next(iter(dp.batch(batch_size=5, indices=range(3, 10))))
+        assert batch["a"].data.tolist() == [3, 4, 5, 6, 7]
+        assert np.shares_memory(batch["a"].data, dp["a"].data)
+
+    @pytest.mark.parametrize("prefetch", [0, 2])
+    def test_batch_cell_and_batch_columns(self, prefetch: int):
+        dp = DataPanel(
+            {
+                "a": np.arange(16),
+                "b": ListColumn(list(range(16))),
+                "c": LambdaColumn(NumpyArrayColumn(np.arange(16)), fn=lambda x: x * 2),
+            }
+        )
+        batches = list(dp.batch(batch_size=5, shuffle=True, prefetch=prefetch))
+        assert [len(batch) for batch in batches] == [5, 5, 5, 1]
+        for batch in batches:
+            # one sampler drives all column kinds, so the rows stay aligned
+            assert list(batch["b"]) == batch["a"].data.tolist()
+            assert (batch["c"].data == batch["a"].data * 2).all()
+
+    def test_batch_no_prefetch(self):
+        # by default, batches are loaded in the calling thread, also by `map`
+        threads = set()
+
+        def fn(x):
+            threads.add(threading.get_ident())
+            return x
+
+        dp = DataPanel({"a": LambdaColumn(NumpyArrayColumn(np.arange(16)), fn=fn)})
+        list(dp.batch(batch_size=5))
+        dp.map(lambda x: x["a"], is_batched_fn=True, batch_size=5)
+        assert threads == {threading.get_ident()}
+
     @DataPanelTestBed.parametrize()
     def test_tail(self, testbed):
         dp = testbed.dp
@@ -1024,6 +1242,32 @@ class TestDataPanel:
         dp = DataPanel(data)
         assert dp.shape == (16, 2)
 
+    def test_memory_usage(self):
+        length = 16
+        dp = DataPanel(
+            {
+                "a": np.arange(length, dtype=np.int64),
+                "b": torch.ones(length, 2, dtype=torch.float32),
+                "c": PandasSeriesColumn(["abc"] * length),
+                "d": ListColumn(["abc"] * length),
+            }
+        )
+        usage = dp.memory_usage()
+        assert list(usage.index) == ["a", "b", "c", "d"]
+        assert usage["a"] == 8 * length
+        assert usage["b"] == 8 * length
+        assert usage["c"] == 8 * length
+
+        # deep also counts the python objects referenced by the data
+        deep_usage = dp.memory_usage(deep=True)
+        assert deep_usage["a"] == usage["a"]
+        assert deep_usage["c"] > usage["c"]
+        assert deep_usage["d"] > usage["d"]
+
+        # lambda columns hold the data they are computed from
+        dp["e"] = dp["a"].to_lambda(lambda x: x + 1)
+        assert dp.memory_usage()["e"] == usage["a"]
+
     @DataPanelTestBed.parametrize()
     def test_streamlit(self, testbed):
         testbed.dp.streamlit()
@@ -0,0 +1,105 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+import torch
+
+import meerkat as mk
+from meerkat.expr import Expr
+
+
+def _make_dp(length: int = 100):
+    np.random.seed(123)
+    label = np.random.randint(0, 5, size=length)
+    conf = np.random.rand(length)
+    return mk.DataPanel(
+        {
+            "label": label,
+            "conf": torch.tensor(conf),
+            "name": mk.PandasSeriesColumn([f"n{i % 10}" for i in range(length)]),
+            "arrow": mk.ArrowArrayColumn(pa.array(label)),
+            "list": mk.ListColumn(list(label)),
+            "lambda": mk.LambdaColumn(mk.NumpyArrayColumn(label), fn=lambda x: x),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        (mk.col("label") == 3, lambda df: df["label"] == 3),
+        (mk.col("label") != 3, lambda df: df["label"] != 3),
+        (mk.col("conf") > 0.5, lambda df: df["conf"] > 0.5),
+        (mk.col("conf") <= 0.5, lambda df: df["conf"] <= 0.5),
+        (mk.col("name") == "n3", lambda df: df["name"] == "n3"),
+        (mk.col("arrow") >= 2, lambda df: df["label"] >= 2),
+        (mk.col("list") < 2, lambda df: df["label"] < 2),
+        (
+            (mk.col("label") == 3) & (mk.col("conf") > 0.5),
+            lambda df: (df["label"] == 3) & (df["conf"] > 0.5),
+        ),
+        (
+            (mk.col("arrow") == 3) | ~(mk.col("name") == "n1"),
+            lambda df: (df["label"] == 3) | ~(df["name"] == "n1"),
+        ),
+        (mk.col("label").isin([1, 2]), lambda df: df["label"].isin([1, 2])),
+        (mk.col("arrow").isin([1, 2]), lambda df: df["label"].isin([1, 2])),
+        (mk.col("conf").isin([0.5]), lambda df: df["conf"].isin([0.5])),
+        (mk.col("name").isin(["n1", "n2"]), lambda df: df["name"].isin(["n1", "n2"])),
+        (mk.col("label") > mk.col("arrow"), lambda df: df["label"] > df["label"]),
+    ],
+)
+def test_filter(expr, expected):
+    dp = _make_dp()
+    df = dp[["label", "conf", "name"]].to_pandas()
+    out = dp.filter(expr)
+    assert (out["label"].data == df["label"][expected(df)].values).all()
+    assert set(expr.columns) <= set(dp.columns)
+
+
+def test_nulls():
+    dp = mk.DataPanel(
+        {
+            "a": np.array([1.0, np.nan, 3.0]),
+            "b": mk.ArrowArrayColumn(pa.array([1, None, 3])),
+            "c": mk.PandasSeriesColumn(["x", None, "z"]),
+        }
+    )
+    for name in ["a", "b", "c"]:
+        assert len(dp.filter(mk.col(name).isnull())) == 1
+        assert len(dp.filter(mk.col(name).notnull())) == 2
+    # comparisons with nulls are false
+    assert len(dp.filter(mk.col("b") > 0)) == 2
+
+
+def test_lambda_not_materialized():
+    dp = _make_dp()
+    with pytest.raises(TypeError, match="LambdaColumn"):
+        dp.filter(mk.col("lambda") == 3)
+
+
+def test_errors():
+    dp = _make_dp()
+    with pytest.raises(KeyError):
+        dp.filter(mk.col("missing") == 3)
+    with pytest.raises(TypeError):
+        dp.filter(mk.col("label"))
+    with pytest.raises(TypeError):
+        (mk.col("label") == 3) and (mk.col("conf") > 0.5)
+
+
+def test_lazy_filter():
+    dp = _make_dp()
+    expr = (mk.col("label") == 3) & (mk.col("conf") > 0.5)
+    lazy = dp.lazy()[["name"]].filter(expr)
+    assert lazy.plan[-1].input_columns == ["label", "conf"]
+    out = lazy.collect()
+    assert out.columns == ["name"]
+    assert out["name"].is_equal(dp.filter(expr)["name"])
+
+
+def test_repr():
+    expr = (mk.col("a") == 3) & mk.col("b").isin([1]) | ~mk.col("c").isnull()
+    assert isinstance(expr, Expr)
+    assert repr(expr) == (
+        "(((col('a') == 3) & col('b').isin([1])) | ~col('c').isnull())"
+    )
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+
+import meerkat as mk
+from meerkat.block.numpy_block import NumpyBlock
+from meerkat.lazy import LazyDataPanel
+
+
+def _make_dp(length: int = 100):
+    np.random.seed(123)
+    return mk.DataPanel(
+        {
+            "a": np.arange(length),
+            "b": np.random.rand(length),
+            "c": mk.PandasSeriesColumn(np.arange(length) % 7),
+            "d": torch.arange(length) * 2,
+            "e": mk.ListColumn([str(i) for i in range(length)]),
+        }
+    )
+
+
+def _assert_dp_equal(dp1: mk.DataPanel, dp2: mk.DataPanel):
+    assert dp1.columns == dp2.columns
+    assert len(dp1) == len(dp2)
+    for name in dp1.columns:
+        assert dp1[name].is_equal(dp2[name])
+
+
+def test_nothing_runs_until_collect(monkeypatch):
+    dp = _make_dp()
+    calls = []
+    _get = NumpyBlock._get
+
+    def _counting_get(self, *args, **kwargs):
+        calls.append(self)
+        return _get(self, *args, **kwargs)
+
+    monkeypatch.setattr(NumpyBlock, "_get", _counting_get)
+
+    lazy = dp.lazy().lz[10:90].lz[::2].lz[np.arange(20)].lz[5:]
+    assert isinstance(lazy, LazyDataPanel)
+    assert len(calls) == 0
+
+    result = lazy.collect()
+    # two numpy blocks, each gathered exactly once for the fused selection
+    assert len(calls) == 2
+    _assert_dp_equal(result, dp.lz[10:90].lz[::2].lz[np.arange(20)].lz[5:])
+
+
+def test_fused_row_selections():
+    dp = _make_dp()
+    mask = np.arange(len(dp)) % 3 == 0
+    result = (
+        dp.lazy()[mask][np.array([1, 4, 6, 8, -1])][1:]
+        .lz[mk.NumpyArrayColumn([True, False, True, True])]
+        .collect()
+    )
+    expected = dp[mask][np.array([1, 4, 6, 8, -1])][1:][
+        mk.NumpyArrayColumn([True, False, True, True])
+    ]
+    _assert_dp_equal(result, expected)
+
+
+def test_projection_pushdown(monkeypatch):
+    dp = _make_dp()
+    gathered = []
+    _get = NumpyBlock._get
+
+    def _counting_get(self, index, block_ref, *args, **kwargs):
+        gathered.extend(block_ref.keys())
+        return _get(self, index, block_ref, *args, **kwargs)
+
+    monkeypatch.setattr(NumpyBlock, "_get", _counting_get)
+
+    result = dp.lazy().sort("b")[["a", "c"]].head(10).collect()
+    assert result.columns == ["a", "c"]
+    # "b" is read in place by the sort, only "a" is gathered from the numpy
+    # block at the end
+    assert gathered == ["a"]
+    _assert_dp_equal(result, dp.sort("b")[["a", "c"]].head(10))
+
+
+def test_filter_sort_sample():
+    dp = _make_dp()
+    result = (
+        dp.lazy()
+        .filter(lambda x: x["c"] > 2, input_columns=["c"])
+        .sort(by="b", ascending=False)
+        .sample(n=10, random_state=42)
+        .collect()
+    )
+    expected = (
+        dp.filter(lambda x: x["c"] > 2, input_columns=["c"])
+        .sort(by="b", ascending=False)
+        .sample(n=10, random_state=42)
+    )
+    _assert_dp_equal(result, expected)
+
+
+def test_ops_dispatch():
+    dp = _make_dp()
+    lazy = mk.sample(mk.sort(dp.lazy(), by="b"), frac=0.5, random_state=1)
+    assert isinstance(lazy, LazyDataPanel)
+    _assert_dp_equal(
+        lazy.collect(), mk.sample(mk.sort(dp, by="b"), frac=0.5, random_state=1)
+    )
+
+
+def test_merge():
+    dp = _make_dp()
+    right = mk.DataPanel(
+        {"a": np.arange(0, 100, 5), "f": np.arange(20) * 10},
+    )
+    lazy = mk.merge(dp.lazy()[::2], right, on="a").sort("f", ascending=False)
+    assert isinstance(lazy, LazyDataPanel)
+    expected = mk.merge(dp[::2], right, on="a").sort("f", ascending=False)
+    _assert_dp_equal(lazy.collect(), expected)
+    assert lazy.columns == expected.columns
+
+
+def test_consumers(tmpdir):
+    dp = _make_dp()
+    lazy = dp.lazy()[["a", "c"]].lz[np.arange(50)[::-1]].head(20)
+    expected = dp[["a", "c"]].lz[np.arange(50)[::-1]].head(20)
+
+    assert len(lazy) == 20
+    assert lazy.columns == ["a", "c"]
+    pd.testing.assert_frame_equal(lazy.to_pandas(), expected.to_pandas())
+
+    batches = list(lazy.batch(batch_size=8))
+    assert [len(batch) for batch in batches] == [8, 8, 4]
+    # concat does not preserve the column order
+    _assert_dp_equal(mk.concat(batches)[expected.columns], expected)
+
+    lazy.write(str(tmpdir / "lazy"))
+    _assert_dp_equal(mk.DataPanel.read(str(tmpdir / "lazy")), expected)
+
+    assert lazy["a"].is_equal(expected["a"])
+    assert lazy[3] == expected.lz[3]
+
+
+def test_empty_selection():
+    dp = _make_dp()
+    result = dp.lazy()[dp["a"] > 1000].sort("b").collect()
+    assert len(result) == 0
+    assert result.columns == dp.columns
+
+
+def test_bad_columns():
+    dp = _make_dp()
+    with pytest.raises(KeyError):
+        dp.lazy()[["a", "z"]].collect()
@@ -0,0 +1,116 @@
+"""Unittests for reading and writing Parquet files."""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+import torch
+
+import meerkat as mk
+from meerkat.parquet import read_parquet
+
+
+def _make_dp(length: int = 100):
+    loss = np.arange(length) / 10
+    loss[::7] = np.nan
+    return mk.DataPanel(
+        {
+            "id": np.arange(length),
+            "loss": loss,
+            "split": mk.CategoricalColumn(["train", "test"] * (length // 2)),
+            "name": mk.PandasSeriesColumn([f"n{i:03d}" for i in range(length)]),
+            "emb": np.random.default_rng(0).random((length, 3)),
+            "t": torch.arange(length),
+            "arrow": mk.ArrowArrayColumn([str(i) for i in range(length)]),
+            "list": mk.ListColumn([[i] * (i % 3) for i in range(length)]),
+        }
+    )
+
+
+@pytest.fixture
+def path(tmpdir):
+    path = os.path.join(tmpdir, "dp.parquet")
+    _make_dp().to_parquet(path, row_group_size=10)
+    return path
+
+
+def test_write_read(path):
+    dp = _make_dp()
+    assert pq.ParquetFile(path).num_row_groups == 10
+
+    out = mk.DataPanel.from_parquet(path)
+    assert out.columns == dp.columns
+    assert all(isinstance(out[name], mk.ArrowArrayColumn) for name in out.columns)
+    # a single block, with a chunk per row group
+    assert len(out.data._block_refs) == 1
+    assert out["id"].data.num_chunks == 10
+
+    assert (out["id"].to_numpy() == dp["id"].data).all()
+    assert np.allclose(out["loss"].to_numpy(), dp["loss"].data, equal_nan=True)
+    assert (out["split"].to_pandas() == dp["split"].data).all()
+    assert (out["name"].to_numpy() == dp["name"].data.values).all()
+    assert np.allclose(out["emb"].to_numpy(), dp["emb"].data)
+    assert (out["t"].to_numpy() == dp["t"].data.numpy()).all()
+    assert out["arrow"].data.to_pylist() == dp["arrow"].data.to_pylist()
+    assert out["list"].data.to_pylist() == dp["list"].data
+
+
+def test_columns(path):
+    out = mk.DataPanel.from_parquet(path, columns=["name", "id"])
+    assert out.columns == ["id", "name"]
+    assert read_parquet(path, columns=["name"]).column_names == ["name"]
+
+    with pytest.raises(KeyError):
+        mk.DataPanel.from_parquet(path, columns=["missing"])
+
+
+@pytest.mark.parametrize(
+    "expr,ngroups",
+    [
+        (mk.col("id") >= 85, 2),
+        ((mk.col("id") >= 15) & (mk.col("id") < 25), 2),
+        (mk.col("name") < "n010", 1),
+        (mk.col("id").isin([3, 99]), 2),
+        (mk.col("id") > 1000, 0),
+        (mk.col("loss") > 8.95, 1),
+        # NaNs are not counted in the statistics of Parquet files
+        (mk.col("loss").isnull(), 10),
+        (~(mk.col("loss") < 100), 10),
+        (mk.col("split") == "train", 10),
+    ],
+)
+def test_filter(path, expr, ngroups):
+    table = read_parquet(path, columns=["id"], filter=expr)
+    assert table.num_rows == 10 * ngroups
+    assert table.column_names == ["id"] + [
+        name for name in ["loss", "split", "name"] if name in expr.columns
+    ]
+
+    out = mk.DataPanel.from_parquet(path, columns=["id"], filter=expr)
+    assert out.columns == ["id"]
+    expected = _make_dp().filter(expr)
+    assert (out["id"].to_numpy() == expected["id"].data).all()
+
+
+@pytest.mark.parametrize("expr", [mk.col("x") != 5, ~(mk.col("x") == 5)])
+def test_filter_nan(tmpdir, expr):
+    path = os.path.join(tmpdir, "dp.parquet")
+    dp = mk.DataPanel({"x": np.array([np.nan, 5, 5, 5])})
+    dp.to_parquet(path, row_group_size=2)
+    out = mk.DataPanel.from_parquet(path, filter=expr)
+    assert len(out) == 1 and np.isnan(out["x"].to_numpy()[0])
+
+
+def test_write_unsupported(tmpdir):
+    dp = mk.DataPanel({"mixed": mk.ListColumn([1, "a", None])})
+    with pytest.raises(ValueError, match="mixed"):
+        dp.to_parquet(os.path.join(tmpdir, "dp.parquet"))
+
+
+def test_write_empty(tmpdir):
+    path = os.path.join(tmpdir, "dp.parquet")
+    mk.DataPanel({"a": np.arange(0), "b": pd.Series([], dtype=str)}).to_parquet(path)
+    out = mk.DataPanel.from_parquet(path)
+    assert out.columns == ["a", "b"]
+    assert len(out) == 0
@@ -0,0 +1,160 @@
+"""Unittests for the sharded DataPanel format."""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+import torch
+
+import meerkat as mk
+from meerkat.sharded import Manifest, _compute_stats
+
+
+def _make_batches(nbatches: int = 5, length: int = 30):
+    for i in range(nbatches):
+        ids = np.arange(i * length, (i + 1) * length)
+        loss = ids / 10
+        loss[::7] = np.nan
+        yield mk.DataPanel(
+            {
+                "id": ids,
+                "loss": loss,
+                "split": mk.PandasSeriesColumn(["train" if i < 3 else "test"] * length),
+                "name": mk.ArrowArrayColumn([f"n{j:03d}" for j in ids]),
+                "emb": np.random.rand(length, 4),
+                "t": torch.tensor(ids),
+            }
+        )
+
+
+def _read_paths(monkeypatch):
+    paths = []
+    read = mk.DataPanel.read.__func__
+
+    def _read(cls, path, *args, **kwargs):
+        paths.append(path)
+        return read(cls, path, *args, **kwargs)
+
+    monkeypatch.setattr(mk.DataPanel, "read", classmethod(_read))
+    return paths
+
+
+def test_write_read(tmpdir):
+    path = os.path.join(tmpdir, "sharded")
+    dps = list(_make_batches())
+    manifest = mk.write_sharded(path, iter(dps), row_group_size=40)
+    assert [row_group.nrows for row_group in manifest.row_groups] == [40] * 3 + [30]
+    assert list(manifest.columns) == list(dps[0].columns)
+
+    dp = mk.read_sharded(path)
+    expected = mk.concat(dps)
+    assert dp.columns == dps[0].columns
+    for name in dp.columns:
+        assert dp[name].is_equal(expected[name])
+
+    # `DataPanel.read` reads sharded DataPanels as well
+    dp = mk.DataPanel.read(path, columns=["t", "id"])
+    assert dp.columns == ["id", "t"]
+    assert (dp["id"] == np.arange(150)).all()
+
+
+def test_append(tmpdir):
+    path = os.path.join(tmpdir, "sharded")
+    batches = _make_batches(nbatches=4)
+    with mk.ShardedWriter(path, row_group_size=50) as writer:
+        writer.write(next(batches))
+        writer.write(next(batches))
+        assert len(Manifest.read(path).row_groups) == 1
+
+    with mk.ShardedWriter(path, row_group_size=50) as writer:
+        for dp in batches:
+            writer.write(dp)
+    manifest = Manifest.read(path)
+    assert [row_group.nrows for row_group in manifest.row_groups] == [50, 10, 50, 10]
+    assert (mk.read_sharded(path)["id"] == np.arange(120)).all()
+
+    with pytest.raises(ValueError):
+        mk.ShardedWriter(path).write(mk.DataPanel({"id": np.arange(3)}))
+
+
+def test_stats(tmpdir):
+    path = os.path.join(tmpdir, "sharded")
+    manifest = mk.write_sharded(path, _make_batches(), row_group_size=30)
+    stats = manifest.row_groups[1].stats
+    assert (stats["id"].min, stats["id"].max, stats["id"].null_count) == (30, 59, 0)
+    assert stats["loss"].null_count == len(range(0, 30, 7))
+    assert stats["loss"].max == 5.9
+    assert (stats["name"].min, stats["name"].max) == ("n030", "n059")
+    assert stats["split"].min == stats["split"].max == "train"
+    assert stats["t"].max == 59
+    # no statistics for columns of arrays
+    assert "emb" not in stats
+
+    # the statistics are read back from the manifest
+    assert Manifest.read(path).row_groups[1].stats == stats
+
+    col = mk.CategoricalColumn(pd.Series(["b", None, "a"]))
+    assert _compute_stats(col) == mk.sharded.ColumnStats("a", "b", 1)
+    col = mk.ArrowArrayColumn(pa.array([None, 1.5, float("nan")]))
+    assert _compute_stats(col) == mk.sharded.ColumnStats(1.5, 1.5, 2)
+
+
+@pytest.mark.parametrize(
+    "expr,nread",
+    [
+        (mk.col("id") >= 120, 1),
+        (mk.col("id") < 30, 1),
+        ((mk.col("id") >= 40) & (mk.col("id") <= 70), 2),
+        ((mk.col("id") < 10) | (mk.col("id") > 140), 2),
+        (mk.col("split") == "test", 2),
+        (mk.col("split").isin(["valid", "test"]), 2),
+        (~(mk.col("split") == "train"), 2),
+        (mk.col("name") > "n100", 2),
+        # the first row group is read for the columns of the empty result
+        (mk.col("loss") > 100, 1),
+        (mk.col("loss").isnull(), 5),
+        (mk.col("id") == mk.col("t"), 5),
+    ],
+)
+def test_filter(tmpdir, monkeypatch, expr, nread):
+    path = os.path.join(tmpdir, "sharded")
+    dps = list(_make_batches())
+    mk.write_sharded(path, iter(dps), row_group_size=30)
+    expected = mk.concat(dps).filter(expr)
+
+    paths = _read_paths(monkeypatch)
+    dp = mk.read_sharded(path, columns=["id"], filter=expr)
+    assert len(paths) == nread
+    assert dp.columns == ["id"]
+    assert (dp["id"] == expected["id"]).all()
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        (mk.col("x") != 5, [0, 1, 4]),
+        (~(mk.col("x") == 5), [0, 1, 4]),
+        (mk.col("x") == 5, [2, 3, 5]),
+        (mk.col("x") > 4, [2, 3, 5]),
+    ],
+)
+def test_filter_nan(tmpdir, expr, expected):
+    path = os.path.join(tmpdir, "sharded")
+    dp = mk.DataPanel({"x": np.array([np.nan, np.nan, 5, 5, np.nan, 5])})
+    mk.write_sharded(path, [dp], row_group_size=2)
+    assert np.flatnonzero(expr.evaluate(dp)).tolist() == expected
+    out = mk.read_sharded(path, filter=expr)
+    assert np.array_equal(out["x"].data, dp["x"].data[expected], equal_nan=True)
+
+
+def test_iter_sharded(tmpdir):
+    path = os.path.join(tmpdir, "sharded")
+    mk.write_sharded(path, _make_batches(), row_group_size=40)
+    dps = list(mk.iter_sharded(path, columns=["id", "emb"], lazy=True))
+    assert [len(dp) for dp in dps] == [40, 40, 40, 30]
+    assert all(dp["emb"]._block._lazy is not None for dp in dps)
+    assert (dps[1]["id"] == np.arange(40, 80)).all()
+
+    dps = list(mk.iter_sharded(path, filter=mk.col("id").isin([5, 50, 51])))
+    assert [dp["id"].data.tolist() for dp in dps] == [[5], [50, 51]]
@@ -0,0 +1,129 @@
+"""Unittests for reading CSV and JSON lines files with pyarrow."""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import meerkat as mk
+from meerkat.streaming import read_csv
+
+
+def _make_df(length: int = 1000):
+    return pd.DataFrame(
+        {
+            "id": np.arange(length),
+            "loss": np.arange(length) / 10,
+            "text": [f"the output of example {i}" for i in range(length)],
+        }
+    )
+
+
+@pytest.fixture
+def csv_path(tmpdir):
+    path = os.path.join(tmpdir, "dp.csv")
+    _make_df().to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def jsonl_path(tmpdir):
+    path = os.path.join(tmpdir, "dp.jsonl")
+    with open(path, "w") as f:
+        for i in range(1000):
+            f.write(json.dumps({"id": i, "tokens": [i] * (i % 3), "meta": {"i": i}}))
+            f.write("\n")
+    return path
+
+
+def test_from_csv(csv_path):
+    df = _make_df()
+    dp = mk.DataPanel.from_csv(csv_path, backend="arrow", block_size=2**12)
+    assert dp.columns == ["id", "loss", "text"]
+    assert all(isinstance(dp[name], mk.ArrowArrayColumn) for name in dp.columns)
+    # a single block, with a chunk per block of bytes parsed
+    assert len(dp.data._block_refs) == 1
+    assert dp["id"].data.num_chunks > 1
+    assert (dp["id"].to_numpy() == df["id"].values).all()
+    assert (dp["loss"].to_numpy() == df["loss"].values).all()
+    assert dp["text"].data.to_pylist() == df["text"].tolist()
+
+    dp = mk.DataPanel.from_csv(csv_path, backend="arrow", columns=["text", "id"])
+    assert dp.columns == ["text", "id"]
+
+    with pytest.raises(ValueError):
+        mk.DataPanel.from_csv(csv_path, backend="polars")
+
+
+def test_read_csv_options(tmpdir):
+    path = os.path.join(tmpdir, "dp.tsv")
+    _make_df(10).to_csv(path, index=False, sep="\t")
+    table = read_csv(path, delimiter="\t", skip_rows=1, column_names=["a", "b", "c"])
+    assert table.column_names == ["a", "b", "c"]
+    assert table["a"].to_pylist() == list(range(10))
+
+
+def test_iter_csv(csv_path):
+    dps = list(mk.iter_csv(csv_path, columns=["id"], block_size=2**12))
+    assert len(dps) > 1
+    assert all(dp.columns == ["id"] for dp in dps)
+    assert (mk.concat(dps)["id"].to_numpy() == np.arange(1000)).all()
+
+
+def test_from_jsonl(jsonl_path):
+    dp = mk.DataPanel.from_jsonl(jsonl_path, backend="arrow", block_size=2**12)
+    assert dp.columns == ["id", "tokens", "meta"]
+    assert len(dp.data._block_refs) == 1
+    assert (dp["id"].to_numpy() == np.arange(1000)).all()
+    assert dp["tokens"].data.to_pylist()[:4] == [[], [1], [2, 2], []]
+    assert dp["meta"].data.to_pylist()[5] == {"i": 5}
+
+
+def test_iter_jsonl(jsonl_path):
+    dps = list(mk.iter_jsonl(jsonl_path, block_size=2**12))
+    assert len(dps) > 1
+    # the types inferred from the first block are used for all blocks
+    assert all(dp["tokens"].data.type == dps[0]["tokens"].data.type for dp in dps)
+    dp = mk.concat(dps)
+    assert (dp["id"].to_numpy() == np.arange(1000)).all()
+    assert dp["tokens"].data.to_pylist()[-2] == [998, 998]
+
+
+def test_iter_jsonl_null_fields(tmpdir):
+    path = os.path.join(tmpdir, "dp.jsonl")
+    with open(path, "w") as f:
+        for i in range(1000):
+            # "b" is null in the first blocks, and missing from some lines
+            row = {"a": i, "b": None if i < 500 else str(i)}
+            if i % 2 == 0:
+                row["c"] = i
+            f.write(json.dumps({k: v for k, v in row.items() if i % 3 or k != "b"}))
+            f.write("\n")
+
+    dps = list(mk.iter_jsonl(path, block_size=2**12))
+    assert len(dps) > 2
+    assert all(dp.columns == ["a", "c", "b"] for dp in dps)
+    assert str(dps[0]["b"].data.type) == "null"
+    assert str(dps[-1]["b"].data.type) == "string"
+
+    dp = mk.concat(dps)
+    expected = mk.DataPanel.from_jsonl(path, backend="arrow")
+    for name in ["a", "b", "c"]:
+        assert dp[name].data.to_pylist() == expected[name].data.to_pylist()
+
+    # fields missing from the first block are not allowed
+    with open(path, "a") as f:
+        f.write(json.dumps({"a": 0, "d": 1}) + "\n")
+    with pytest.raises(ValueError):
+        list(mk.iter_jsonl(path, block_size=2**12))
+
+
+def test_to_jsonl(tmpdir, jsonl_path):
+    dp = mk.DataPanel.from_jsonl(jsonl_path, backend="arrow")
+    path = os.path.join(tmpdir, "out.jsonl")
+    dp.to_jsonl(path, chunk_size=300)
+    with open(path) as f, open(jsonl_path) as expected:
+        assert [json.loads(line) for line in f] == [
+            json.loads(line) for line in expected
+        ]
@@ -0,0 +1,107 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+import meerkat as mk
+from meerkat import DataPanel, NumpyArrayColumn
+from meerkat.tools.cache import ResultCache
+
+
+@pytest.fixture
+def cache_dir(tmpdir, monkeypatch):
+    root_dir = os.path.join(tmpdir, "cache")
+    monkeypatch.setattr(mk.config.cache, "root_dir", root_dir)
+    return root_dir
+
+
+def test_put_get(tmpdir):
+    cache = ResultCache(root_dir=str(tmpdir), max_size=2**30)
+    assert cache.get("a") is None
+
+    col = NumpyArrayColumn(np.arange(10))
+    assert cache.put("a", col)
+    assert "a" in cache
+    assert cache.get("a").is_equal(col)
+
+    dp = DataPanel({"x": np.arange(10), "y": [str(i) for i in range(10)]})
+    assert cache.put("b", dp)
+    cached = cache.get("b")
+    assert isinstance(cached, DataPanel)
+    assert all(cached[name].is_equal(dp[name]) for name in dp.columns)
+
+    cache.clear()
+    assert cache.get("a") is None and cache.size() == 0
+
+
+def test_lru_eviction(tmpdir):
+    cache = ResultCache(root_dir=str(tmpdir), max_size=2**30)
+    for key in "abc":
+        cache.put(key, NumpyArrayColumn(np.zeros(10000)))
+        time.sleep(0.01)
+    entry_size = cache.size() // 3
+
+    # using "a" makes "b" the least recently used entry
+    cache.get("a")
+    cache.max_size = 2 * entry_size
+    cache.evict()
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+
+    # entries larger than the cache are not stored
+    assert not cache.put("d", NumpyArrayColumn(np.zeros(100000)))
+    assert "d" not in cache
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("map was not served from the cache")
+
+
+def test_map_cache(cache_dir, monkeypatch):
+    dp = DataPanel({"a": np.arange(20), "b": [str(i) for i in range(20)]})
+
+    def func(batch):
+        return batch["a"] * 2
+
+    out = dp.map(func, is_batched_fn=True, batch_size=5, cache=True)
+    assert len(os.listdir(cache_dir)) == 1
+
+    with monkeypatch.context() as m:
+        m.setattr(DataPanel, "batch", _fail)
+        cached = dp.map(func, is_batched_fn=True, batch_size=5, cache=True)
+    assert cached.is_equal(out)
+
+    # different data, batching or functions are computed
+    dp.map(func, is_batched_fn=True, batch_size=4, cache=True)
+    dp[:10].map(func, is_batched_fn=True, batch_size=5, cache=True)
+    dp.map(lambda x: x["a"] * 2, is_batched_fn=True, batch_size=5, cache=True)
+    assert len(os.listdir(cache_dir)) == 4
+
+
+def test_map_cache_mutated(cache_dir):
+    dp = DataPanel({"a": np.arange(6)})
+
+    def func(batch):
+        return batch["a"] * 10
+
+    assert (dp.map(func, cache=True).data == np.arange(6) * 10).all()
+
+    # writes to the data of a column change the fingerprint of the DataPanel
+    dp["a"].data[:] = 1
+    assert (dp.map(func, cache=True).data == 10).all()
+    np.add(dp["a"], 5, out=dp["a"])
+    assert (dp.map(func, cache=True).data == 60).all()
+    dp["a"].fill(2)
+    assert (dp.map(func, cache=True).data == 20).all()
+    dp["a"][0] = 0
+    assert dp.map(func, cache=True).data[0] == 0
+
+
+def test_update_cache(cache_dir):
+    dp = DataPanel({"a": np.arange(20)})
+    out = dp.update(lambda x: {"b": x["a"] + 1}, cache=True)
+    cached = dp.update(lambda x: {"b": x["a"] + 1}, cache=True)
+    assert cached.columns == ["a", "b"]
+    assert cached["b"].is_equal(out["b"])
+    assert len(os.listdir(cache_dir)) == 1
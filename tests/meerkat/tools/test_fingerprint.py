@@ -0,0 +1,155 @@
+import functools
+import pickle
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+import torch
+
+from meerkat import DataPanel, NumpyArrayColumn
+from meerkat.block.numpy_block import NumpyBlock
+from meerkat.columns.arrow_column import ArrowArrayColumn
+from meerkat.columns.list_column import ListColumn
+from meerkat.columns.pandas_column import PandasSeriesColumn
+from meerkat.columns.tensor_column import TensorColumn
+from meerkat.tools.fingerprint import fingerprint
+
+
+def test_fingerprint_data():
+    assert fingerprint(np.arange(10)) == fingerprint(np.arange(10))
+    assert fingerprint(np.arange(10)) != fingerprint(np.arange(1, 11))
+    # dtype and shape are part of the fingerprint
+    assert fingerprint(np.arange(10)) != fingerprint(np.arange(10).astype(np.int32))
+    assert fingerprint(np.zeros((2, 3))) != fingerprint(np.zeros((3, 2)))
+    # non-contiguous arrays are hashed by value
+    assert fingerprint(np.arange(10)[::2]) == fingerprint(np.arange(0, 10, 2))
+
+    assert fingerprint(torch.arange(5)) == fingerprint(torch.arange(5))
+    assert fingerprint(torch.arange(5)) != fingerprint(np.arange(5))
+    assert fingerprint(pd.Series(["a", "b"])) == fingerprint(pd.Series(["a", "b"]))
+    assert fingerprint(pd.Series(["a", "b"])) != fingerprint(pd.Series(["a", "c"]))
+
+    # sliced arrow arrays only hash the sliced values
+    assert fingerprint(pa.array([1, 2, 3, 4])[1:3]) == fingerprint(pa.array([2, 3]))
+
+    # fingerprints are the same in every environment, e.g. for shared caches
+    assert fingerprint("a", 1) == "2b04f17b405c3028b4870dacda34e596"
+
+
+def test_fingerprint_datapanel():
+    def make():
+        return DataPanel(
+            {
+                "a": np.arange(10),
+                "b": ArrowArrayColumn(pa.array([str(i) for i in range(10)])),
+                "c": [{"x": i} for i in range(10)],
+            }
+        )
+
+    dp = make()
+    assert fingerprint(dp) == fingerprint(make())
+    assert fingerprint(dp[2:5]) == fingerprint(dp.lz[2:5])
+    assert fingerprint(dp) != fingerprint(dp[1:])
+    assert fingerprint(dp["a"]) != fingerprint(dp["a"].data)
+
+    other = make()
+    other["a"][3] = 100
+    assert fingerprint(dp) != fingerprint(other)
+
+
+def test_fingerprint_function():
+    k = 2
+
+    def f(x):
+        return x * k
+
+    def g(x):
+        return x * k + 1
+
+    assert fingerprint(f) != fingerprint(g)
+    assert fingerprint(functools.partial(f, 1)) != fingerprint(functools.partial(f, 2))
+
+    before = fingerprint(f)
+    k = 3  # noqa: F841
+    # closure variables are part of the fingerprint
+    assert fingerprint(f) != before
+
+
+def test_fingerprint_unsupported():
+    with pytest.raises(TypeError, match="Cannot fingerprint"):
+        fingerprint(NumpyArrayColumn(np.arange(3)), (x for x in range(3)))
+
+
+def test_fingerprint_recursive():
+    from meerkat.columns.lambda_column import LambdaColumn
+
+    col = LambdaColumn(NumpyArrayColumn(np.arange(3)), fn=lambda x: x)
+    # e.g. image columns load their cells with one of their own methods
+    col.fn = col.__repr__
+    assert fingerprint(col) == fingerprint(col)
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        NumpyArrayColumn(np.arange(100)),
+        TensorColumn(torch.arange(100)),
+        PandasSeriesColumn([str(i) for i in range(100)]),
+        ListColumn(list(range(100))),
+    ],
+)
+def test_column_fingerprint(column):
+    before = column.fingerprint()
+    assert column.fingerprint() == before
+    assert column.view().fingerprint() == before
+
+    column[3] = column[4]
+    after = column.fingerprint()
+    assert after != before
+
+
+def test_view_fingerprint():
+    dp = DataPanel({"a": np.arange(100), "b": torch.arange(100)})
+    view = dp[10:20]
+    assert view.fingerprint() == dp.lz[10:20].fingerprint()
+    assert view["a"].fingerprint() == dp["a"][10:20].fingerprint()
+    assert view.fingerprint() != dp[10:21].fingerprint()
+    assert dp[[1, 2]].fingerprint() != dp[[2, 1]].fingerprint()
+
+    # views can be pickled, e.g. to send them between processes
+    assert pickle.loads(pickle.dumps(view)).fingerprint() == view.copy().fingerprint()
+
+    # writing to the view changes the data of the DataPanel
+    before = dp.fingerprint()
+    view["a"][0] = -1
+    assert dp["a"][10] == -1
+    assert dp.fingerprint() != before
+
+    # and writing to the DataPanel changes the data of the view
+    before = view.fingerprint()
+    dp["a"][11] = -1
+    assert view.fingerprint() != before
+
+
+def test_incremental_fingerprint(monkeypatch):
+    import meerkat.block.abstract
+
+    monkeypatch.setattr(meerkat.block.abstract, "FINGERPRINT_CHUNK_ROWS", 10)
+    col = NumpyArrayColumn(np.arange(100))
+    hashed = []
+    get_rows = NumpyBlock._get_rows
+
+    def _get_rows(self, index, start, stop):
+        hashed.append(start)
+        return get_rows(self, index, start, stop)
+
+    monkeypatch.setattr(NumpyBlock, "_get_rows", _get_rows)
+
+    col.fingerprint()
+    assert len(hashed) == 10
+
+    hashed.clear()
+    col[[15, 42]] = [0, 0]
+    col.fingerprint()
+    assert hashed == [10, 40]
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from meerkat.tools.prefetch import PrefetchIterator
+
+
+@pytest.mark.parametrize("size", [0, 1, 4])
+def test_order(size):
+    assert list(PrefetchIterator(range(100), size=size)) == list(range(100))
+
+
+def test_overlaps_loading():
+    def slow():
+        for i in range(5):
+            time.sleep(0.05)
+            yield i
+
+    start = time.time()
+    for _ in PrefetchIterator(slow(), size=2):
+        # consuming takes as long as loading, so the two should overlap
+        time.sleep(0.05)
+    assert time.time() - start < 0.45
+
+
+def test_bounded():
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    it = PrefetchIterator(source(), size=3)
+    assert next(it) == 0
+    time.sleep(0.1)
+    # one item consumed, at most `size` items queued and one waiting to be put
+    assert len(produced) <= 5
+    it.close()
+
+
+def test_error():
+    def source():
+        yield 0
+        raise ValueError("boom")
+
+    it = PrefetchIterator(source(), size=2)
+    assert next(it) == 0
+    with pytest.raises(ValueError, match="boom"):
+        next(it)
+
+
+def test_close_stops_thread():
+    it = PrefetchIterator(iter(range(1000)), size=1)
+    next(it)
+    thread = it._thread
+    it.close()
+    assert not thread.is_alive()
+    with pytest.raises(StopIteration):
+        next(it)